@@ -21,7 +21,7 @@ import jinja2.sandbox
 
 from dbt.utils import (
     get_dbt_macro_name, get_docs_macro_name, get_materialization_macro_name,
-    get_test_macro_name, deep_map_render
+    get_test_macro_name, deep_map_render, mapping_json_default
 )
 
 from dbt.clients._jinja_blocks import BlockIterator, BlockData, BlockTag
@@ -506,6 +506,10 @@ def get_environment(
 
     env = env_cls(**args)
     env.filters.update(filters)
+    # for the tojson filter
+    env.policies['json.dumps_kwargs'] = {  # type: ignore
+        'sort_keys': True, 'default': mapping_json_default
+    }
 
     return env
 
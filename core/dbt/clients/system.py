@@ -1,7 +1,9 @@
 import errno
 import functools
 import fnmatch
+import gzip
 import json
+import mmap
 import os
 import os.path
 import re
@@ -9,10 +11,11 @@ import shutil
 import subprocess
 import sys
 import tarfile
+import uuid
 import requests
 import stat
 from typing import (
-    Type, NoReturn, List, Optional, Dict, Any, Tuple, Callable, Union
+    Type, NoReturn, List, Optional, Dict, Any, Tuple, Callable, Union, Iterable, BinaryIO
 )
 
 from dbt.events.functions import fire_event
@@ -29,6 +32,25 @@ else:
     WinDLL = None
     c_bool = None
 
+try:
+    import zstandard  # type: ignore
+except ImportError:
+    zstandard = None
+
+# The file suffixes of compressed artifacts, by compression
+ARTIFACT_SUFFIXES = {
+    'none': '',
+    'gzip': '.gz',
+    'zstd': '.zst',
+}
+
+# The suffix of the binary artifacts written by Writable.iter_msgpack
+MSGPACK_SUFFIX = '.msgpack'
+
+# The modification time and size of each artifact that this process wrote,
+# after the write
+_written_artifacts: Dict[str, Tuple[int, int]] = {}
+
 
 def find_matching(
     root_path: str,
@@ -61,6 +83,9 @@ def find_matching(
 
         for current_path, subdirectories, local_files in walk_results:
             for local_file in local_files:
+                # only stat files that will actually be returned
+                if not reobj.match(local_file):
+                    continue
                 absolute_path = os.path.join(current_path, local_file)
                 relative_path = os.path.relpath(
                     absolute_path, absolute_path_to_search
@@ -70,13 +95,12 @@ def find_matching(
                     modification_time = os.path.getmtime(absolute_path)
                 except OSError:
                     fire_event(SystemErrorRetrievingModTime(path=absolute_path))
-                if reobj.match(local_file):
-                    matching.append({
-                        'searched_path': relative_path_to_search,
-                        'absolute_path': absolute_path,
-                        'relative_path': relative_path,
-                        'modification_time': modification_time,
-                    })
+                matching.append({
+                    'searched_path': relative_path_to_search,
+                    'absolute_path': absolute_path,
+                    'relative_path': relative_path,
+                    'modification_time': modification_time,
+                })
 
     return matching
 
@@ -170,6 +194,11 @@ def write_file(path: str, contents: str = '') -> bool:
 
 
 def read_json(path: str) -> Dict[str, Any]:
+    """Read the json file at 'path', which can be compressed with gzip or
+    zstd, like the artifacts written by write_artifact.
+    """
+    if path.endswith(tuple(suffix for suffix in ARTIFACT_SUFFIXES.values() if suffix)):
+        return json.loads(_decompress(path))
     return json.loads(load_file_contents(path))
 
 
@@ -177,6 +206,167 @@ def write_json(path: str, data: Dict[str, Any]) -> bool:
     return write_file(path, json.dumps(data, cls=dbt.utils.JSONEncoder))
 
 
+def artifact_path(path: str, compression: Optional[str] = None) -> str:
+    """Return the path of the artifact at 'path' when it's written with
+    'compression', like target/manifest.json.gz for gzip.
+    """
+    compression = compression or 'none'
+    if compression not in ARTIFACT_SUFFIXES:
+        raise dbt.exceptions.RuntimeException(
+            f'Invalid artifact compression "{compression}", expected one of: '
+            f'{", ".join(ARTIFACT_SUFFIXES)}'
+        )
+    return path + ARTIFACT_SUFFIXES[compression]
+
+
+def msgpack_artifact_path(path: str) -> str:
+    """Return the path of the msgpack version of the json artifact at
+    'path', like target/manifest.msgpack for target/manifest.json.
+    """
+    return os.path.splitext(path)[0] + MSGPACK_SUFFIX
+
+
+def find_artifact(path: str) -> Optional[str]:
+    """Return the path of the json artifact at 'path', which might have
+    been written as msgpack or compressed, or None if there is no such
+    file. The msgpack artifact is the fastest to read, so it comes first.
+    """
+    candidates = [msgpack_artifact_path(path)]
+    candidates.extend(path + suffix for suffix in ARTIFACT_SUFFIXES.values())
+    for candidate in candidates:
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def remove_artifact(path: str) -> None:
+    """Remove the artifact at 'path' with any compression, and its index"""
+    paths = [artifact_path(path, compression) for compression in ARTIFACT_SUFFIXES]
+    paths.append(artifact_index_path(path))
+    for artifact in paths:
+        artifact = convert_path(artifact)
+        if os.path.isfile(artifact):
+            os.remove(artifact)
+        _written_artifacts.pop(artifact, None)
+
+
+def _decompress(path: str) -> bytes:
+    path = convert_path(path)
+    if path.endswith(ARTIFACT_SUFFIXES['zstd']):
+        if zstandard is None:
+            raise dbt.exceptions.RuntimeException(
+                f'Reading {path} requires the zstandard package, '
+                'install it with "pip install zstandard"'
+            )
+        with open(path, 'rb') as handle:
+            return zstandard.ZstdDecompressor().stream_reader(handle).read()
+    with gzip.open(path, 'rb') as gzip_handle:
+        return gzip_handle.read()
+
+
+def load_artifact_contents(path: str) -> Union[bytes, mmap.mmap]:
+    """Return the uncompressed contents of the artifact at 'path'. An
+    uncompressed artifact is memory mapped, so only the parts of it that
+    are read are loaded from disk.
+    """
+    path = convert_path(path)
+    if path.endswith(tuple(suffix for suffix in ARTIFACT_SUFFIXES.values() if suffix)):
+        return _decompress(path)
+    with open(path, 'rb') as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            # empty files can't be mapped
+            return b''
+        return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def artifact_index_path(path: str) -> str:
+    """Return the path of the index that's written next to the artifact at
+    'path', like target/manifest.json.index for target/manifest.json.gz.
+    """
+    for suffix in ARTIFACT_SUFFIXES.values():
+        if suffix and path.endswith(suffix):
+            path = path[:-len(suffix)]
+    return path + '.index'
+
+
+def get_stat_key(path: str) -> Optional[Tuple[int, int]]:
+    """Return the modification time and size of the file at 'path', or None
+    if it doesn't exist.
+    """
+    try:
+        stat_result = os.stat(path)
+    except OSError:
+        return None
+    return (stat_result.st_mtime_ns, stat_result.st_size)
+
+
+def _compressed_writer(handle: BinaryIO, compression: str, name: str) -> BinaryIO:
+    if compression == 'gzip':
+        # without a modification time in the header the output only
+        # depends on the contents
+        return gzip.GzipFile(  # type: ignore
+            filename=name, mode='wb', fileobj=handle, mtime=0
+        )
+    if compression == 'zstd':
+        if zstandard is None:
+            raise dbt.exceptions.RuntimeException(
+                'zstd artifact compression requires the zstandard package, '
+                'install it with "pip install zstandard"'
+            )
+        return zstandard.ZstdCompressor().stream_writer(handle, closefd=False)
+    return handle
+
+
+def write_artifact(
+    path: str, chunks: Iterable[Union[str, bytes]], compression: Optional[str] = None
+) -> None:
+    """Write the 'chunks' of text or bytes to the artifact at 'path',
+    compressed with 'compression'. The chunks are written as they are
+    produced to a temporary file that then replaces the artifact, so readers
+    never see a partial file. Artifacts at 'path' with other compressions
+    are removed.
+    """
+    compression = compression or 'none'
+    base_path = convert_path(path)
+    path = artifact_path(base_path, compression)
+    directory = os.path.dirname(path)
+    make_directory(directory)
+    tmp_path = f'{path}.{uuid.uuid4().hex}.tmp'
+    try:
+        # 'x' creates the file with the same permissions as open(path, 'w')
+        with open(tmp_path, 'xb') as handle:
+            writer = _compressed_writer(handle, compression, os.path.basename(base_path))
+            for chunk in chunks:
+                writer.write(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+            if writer is not handle:
+                writer.close()
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    stat_key = get_stat_key(path)
+    if stat_key is not None:
+        _written_artifacts[path] = stat_key
+
+    for other in ARTIFACT_SUFFIXES:
+        if other == compression:
+            continue
+        other_path = artifact_path(base_path, other)
+        if os.path.isfile(other_path):
+            os.remove(other_path)
+            _written_artifacts.pop(other_path, None)
+
+
+def is_written_artifact(path: str, compression: Optional[str] = None) -> bool:
+    """Return True if this process wrote the artifact at 'path' with
+    'compression', and it wasn't changed since.
+    """
+    path = artifact_path(convert_path(path), compression)
+    stat_key = _written_artifacts.get(path)
+    return stat_key is not None and stat_key == get_stat_key(path)
+
+
 def _windows_rmdir_readonly(
     func: Callable[[str], Any], path: str, exc: Tuple[Any, OSError, Any]
 ):
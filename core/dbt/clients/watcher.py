@@ -0,0 +1,279 @@
+import abc
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from typing import Dict, Iterable, Iterator, Optional, Set, Tuple
+
+
+# How often the polling watcher checks the files, in seconds
+POLL_INTERVAL = 0.5
+# Editors often write a file in several steps, so wait until no more
+# events arrive for this long before reporting the changes, in seconds
+SETTLE_TIME = 0.1
+
+# from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, 'O_CLOEXEC', 0)
+
+WATCH_MASK = (
+    IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE |
+    IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+)
+
+# struct inotify_event {int wd; uint32_t mask; uint32_t cookie; uint32_t len;}
+# followed by 'len' bytes of null padded name
+_INOTIFY_EVENT = struct.Struct('iIII')
+
+
+def _is_excluded(path: str, exclude: Set[str]) -> bool:
+    return os.path.basename(path).startswith('.') or path in exclude
+
+
+def iter_watched_directories(
+    paths: Iterable[str], exclude: Iterable[str] = (), recursive: bool = True
+) -> Iterator[str]:
+    """Yield the directories to watch for the given paths. Subdirectories
+    whose names start with a '.' or whose paths are in 'exclude' are
+    skipped, together with everything below them.
+    """
+    excluded = {os.path.abspath(path) for path in exclude}
+    for path in paths:
+        path = os.path.abspath(path)
+        if not os.path.isdir(path):
+            continue
+        if not recursive:
+            yield path
+            continue
+        for dirpath, dirnames, _ in os.walk(path):
+            dirnames[:] = [
+                name for name in dirnames
+                if not _is_excluded(os.path.join(dirpath, name), excluded)
+            ]
+            yield dirpath
+
+
+class FileWatcher(metaclass=abc.ABCMeta):
+    """Watch directories for files that are created, changed or removed.
+    The 'paths' are watched recursively, the 'shallow_paths' without
+    their subdirectories.
+    """
+    name: str
+
+    def __init__(
+        self,
+        paths: Iterable[str],
+        exclude: Iterable[str] = (),
+        shallow_paths: Iterable[str] = (),
+    ) -> None:
+        self.paths = [os.path.abspath(path) for path in paths]
+        self.exclude = {os.path.abspath(path) for path in exclude}
+        self.shallow_paths = [os.path.abspath(path) for path in shallow_paths]
+
+    def iter_directories(self) -> Iterator[str]:
+        yield from iter_watched_directories(self.paths, self.exclude)
+        yield from iter_watched_directories(self.shallow_paths, recursive=False)
+
+    @property
+    @abc.abstractmethod
+    def directory_count(self) -> int:
+        raise NotImplementedError('directory_count not implemented')
+
+    @abc.abstractmethod
+    def wait_for_changes(self, timeout: Optional[float] = None) -> Set[str]:
+        """Block until something changed and return the changed paths, or
+        an empty set if nothing changed before the timeout.
+        """
+        raise NotImplementedError('wait_for_changes not implemented')
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class PollingFileWatcher(FileWatcher):
+    """Find changes by comparing the modification times and sizes of the
+    files every 'interval' seconds. This works everywhere.
+    """
+    name = 'polling'
+
+    def __init__(
+        self,
+        paths: Iterable[str],
+        exclude: Iterable[str] = (),
+        shallow_paths: Iterable[str] = (),
+        interval: float = POLL_INTERVAL,
+    ) -> None:
+        super().__init__(paths, exclude, shallow_paths)
+        self.interval = interval
+        self._directory_count = 0
+        self._files = self._scan()
+
+    @property
+    def directory_count(self) -> int:
+        return self._directory_count
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        files: Dict[str, Tuple[int, int]] = {}
+        self._directory_count = 0
+        for directory in self.iter_directories():
+            self._directory_count += 1
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_file() and not entry.name.startswith('.'):
+                            stat = entry.stat()
+                            files[entry.path] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                # removed while scanning, the next scan will pick it up
+                continue
+        return files
+
+    def wait_for_changes(self, timeout: Optional[float] = None) -> Set[str]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            files = self._scan()
+            changed = {
+                path for path in set(files) | set(self._files)
+                if files.get(path) != self._files.get(path)
+            }
+            self._files = files
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            time.sleep(self.interval)
+
+
+class InotifyFileWatcher(FileWatcher):
+    """Use the Linux inotify API, so changes are reported as soon as they
+    happen without scanning the files.
+    """
+    name = 'inotify'
+
+    def __init__(
+        self,
+        paths: Iterable[str],
+        exclude: Iterable[str] = (),
+        shallow_paths: Iterable[str] = (),
+    ) -> None:
+        super().__init__(paths, exclude, shallow_paths)
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            self._raise_errno('inotify_init1')
+        self._watches: Dict[int, str] = {}
+        try:
+            for directory in self.iter_directories():
+                self._add_watch(directory)
+        except OSError:
+            self.close()
+            raise
+
+    @property
+    def directory_count(self) -> int:
+        return len(self._watches)
+
+    def _raise_errno(self, function: str):
+        errno = ctypes.get_errno()
+        raise OSError(errno, f'{function} failed: {os.strerror(errno)}')
+
+    def _add_watch(self, directory: str) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            # ENOSPC means the fs.inotify.max_user_watches limit was reached
+            self._raise_errno('inotify_add_watch')
+        self._watches[wd] = directory
+
+    def _read_events(self) -> Set[str]:
+        changed: Set[str] = set()
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _INOTIFY_EVENT.unpack_from(data, offset)
+                offset += _INOTIFY_EVENT.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+                offset += length
+                directory = self._watches.get(wd)
+                if directory is None:
+                    continue
+                if mask & IN_IGNORED:
+                    # the directory was removed
+                    del self._watches[wd]
+                    continue
+                path = os.path.join(directory, name) if name else directory
+                if name and _is_excluded(path, self.exclude):
+                    # like editor swap files or the target directory
+                    continue
+                changed.add(path)
+                is_new_directory = mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO)
+                if is_new_directory and directory not in self.shallow_paths:
+                    # watch the new directory too
+                    try:
+                        for new_directory in iter_watched_directories([path], self.exclude):
+                            self._add_watch(new_directory)
+                    except OSError:
+                        # already removed again, or the watch limit was
+                        # reached. The change itself is still reported.
+                        pass
+
+    def wait_for_changes(self, timeout: Optional[float] = None) -> Set[str]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        changed: Set[str] = set()
+        while not changed:
+            remaining = None
+            if deadline is not None:
+                remaining = max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self._fd], [], [], remaining)
+            if not ready:
+                return changed
+            changed |= self._read_events()
+        while select.select([self._fd], [], [], SETTLE_TIME)[0]:
+            changed |= self._read_events()
+        return changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def get_file_watcher(
+    paths: Iterable[str],
+    exclude: Iterable[str] = (),
+    shallow_paths: Iterable[str] = (),
+) -> FileWatcher:
+    """Return an inotify watcher on Linux, and fall back to polling if
+    inotify isn't available or the paths can't all be watched.
+    """
+    paths = list(paths)
+    exclude = list(exclude)
+    shallow_paths = list(shallow_paths)
+    if sys.platform.startswith('linux'):
+        try:
+            return InotifyFileWatcher(paths, exclude, shallow_paths)
+        except (OSError, AttributeError):
+            pass
+    return PollingFileWatcher(paths, exclude, shallow_paths)
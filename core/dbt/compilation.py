@@ -1,6 +1,6 @@
 import os
 from collections import defaultdict
-from typing import List, Dict, Any, Tuple, cast, Optional
+from typing import List, Dict, Any, FrozenSet, Tuple, cast, Optional
 
 import networkx as nx  # type: ignore
 import pickle
@@ -11,7 +11,7 @@ from dbt.adapters.factory import get_adapter
 from dbt.clients import jinja
 from dbt.clients.system import make_directory
 from dbt.context.providers import generate_runtime_model_context
-from dbt.contracts.graph.manifest import Manifest, UniqueID
+from dbt.contracts.graph.manifest import Manifest
 from dbt.contracts.graph.compiled import (
     COMPILED_TYPES,
     CompiledGenericTestNode,
@@ -26,7 +26,7 @@ from dbt.exceptions import (
     InternalException,
     RuntimeException,
 )
-from dbt.graph import Graph
+from dbt.graph import Graph, ReachabilityIndex, UniqueId
 from dbt.events.functions import fire_event
 from dbt.events.types import FoundStats, CompilingNode, WritingInjectedSQLForNode
 from dbt.node_types import NodeType
@@ -112,17 +112,52 @@ def _extend_prepended_ctes(prepended_ctes, new_prepended_ctes):
         _add_prepended_cte(prepended_ctes, new_cte)
 
 
-def _get_tests_for_node(manifest: Manifest, unique_id: UniqueID) -> List[UniqueID]:
-    """ Get a list of tests that depend on the node with the
-    provided unique id """
-
-    tests = []
-    if unique_id in manifest.child_map:
-        for child_unique_id in manifest.child_map[unique_id]:
-            if child_unique_id.startswith('test.'):
-                tests.append(child_unique_id)
+def _get_first_downstream_nodes(
+    graph: nx.DiGraph,
+    index: ReachabilityIndex,
+    parents: FrozenSet[UniqueId],
+    nodes: int,
+) -> List[UniqueId]:
+    """ Get the nodes in the bitset 'nodes' that are downstream of all the
+    parents, but not downstream of another of those nodes """
+
+    # The nodes downstream of all the parents are downstream of each one, so
+    # they're found searching down from one of them. The search doesn't go
+    # past them, so it's short when it starts from the parent that they're
+    # all the descendants of, like the model of a relationships test.
+    downstream = -1
+    for parent in parents:
+        downstream &= index.descendant_bits(parent)
+    candidates = downstream & nodes
+    if not candidates:
+        return []
+    start = next(
+        (parent for parent in parents if index.descendant_bits(parent) == downstream),
+        None,
+    )
+    if start is None:
+        start = min(parents, key=lambda parent: bin(index.descendant_bits(parent)).count('1'))
+
+    position = index.position
+    successors = graph.succ
+    found = []
+    seen = {start}
+    stack = [start]
+    while stack:
+        for child in successors[stack.pop()]:
+            if child in seen:
+                continue
+            seen.add(child)
+            if candidates >> position[child] & 1:
+                found.append(child)
+            else:
+                stack.append(child)
 
-    return tests
+    # A node found on one path can be downstream of one found on another
+    reachable = 0
+    for node_id in found:
+        reachable |= index.descendant_bits(node_id)
+    return [node_id for node_id in found if not reachable >> position[node_id] & 1]
 
 
 class Linker:
@@ -444,10 +479,13 @@ class Compiler:
             self.add_test_edges(linker, manifest)
 
     def add_test_edges(self, linker: Linker, manifest: Manifest) -> None:
-        """ This method adds additional edges to the DAG. For a given non-test
-        executable node, add an edge from an upstream test to the given node if
-        the set of nodes the test depends on is a subset of the upstream nodes
-        for the given node. """
+        """ This method adds additional edges to the DAG, so that a test runs
+        before the non-test executable nodes downstream of everything it
+        tests. A test must run before a given node if the set of nodes the
+        test depends on is a subset of the upstream nodes of the given node.
+        The edge is added only to the first of those nodes on each path: the
+        others are downstream of one of them, so they run after the test
+        anyway, and they're skipped when it fails. """
 
         # Given a graph:
         # model1 --> model2 --> model3
@@ -458,54 +496,42 @@ class Compiler:
         #
         # Produce the following graph:
         # model1 --> model2 --> model3
-        #   |       /\    |      /\ /\
-        #   |       |    \/      |  |
-        #  \/       |  test2 ----|  |
-        # test1 ----|---------------|
-
+        #   |       /\    |      /\
+        #   |       |    \/      |
+        #  \/       |  test2 ----|
+        # test1 ----|
+
+        index = ReachabilityIndex(linker.graph)
+        executable = index.bits(
+            node_id for node_id in linker.graph
+            if node_id in manifest.nodes and
+            manifest.nodes[node_id].resource_type != NodeType.Test
+        )
+        # Many tests have the same parents, like the tests of a model's
+        # columns, so the downstream nodes are found once for each set.
+        consumers: Dict[FrozenSet[UniqueId], List[UniqueId]] = {}
+        new_edges = []
         for node_id in linker.graph:
-            # If node is executable (in manifest.nodes) and does _not_
-            # represent a test, continue.
-            if (
-                node_id in manifest.nodes and
-                manifest.nodes[node_id].resource_type != NodeType.Test
-            ):
-                # Get *everything* upstream of the node
-                all_upstream_nodes = nx.traversal.bfs_tree(
-                    linker.graph, node_id, reverse=True
+            node = manifest.nodes.get(node_id)
+            if node is None or node.resource_type != NodeType.Test:
+                continue
+            # Tests can depend on multiple nodes (ex: relationship tests).
+            # Test nodes do not distinguish between what node the test is
+            # "testing" and what node(s) it depends on.
+            parents = frozenset(map(UniqueId, node.depends_on_nodes))
+            if not parents or not all(parent in index.position for parent in parents):
+                continue
+            if parents not in consumers:
+                consumers[parents] = _get_first_downstream_nodes(
+                    linker.graph, index, parents, executable
                 )
-                # Get the set of upstream nodes not including the current node.
-                upstream_nodes = set([
-                    n for n in all_upstream_nodes if n != node_id
-                ])
-
-                # Get all tests that depend on any upstream nodes.
-                upstream_tests = []
-                for upstream_node in upstream_nodes:
-                    upstream_tests += _get_tests_for_node(
-                        manifest,
-                        upstream_node
-                    )
-
-                for upstream_test in upstream_tests:
-                    # Get the set of all nodes that the test depends on
-                    # including the upstream_node itself. This is necessary
-                    # because tests can depend on multiple nodes (ex:
-                    # relationship tests). Test nodes do not distinguish
-                    # between what node the test is "testing" and what
-                    # node(s) it depends on.
-                    test_depends_on = set(
-                        manifest.nodes[upstream_test].depends_on_nodes
-                    )
+            for consumer in consumers[parents]:
+                new_edges.append((node_id, consumer))
 
-                    # If the set of nodes that an upstream test depends on
-                    # is a subset of all upstream nodes of the current node,
-                    # add an edge from the upstream test to the current node.
-                    if (test_depends_on.issubset(upstream_nodes)):
-                        linker.graph.add_edge(
-                            upstream_test,
-                            node_id
-                        )
+        # The new edges only make tests upstream of more nodes, and tests
+        # don't have tests, so they don't change the tests that the other
+        # nodes get. They're added after the loop, which reads the index.
+        linker.graph.add_edges_from(new_edges)
 
     def compile(self, manifest: Manifest, write=True, add_test_edges=False) -> Graph:
         self.initialize()
@@ -379,6 +379,7 @@ class PartialProject(RenderComponents):
             quoting = cfg.quoting.to_dict(omit_none=True)
 
         dispatch: List[Dict[str, Any]]
+        concurrency_pools: Dict[str, int]
         models: Dict[str, Any]
         seeds: Dict[str, Any]
         snapshots: Dict[str, Any]
@@ -387,6 +388,7 @@ class PartialProject(RenderComponents):
         vars_value: VarProvider
 
         dispatch = cfg.dispatch
+        concurrency_pools = cfg.concurrency_pools
         models = cfg.models
         seeds = cfg.seeds
         snapshots = cfg.snapshots
@@ -435,6 +437,7 @@ class PartialProject(RenderComponents):
             on_run_start=on_run_start,
             on_run_end=on_run_end,
             dispatch=dispatch,
+            concurrency_pools=concurrency_pools,
             seeds=seeds,
             snapshots=snapshots,
             dbt_version=dbt_version,
@@ -548,6 +551,7 @@ class Project:
     on_run_start: List[str]
     on_run_end: List[str]
     dispatch: List[Dict[str, Any]]
+    concurrency_pools: Dict[str, int]
     seeds: Dict[str, Any]
     snapshots: Dict[str, Any]
     sources: Dict[str, Any]
@@ -616,6 +620,7 @@ class Project:
             'on-run-start': self.on_run_start,
             'on-run-end': self.on_run_end,
             'dispatch': self.dispatch,
+            'concurrency-pools': self.concurrency_pools,
             'seeds': self.seeds,
             'snapshots': self.snapshots,
             'sources': self.sources,
@@ -101,6 +101,7 @@ class RuntimeConfig(Project, Profile, AdapterRequiredConfig):
             on_run_start=project.on_run_start,
             on_run_end=project.on_run_end,
             dispatch=project.dispatch,
+            concurrency_pools=project.concurrency_pools,
             seeds=project.seeds,
             snapshots=project.snapshots,
             dbt_version=project.dbt_version,
@@ -500,6 +501,7 @@ class UnsetProfileConfig(RuntimeConfig):
             on_run_start=project.on_run_start,
             on_run_end=project.on_run_end,
             dispatch=project.dispatch,
+            concurrency_pools=project.concurrency_pools,
             seeds=project.seeds,
             snapshots=project.snapshots,
             dbt_version=project.dbt_version,
@@ -15,6 +15,7 @@ from dbt.exceptions import (
     raise_compiler_error, MacroReturn, raise_parsing_error, disallow_secret_env_var
 )
 from dbt.logger import SECRET_ENV_PREFIX
+from dbt.utils import mapping_json_default
 from dbt.events.functions import fire_event, get_invocation_id
 from dbt.events.types import MacroEventInfo, MacroEventDebug
 from dbt.version import __version__ as dbt_version
@@ -412,7 +413,7 @@ class BaseContext(metaclass=ContextMeta):
             {% do log(my_json_string) %}
         """
         try:
-            return json.dumps(value, sort_keys=sort_keys)
+            return json.dumps(value, sort_keys=sort_keys, default=mapping_json_default)
         except ValueError:
             return default
 
@@ -38,12 +38,17 @@ class ConfiguredVar(Var):
         context: Dict[str, Any],
         config: AdapterRequiredConfig,
         project_name: str,
+        schema_yaml_vars: Optional['SchemaYamlVars'] = None,
     ):
         super().__init__(context, config.cli_vars)
         self._config = config
         self._project_name = project_name
+        self._schema_yaml_vars = schema_yaml_vars
 
     def __call__(self, var_name, default=Var._VAR_NOTSET):
+        if self._schema_yaml_vars is not None:
+            self._schema_yaml_vars.vars[var_name] = True
+
         my_config = self._config.load_dependencies()[self._project_name]
 
         # cli vars > active project > local project
@@ -83,7 +88,7 @@ class SchemaYamlContext(ConfiguredContext):
     @contextproperty
     def var(self) -> ConfiguredVar:
         return ConfiguredVar(
-            self._ctx, self.config, self._project_name
+            self._ctx, self.config, self._project_name, self.schema_yaml_vars
         )
 
     @contextmember
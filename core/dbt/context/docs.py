@@ -11,8 +11,27 @@ from dbt.contracts.graph.compiled import CompileResultNode
 from dbt.contracts.graph.manifest import Manifest
 from dbt.contracts.graph.parsed import ParsedMacro
 
-from dbt.context.base import contextmember
-from dbt.context.configured import SchemaYamlContext
+from dbt.context.base import contextmember, contextproperty, Var
+from dbt.context.configured import ConfiguredVar, SchemaYamlContext
+
+
+class DocsRuntimeVar(ConfiguredVar):
+    def __init__(
+        self,
+        context: Dict[str, Any],
+        config: RuntimeConfig,
+        project_name: str,
+        node: Any,
+        manifest: Manifest,
+    ) -> None:
+        super().__init__(context, config, project_name)
+        self._doc_node = node
+        self._manifest = manifest
+
+    def __call__(self, var_name, default=Var._VAR_NOTSET):
+        # descriptions are only rendered again if their node is reparsed
+        self._manifest.add_var_to_file(self._doc_node, var_name)
+        return super().__call__(var_name, default)
 
 
 class DocsRuntimeContext(SchemaYamlContext):
@@ -27,6 +46,12 @@ class DocsRuntimeContext(SchemaYamlContext):
         self.node = node
         self.manifest = manifest
 
+    @contextproperty
+    def var(self) -> ConfiguredVar:
+        return DocsRuntimeVar(
+            self._ctx, self.config, self._project_name, self.node, self.manifest
+        )
+
     @contextmember
     def doc(self, *args: str) -> str:
         """The `doc` function is used to reference docs blocks in schema.yml
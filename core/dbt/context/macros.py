@@ -1,12 +1,15 @@
 from typing import (
-    Any, Dict, Iterable, Union, Optional, List, Iterator, Mapping, Set
+    Any, Dict, Iterable, Union, Optional, List, Iterator, Mapping, Tuple
 )
 
+import jinja2
+import jinja2.runtime
+
 from dbt.clients.jinja import MacroGenerator, MacroStack
 from dbt.contracts.graph.parsed import ParsedMacro
 from dbt.include.global_project import PROJECT_NAME as GLOBAL_PROJECT_NAME
 from dbt.exceptions import (
-    raise_duplicate_macro_name, raise_compiler_error
+    raise_duplicate_macro_name, raise_compiler_error, InternalException
 )
 
 
@@ -14,29 +17,74 @@ FlatNamespace = Dict[str, MacroGenerator]
 NamespaceMember = Union[FlatNamespace, MacroGenerator]
 FullNamespace = Dict[str, NamespaceMember]
 
+MacroDict = Dict[str, ParsedMacro]
+LayoutMember = Union[MacroDict, ParsedMacro]
 
-# The point of this class is to collect the various macros
-# and provide the ability to flatten them into the ManifestContexts
-# that are created for jinja, so that macro calls can be resolved.
-# Creates special iterators and _keys methods to flatten the lists.
-# When this class is created it has a static 'local_namespace' which
-# depends on the package of the node, so it only works for one
-# particular local package at a time for "flattening" into a context.
-# 'get_by_package' should work for any macro.
-class MacroNamespace(Mapping):
+# The context key of the MacroNamespace that binds the UnboundMacros
+MACRO_NAMESPACE_KEY = '_macro_namespace'
+
+
+# The macros in a context dictionary are UnboundMacros, which are shared
+# by the contexts of all the nodes in a package. When jinja calls one,
+# it's bound to the node of the calling template's context, so a
+# MacroGenerator is only created for the macros that a node calls.
+class UnboundMacro:
+    def __init__(self, macro: ParsedMacro) -> None:
+        self.macro = macro
+
+    @jinja2.contextfunction
+    def __call__(self, *args, **kwargs):
+        if not args or not isinstance(args[0], jinja2.runtime.Context):
+            raise InternalException(
+                f'The macro {self.macro.unique_id} can only be called from jinja'
+            )
+        context, *args = args
+        namespace = context.get(MACRO_NAMESPACE_KEY)
+        if not isinstance(namespace, MacroNamespace):
+            raise InternalException(
+                f'No macro namespace found to call {self.macro.unique_id}'
+            )
+        return namespace.bind(self.macro)(*args, **kwargs)
+
+
+# The macros that are visible from one package, by name. It doesn't
+# depend on the node, so it's built once for each package and shared
+# by the MacroNamespaces of all the nodes in that package.
+class MacroNamespaceLayout:
     def __init__(
         self,
-        global_namespace: FlatNamespace,  # root package macros
-        local_namespace: FlatNamespace,   # packages for *this* node
-        global_project_namespace: FlatNamespace,  # internal packages
-        packages: Dict[str, FlatNamespace],  # non-internal packages
-    ):
-        self.global_namespace: FlatNamespace = global_namespace
-        self.local_namespace: FlatNamespace = local_namespace
-        self.packages: Dict[str, FlatNamespace] = packages
-        self.global_project_namespace: FlatNamespace = global_project_namespace
+        global_namespace: MacroDict,  # root package macros
+        local_namespace: MacroDict,   # packages for *this* node
+        global_project_namespace: MacroDict,  # internal packages
+        packages: Dict[str, MacroDict],  # non-internal packages
+    ) -> None:
+        self.global_namespace = global_namespace
+        self.local_namespace = local_namespace
+        self.global_project_namespace = global_project_namespace
+        self.packages = packages
+        # Every key and the member that's found for it, in search order
+        self.members: Dict[str, LayoutMember] = {}
+        for search in self._search_order():
+            for key, member in search.items():
+                self.members.setdefault(key, member)
+        # The members as they are added to the context dictionaries
+        self.context_members: Dict[str, Any] = {}
+        unbound: Dict[str, UnboundMacro] = {}
+        for key, member in self.members.items():
+            if isinstance(member, dict):
+                self.context_members[key] = {
+                    name: self._unbound(unbound, macro) for name, macro in member.items()
+                }
+            else:
+                self.context_members[key] = self._unbound(unbound, member)
+
+    @staticmethod
+    def _unbound(unbound: Dict[str, UnboundMacro], macro: ParsedMacro) -> UnboundMacro:
+        if macro.unique_id not in unbound:
+            unbound[macro.unique_id] = UnboundMacro(macro)
+        return unbound[macro.unique_id]
 
-    def _search_order(self) -> Iterable[Union[FullNamespace, FlatNamespace]]:
+    def _search_order(self) -> Iterable[Mapping[str, LayoutMember]]:
         yield self.local_namespace   # local package
         yield self.global_namespace  # root package
         yield self.packages          # non-internal packages
@@ -45,46 +93,95 @@ class MacroNamespace(Mapping):
         }
         yield self.global_project_namespace  # other internal project besides dbt
 
-    # provides special keys method for MacroNamespace iterator
-    # returns keys from local_namespace, global_namespace, packages,
-    # global_project_namespace
-    def _keys(self) -> Set[str]:
-        keys: Set[str] = set()
-        for search in self._search_order():
-            keys.update(search)
-        return keys
 
-    # special iterator using special keys
+# The point of this class is to collect the various macros
+# and provide the ability to flatten them into the ManifestContexts
+# that are created for jinja, so that macro calls can be resolved.
+# It looks up the macros in a MacroNamespaceLayout, which depends on
+# the package of the node, and creates a MacroGenerator for a macro
+# the first time it's used.
+# 'get_by_package' should work for any macro.
+class MacroNamespace(Mapping):
+    def __init__(
+        self,
+        layout: MacroNamespaceLayout,
+        ctx: Dict[str, Any],
+        node: Optional[Any] = None,
+        thread_ctx: Optional[MacroStack] = None,
+    ):
+        self.layout = layout
+        self.ctx = ctx
+        self.node = node
+        self.thread_ctx = thread_ctx
+        self._generators: Dict[str, MacroGenerator] = {}
+        self._packages: Dict[str, FlatNamespace] = {}
+
+    def bind(self, macro: ParsedMacro) -> MacroGenerator:
+        """Return the MacroGenerator that calls the macro for this node."""
+        macro_func = self._generators.get(macro.unique_id)
+        if macro_func is None:
+            # MacroGenerator is in clients/jinja.py
+            # a MacroGenerator object is a callable object that will
+            # execute the MacroGenerator.__call__ function
+            macro_func = MacroGenerator(macro, self.ctx, self.node, self.thread_ctx)
+            self._generators[macro.unique_id] = macro_func
+        return macro_func
+
+    def _bind_package(self, key: str, macros: MacroDict) -> FlatNamespace:
+        if key not in self._packages:
+            self._packages[key] = {
+                name: self.bind(macro) for name, macro in macros.items()
+            }
+        return self._packages[key]
+
+    def _bind_member(self, key: str, member: LayoutMember) -> NamespaceMember:
+        if isinstance(member, dict):
+            return self._bind_package(key, member)
+        return self.bind(member)
+
+    def to_context(self) -> Dict[str, Any]:
+        """Return the members to add to the context dictionary. They are
+        shared with the contexts of the other nodes in the package, and
+        are bound to this node through this namespace when they're called.
+        """
+        context_members = dict(self.layout.context_members)
+        context_members[MACRO_NAMESPACE_KEY] = self
+        return context_members
+
+    # special iterator using the keys from local_namespace,
+    # global_namespace, packages and global_project_namespace
     def __iter__(self) -> Iterator[str]:
-        for key in self._keys():
-            yield key
+        return iter(self.layout.members)
 
     def __len__(self):
-        return len(self._keys())
+        return len(self.layout.members)
 
     def __getitem__(self, key: str) -> NamespaceMember:
-        for dct in self._search_order():
-            if key in dct:
-                return dct[key]
-        raise KeyError(key)
+        return self._bind_member(key, self.layout.members[key])
 
     def get_from_package(
         self, package_name: Optional[str], name: str
     ) -> Optional[MacroGenerator]:
-        pkg: FlatNamespace
+        macro: Optional[ParsedMacro]
         if package_name is None:
-            return self.get(name)
+            member = self.layout.members.get(name)
+            if member is None:
+                return None
+            return self._bind_member(name, member)  # type: ignore
         elif package_name == GLOBAL_PROJECT_NAME:
-            return self.global_project_namespace.get(name)
-        elif package_name in self.packages:
-            return self.packages[package_name].get(name)
+            macro = self.layout.global_project_namespace.get(name)
+        elif package_name in self.layout.packages:
+            macro = self.layout.packages[package_name].get(name)
         else:
             raise_compiler_error(
                 f"Could not find package '{package_name}'"
             )
+        if macro is None:
+            return None
+        return self.bind(macro)
 
 
-# This class builds the MacroNamespace by adding macros to
+# This class builds the MacroNamespaceLayout by adding macros to
 # internal_packages or packages, and locals/globals.
 # Call 'build_namespace' to return a MacroNamespace.
 # This is used by ManifestContext (and subclasses)
@@ -102,24 +199,31 @@ class MacroNamespaceBuilder:
         # internal packages comes from get_adapter_package_names
         self.internal_package_names = set(internal_packages)
         self.internal_package_names_order = internal_packages
-        # macro_func is added here if in root package, since
+        # macro is added here if in root package, since
         # the root package acts as a "global" namespace, overriding
         # everything else except local external package macro calls
-        self.globals: FlatNamespace = {}
-        # macro_func is added here if it's the package for this node
-        self.locals: FlatNamespace = {}
-        # Create a dictionary of [package name][macro name] =
-        #     MacroGenerator object which acts like a function
-        self.internal_packages: Dict[str, FlatNamespace] = {}
-        self.packages: Dict[str, FlatNamespace] = {}
+        self.globals: MacroDict = {}
+        # macro is added here if it's the package for this node
+        self.locals: MacroDict = {}
+        # Create a dictionary of [package name][macro name] = macro
+        self.internal_packages: Dict[str, MacroDict] = {}
+        self.packages: Dict[str, MacroDict] = {}
         self.thread_ctx = thread_ctx
         self.node = node
 
+    @property
+    def layout_key(self) -> Tuple[str, ...]:
+        """The layout only depends on these, so it can be shared by the
+        builders that have the same key.
+        """
+        return (
+            self.root_package, self.search_package, *self.internal_package_names_order
+        )
+
     def _add_macro_to(
         self,
-        hierarchy: Dict[str, FlatNamespace],
+        hierarchy: Dict[str, MacroDict],
         macro: ParsedMacro,
-        macro_func: MacroGenerator,
     ):
         if macro.package_name in hierarchy:
             namespace = hierarchy[macro.package_name]
@@ -129,54 +233,55 @@ class MacroNamespaceBuilder:
 
         if macro.name in namespace:
             raise_duplicate_macro_name(
-                macro_func.macro, macro, macro.package_name
+                namespace[macro.name], macro, macro.package_name
             )
-        hierarchy[macro.package_name][macro.name] = macro_func
+        hierarchy[macro.package_name][macro.name] = macro
 
-    def add_macro(self, macro: ParsedMacro, ctx: Dict[str, Any]):
+    def add_macro(self, macro: ParsedMacro):
         macro_name: str = macro.name
 
-        # MacroGenerator is in clients/jinja.py
-        # a MacroGenerator object is a callable object that will
-        # execute the MacroGenerator.__call__ function
-        macro_func: MacroGenerator = MacroGenerator(
-            macro, ctx, self.node, self.thread_ctx
-        )
-
         # internal macros (from plugins) will be processed separately from
         # project macros, so store them in a different place
         if macro.package_name in self.internal_package_names:
-            self._add_macro_to(self.internal_packages, macro, macro_func)
+            self._add_macro_to(self.internal_packages, macro)
         else:
             # if it's not an internal package
-            self._add_macro_to(self.packages, macro, macro_func)
+            self._add_macro_to(self.packages, macro)
             # add to locals if it's the package this node is in
             if macro.package_name == self.search_package:
-                self.locals[macro_name] = macro_func
+                self.locals[macro_name] = macro
             # add to globals if it's in the root package
             elif macro.package_name == self.root_package:
-                self.globals[macro_name] = macro_func
+                self.globals[macro_name] = macro
 
-    def add_macros(self, macros: Iterable[ParsedMacro], ctx: Dict[str, Any]):
+    def add_macros(self, macros: Iterable[ParsedMacro]):
         for macro in macros:
-            self.add_macro(macro, ctx)
+            self.add_macro(macro)
 
-    def build_namespace(
-        self, macros: Iterable[ParsedMacro], ctx: Dict[str, Any]
-    ) -> MacroNamespace:
-        self.add_macros(macros, ctx)
+    def build_layout(self, macros: Iterable[ParsedMacro]) -> MacroNamespaceLayout:
+        self.add_macros(macros)
 
         # Iterate in reverse-order and overwrite: the packages that are first
         # in the list are the ones we want to "win".
-        global_project_namespace: FlatNamespace = {}
+        global_project_namespace: MacroDict = {}
         for pkg in reversed(self.internal_package_names_order):
             if pkg in self.internal_packages:
                 # add the macros pointed to by this package name
                 global_project_namespace.update(self.internal_packages[pkg])
 
-        return MacroNamespace(
+        return MacroNamespaceLayout(
             global_namespace=self.globals,  # root package macros
             local_namespace=self.locals,  # packages for *this* node
             global_project_namespace=global_project_namespace,  # internal packages
             packages=self.packages,  # non internal_packages
         )
+
+    def namespace_for_layout(
+        self, layout: MacroNamespaceLayout, ctx: Dict[str, Any]
+    ) -> MacroNamespace:
+        return MacroNamespace(layout, ctx, self.node, self.thread_ctx)
+
+    def build_namespace(
+        self, macros: Iterable[ParsedMacro], ctx: Dict[str, Any]
+    ) -> MacroNamespace:
+        return self.namespace_for_layout(self.build_layout(macros), ctx)
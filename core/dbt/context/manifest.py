@@ -36,11 +36,16 @@ class ManifestContext(ConfiguredContext):
 
     def _build_namespace(self):
         # this takes all the macros in the manifest and adds them
-        # to the MacroNamespaceBuilder stored in self.namespace
+        # to the MacroNamespaceBuilder stored in self.namespace. The
+        # layout of the macros only depends on the package, so it's
+        # built once and shared by the contexts of the package's nodes.
         builder = self._get_namespace_builder()
-        return builder.build_namespace(
-            self.manifest.macros.values(), self._ctx
-        )
+        layouts = self.manifest.macro_lookup.namespace_layouts
+        layout = layouts.get(builder.layout_key)
+        if layout is None:
+            layout = builder.build_layout(self.manifest.macros.values())
+            layouts[builder.layout_key] = layout
+        return builder.namespace_for_layout(layout, self._ctx)
 
     def _get_namespace_builder(self) -> MacroNamespaceBuilder:
         # avoid an import loop
@@ -65,7 +70,7 @@ class ManifestContext(ConfiguredContext):
             dct.update(self.namespace.local_namespace)
             dct.update(self.namespace.project_namespace)
         else:
-            dct.update(self.namespace)
+            dct.update(self.namespace.to_context())
         return dct
 
 
@@ -549,9 +549,11 @@ class ModelConfiguredVar(Var):
         context: Dict[str, Any],
         config: RuntimeConfig,
         node: CompiledResource,
+        manifest: Optional[Manifest] = None,
     ) -> None:
         self._node: CompiledResource
         self._config: RuntimeConfig = config
+        self._manifest: Optional[Manifest] = manifest
         super().__init__(context, config.cli_vars, node=node)
 
     def packages_for_node(self) -> Iterable[Project]:
@@ -585,6 +587,13 @@ class ModelConfiguredVar(Var):
 
 
 class ParseVar(ModelConfiguredVar):
+    def __call__(self, var_name, default=Var._VAR_NOTSET):
+        # Save the var name in the source_file, so the file is reparsed if
+        # the --vars value changes
+        if self._manifest is not None and self._node is not None:
+            self._manifest.add_var_to_file(self._node, var_name)
+        return super().__call__(var_name, default)
+
     def get_missing_var(self, var_name):
         # in the parser, just always return None.
         return None
@@ -594,6 +603,27 @@ class RuntimeVar(ModelConfiguredVar):
     pass
 
 
+class GenerateNameVar(RuntimeVar):
+    # The generate_x_name macros are rendered with the macro as the model, so
+    # the node that is being named is set by the caller while it's rendered.
+    def __init__(
+        self,
+        context: Dict[str, Any],
+        config: RuntimeConfig,
+        node: CompiledResource,
+        manifest: Optional[Manifest] = None,
+    ) -> None:
+        self.named_node: Optional[Any] = None
+        super().__init__(context, config, node, manifest)
+
+    def __call__(self, var_name, default=Var._VAR_NOTSET):
+        # Save the var name in the named node's source_file, so the file is
+        # reparsed and the node renamed if the --vars value changes
+        if self._manifest is not None and self.named_node is not None:
+            self._manifest.add_var_to_file(self.named_node, var_name)
+        return super().__call__(var_name, default)
+
+
 # Providers
 class Provider(Protocol):
     execute: bool
@@ -617,7 +647,7 @@ class GenerateNameProvider(Provider):
     execute = False
     Config = RuntimeConfigObject
     DatabaseWrapper = ParseDatabaseWrapper
-    Var = RuntimeVar
+    Var = GenerateNameVar
     ref = ParseRefResolver
     source = ParseSourceResolver
 
@@ -999,6 +1029,7 @@ class ProviderContext(ManifestContext):
             context=self._ctx,
             config=self.config,
             node=self.model,
+            manifest=self.manifest,
         )
 
     @contextproperty('adapter')
@@ -1306,7 +1337,8 @@ def generate_parser_model_context(
 ) -> Dict[str, Any]:
     # The __init__ method of ModelContext also initializes
     # a ManifestContext object which creates a MacroNamespaceBuilder
-    # which adds every macro in the Manifest.
+    # which adds every macro in the Manifest, the first time that a
+    # context is created for the model's package.
     ctx = ModelContext(
         model, config, manifest, ParseProvider(), context_config
     )
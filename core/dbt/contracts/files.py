@@ -77,6 +77,25 @@ class FilePath(dbtClassMixin):
         return os.stat(self.full_path).st_size > MAXIMUM_SEED_SIZE
 
 
+@dataclass
+class FileStat(dbtClassMixin):
+    """The stat information that is used to decide whether a file has
+    changed since it was last read, without reading it.
+    """
+    size: int
+    mtime_ns: int
+    inode: int
+
+    @classmethod
+    def from_path(cls, path: str) -> 'FileStat':
+        stat_result = os.stat(path)
+        return cls(
+            size=stat_result.st_size,
+            mtime_ns=stat_result.st_mtime_ns,
+            inode=stat_result.st_ino,
+        )
+
+
 @dataclass
 class FileHash(dbtClassMixin):
     name: str  # the hash type name
@@ -151,6 +170,9 @@ class BaseSourceFile(dbtClassMixin, SerializableType):
     parse_file_type: Optional[ParseFileType] = None
     # we don't want to serialize this
     contents: Optional[str] = None
+    # the stat of the file when it was loaded, used to skip reading
+    # and hashing files that haven't changed
+    stat: Optional[FileStat] = None
     # the unique IDs contained in this file
 
     @property
@@ -191,6 +213,8 @@ class SourceFile(BaseSourceFile):
     docs: List[str] = field(default_factory=list)
     macros: List[str] = field(default_factory=list)
     env_vars: List[str] = field(default_factory=list)
+    # the names of the vars that were used while parsing the file
+    vars: List[str] = field(default_factory=list)
 
     @classmethod
     def big_seed(cls, path: FilePath) -> 'SourceFile':
@@ -203,6 +227,10 @@ class SourceFile(BaseSourceFile):
         if value not in self.nodes:
             self.nodes.append(value)
 
+    def add_var(self, var):
+        if var not in self.vars:
+            self.vars.append(var)
+
     # TODO: do this a different way. This remote file kludge isn't going
     # to work long term
     @classmethod
@@ -233,6 +261,8 @@ class SchemaSourceFile(BaseSourceFile):
     # created too, but those are in 'sources'
     sop: List[SourceKey] = field(default_factory=list)
     env_vars: Dict[str, Any] = field(default_factory=dict)
+    # yaml_key to entry name to the names of the vars used in the entry
+    vars: Dict[str, Any] = field(default_factory=dict)
     pp_dict: Optional[Dict[str, Any]] = None
     pp_test_index: Optional[Dict[str, Any]] = None
 
@@ -318,5 +348,19 @@ class SchemaSourceFile(BaseSourceFile):
             if not self.env_vars[yaml_key]:
                 del self.env_vars[yaml_key]
 
+    def add_var(self, var, yaml_key, name):
+        if yaml_key not in self.vars:
+            self.vars[yaml_key] = {}
+        if name not in self.vars[yaml_key]:
+            self.vars[yaml_key][name] = []
+        if var not in self.vars[yaml_key][name]:
+            self.vars[yaml_key][name].append(var)
+
+    def delete_from_vars(self, yaml_key, name):
+        if yaml_key in self.vars and name in self.vars[yaml_key]:
+            del self.vars[yaml_key][name]
+            if not self.vars[yaml_key]:
+                del self.vars[yaml_key]
+
 
 AnySourceFile = Union[SchemaSourceFile, SourceFile]
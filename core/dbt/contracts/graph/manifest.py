@@ -1,11 +1,13 @@
 import enum
+import sys
+import threading
 from dataclasses import dataclass, field
 from itertools import chain, islice
 from mashumaro import DataClassMessagePackMixin
 from multiprocessing.synchronize import Lock
 from typing import (
     Dict, List, Optional, Union, Mapping, MutableMapping, Any, Set, Tuple,
-    TypeVar, Callable, Generic, cast, AbstractSet, ClassVar
+    TypeVar, Callable, Generic, cast, AbstractSet, ClassVar, Iterator
 )
 from typing_extensions import Protocol
 from uuid import UUID
@@ -14,12 +16,14 @@ from dbt.contracts.graph.compiled import (
     CompileResultNode, ManifestNode, NonSourceCompiledNode, GraphMemberNode
 )
 from dbt.contracts.graph.parsed import (
-    ParsedMacro, ParsedDocumentation,
+    ParsedMacro, ParsedDocumentation, MacroDependsOn, DependsOn,
     ParsedSourceDefinition, ParsedExposure, ParsedMetric,
     HasUniqueID, UnpatchedSourceDefinition, ManifestNodes
 )
 from dbt.contracts.graph.unparsed import SourcePatch
-from dbt.contracts.files import SourceFile, SchemaSourceFile, FileHash, AnySourceFile
+from dbt.contracts.files import (
+    BaseSourceFile, SourceFile, SchemaSourceFile, FileHash, AnySourceFile
+)
 from dbt.contracts.util import (
     BaseArtifactMetadata, SourceKey, ArtifactMixin, schema_version
 )
@@ -210,6 +214,137 @@ class AnalysisLookup(RefableLookup):
     _lookup_types: ClassVar[set] = set([NodeType.Analysis])
 
 
+def _edge_sections(manifest: 'Manifest') -> Tuple[Mapping[str, Any], ...]:
+    return (manifest.nodes, manifest.sources, manifest.exposures, manifest.metrics)
+
+
+# The parents and children of the nodes, sources, exposures and metrics.
+# The Manifest methods that add, replace or remove them mark their unique
+# ids, and the marked ones are read again the next time the edges are
+# read, so a partial parse only updates the edges that changed. That's
+# also when a marked node's depends_on is read, so changes made to it
+# before then, like the ones from processing refs, are picked up. A dict
+# that was replaced is compared with the one it replaced, and if members
+# were removed without the Manifest methods, everything is read again.
+class ParentChildLookup:
+    def __init__(self, manifest: 'Manifest') -> None:
+        self._lock = threading.Lock()
+        # unique_id -> the unique ids it depends on, for every member
+        self.parents: Dict[UniqueID, List[UniqueID]] = {}
+        # unique_id -> the members that depend on it. Removed members
+        # keep their (possibly empty) set, so their children can still
+        # be found while partial parsing.
+        self.children: Dict[UniqueID, Set[UniqueID]] = {}
+        self.changed: Set[UniqueID] = set()
+        self.sections: Tuple[Mapping[str, Any], ...] = ()
+        # (children, unique_id) -> the sorted edges
+        self.sorted_edges: Dict[Tuple[bool, UniqueID], List[UniqueID]] = {}
+        self.populate(manifest)
+
+    def populate(self, manifest: 'Manifest') -> None:
+        self.parents.clear()
+        self.children.clear()
+        self.changed.clear()
+        self.sorted_edges.clear()
+        self.sections = _edge_sections(manifest)
+        for section in self.sections:
+            for node in section.values():
+                self._add(node)
+
+    def _add(self, node) -> None:
+        unique_id = node.unique_id
+        parents = list(node.depends_on_nodes)
+        self.parents[unique_id] = parents
+        self.children.setdefault(unique_id, set())
+        for parent_id in parents:
+            self.children.setdefault(parent_id, set()).add(unique_id)
+
+    def _remove(self, unique_id: UniqueID) -> None:
+        for parent_id in self.parents.pop(unique_id, ()):
+            self.children[parent_id].discard(unique_id)
+
+    def mark_changed(self, unique_id: UniqueID) -> None:
+        with self._lock:
+            self.changed.add(unique_id)
+
+    def _sync(self, manifest: 'Manifest') -> None:
+        sections = _edge_sections(manifest)
+        for section, old_section in zip(sections, self.sections):
+            if section is not old_section:
+                # like the sources after they're patched
+                self.changed.update(
+                    unique_id for unique_id, node in section.items()
+                    if old_section.get(unique_id) is not node
+                )
+                self.changed.update(
+                    unique_id for unique_id in old_section if unique_id not in section
+                )
+        self.sections = sections
+        if self.changed:
+            self.sorted_edges.clear()
+        for unique_id in self.changed:
+            self._remove(unique_id)
+            for section in sections:
+                if unique_id in section:
+                    self._add(section[unique_id])
+                    break
+        self.changed.clear()
+        if len(self.parents) != sum(len(section) for section in sections):
+            self.populate(manifest)
+
+    def sync(self, manifest: 'Manifest') -> None:
+        with self._lock:
+            self._sync(manifest)
+
+    def _edges(self, children: bool) -> Mapping[UniqueID, Any]:
+        if children:
+            return self.children
+        return self.parents
+
+    def get_edges(
+        self, manifest: 'Manifest', unique_id: UniqueID, children: bool
+    ) -> List[UniqueID]:
+        with self._lock:
+            self._sync(manifest)
+            key = (children, unique_id)
+            if key not in self.sorted_edges:
+                self.sorted_edges[key] = sorted(self._edges(children)[unique_id])
+            return self.sorted_edges[key]
+
+    def has_edges(self, manifest: 'Manifest', unique_id: UniqueID, children: bool) -> bool:
+        with self._lock:
+            self._sync(manifest)
+            return unique_id in self._edges(children)
+
+
+# The parent_map and child_map of the manifest. The lists are sorted when
+# they're read, which makes the output deterministic.
+class EdgeMap(Mapping):
+    def __init__(self, manifest: 'Manifest', children: bool) -> None:
+        self.manifest = manifest
+        self.children = children
+
+    def __getitem__(self, unique_id: UniqueID) -> List[UniqueID]:
+        return self.manifest.parent_child_lookup.get_edges(
+            self.manifest, unique_id, self.children
+        )
+
+    def __contains__(self, unique_id) -> bool:
+        return self.manifest.parent_child_lookup.has_edges(
+            self.manifest, unique_id, self.children
+        )
+
+    def __iter__(self) -> Iterator[UniqueID]:
+        lookup = self.manifest.parent_child_lookup
+        lookup.sync(self.manifest)
+        return chain.from_iterable(lookup.sections)
+
+    def __len__(self) -> int:
+        lookup = self.manifest.parent_child_lookup
+        lookup.sync(self.manifest)
+        return len(lookup.parents)
+
+
 def _search_packages(
     current_project: str,
     node_package: str,
@@ -276,22 +411,6 @@ def _sort_values(dct):
     return {k: sorted(v) for k, v in dct.items()}
 
 
-def build_node_edges(nodes: List[ManifestNode]):
-    """Build the forward and backward edges on the given list of ParsedNodes
-    and return them as two separate dictionaries, each mapping unique IDs to
-    lists of edges.
-    """
-    backward_edges: Dict[str, List[str]] = {}
-    # pre-populate the forward edge dict for simplicity
-    forward_edges: Dict[str, List[str]] = {n.unique_id: [] for n in nodes}
-    for node in nodes:
-        backward_edges[node.unique_id] = node.depends_on_nodes[:]
-        for unique_id in node.depends_on_nodes:
-            if unique_id in forward_edges.keys():
-                forward_edges[unique_id].append(node.unique_id)
-    return _sort_values(forward_edges), _sort_values(backward_edges)
-
-
 # Build a map of children of macros and generic tests
 def build_macro_edges(nodes: List[Any]):
     forward_edges: Dict[str, List[str]] = {
@@ -439,6 +558,7 @@ MaybeNonSource = Optional[Union[
 
 
 T = TypeVar('T', bound=GraphMemberNode)
+F = TypeVar('F', bound=BaseSourceFile)
 
 
 def _update_into(dest: MutableMapping[str, T], new_item: T):
@@ -461,6 +581,69 @@ def _update_into(dest: MutableMapping[str, T], new_item: T):
     dest[unique_id] = new_item
 
 
+# Macros are looked up by name, so this indexes them by name. The
+# resolved materialization and generate_X_name macros are cached in
+# 'resolved', and the macro namespace layouts of the contexts in
+# 'namespace_layouts', because they're needed for every node.
+class MacroLookup:
+    def __init__(self, manifest):
+        # avoid an import cycle
+        from dbt.adapters.factory import get_adapter_package_names
+        self.adapter_type: Optional[str] = manifest.metadata.adapter_type
+        self.internal_packages: Set[str] = set(
+            get_adapter_package_names(self.adapter_type)
+        )
+        self.storage: Dict[str, List[UniqueID]] = {}
+        self.resolved: Dict[Tuple[str, ...], Optional[ParsedMacro]] = {}
+        # The MacroNamespaceLayouts of the contexts, by their layout_key
+        self.namespace_layouts: Dict[Tuple[str, ...], Any] = {}
+        # the number of macros in the manifest that the lookup knows
+        # about, to find out if macros were added or removed without it
+        self.macro_count = 0
+        self.populate(manifest)
+
+    def add_macro(self, macro: ParsedMacro):
+        unique_ids = self.storage.setdefault(macro.name, [])
+        if macro.unique_id in unique_ids:
+            unique_ids.remove(macro.unique_id)
+        else:
+            self.macro_count += 1
+        # keep the order of the manifest's macros, which breaks ties
+        unique_ids.append(macro.unique_id)
+        self.resolved.clear()
+        self.namespace_layouts.clear()
+
+    def populate(self, manifest):
+        for macro in manifest.macros.values():
+            self.add_macro(macro)
+
+    def find_candidates(
+        self, name: str, root_project_name: str, manifest
+    ) -> CandidateList:
+        candidates: CandidateList = CandidateList()
+        for unique_id in self.storage.get(name, ()):
+            macro = manifest.macros.get(unique_id)
+            if macro is None:
+                continue
+            candidates.append(MacroCandidate(
+                locality=_get_locality(macro, root_project_name, self.internal_packages),
+                macro=macro,
+            ))
+        return candidates
+
+    def find_resolved(
+        self, key: Tuple[str, ...], manifest, resolve: Callable[[], Optional[ParsedMacro]]
+    ) -> Optional[ParsedMacro]:
+        if key in self.resolved:
+            macro = self.resolved[key]
+            # the macro could have been replaced or removed since
+            if macro is None or manifest.macros.get(macro.unique_id) is macro:
+                return macro
+        macro = resolve()
+        self.resolved[key] = macro
+        return macro
+
+
 # This contains macro methods that are in both the Manifest
 # and the MacroManifest
 class MacroMethods:
@@ -468,6 +651,22 @@ class MacroMethods:
     def __init__(self):
         self.macros = []
         self.metadata = {}
+        self._macro_lookup: Optional[MacroLookup] = None
+
+    @property
+    def macro_lookup(self) -> MacroLookup:
+        lookup = self._macro_lookup
+        if (
+            lookup is None or
+            lookup.adapter_type != self.metadata.adapter_type or
+            lookup.macro_count != len(self.macros)
+        ):
+            lookup = MacroLookup(self)
+            self._macro_lookup = lookup
+        return lookup
+
+    def rebuild_macro_lookup(self):
+        self._macro_lookup = MacroLookup(self)
 
     def find_macro_by_name(
         self, name: str, root_project_name: str, package: Optional[str]
@@ -505,13 +704,18 @@ class MacroMethods:
         def filter(candidate: MacroCandidate) -> bool:
             return candidate.locality != Locality.Imported
 
-        candidates: CandidateList = self._find_macros_by_name(
-            name=f'generate_{component}_name',
-            root_project_name=root_project_name,
-            # filter out imported packages
-            filter=filter,
+        def resolve() -> Optional[ParsedMacro]:
+            candidates: CandidateList = self._find_macros_by_name(
+                name=f'generate_{component}_name',
+                root_project_name=root_project_name,
+                # filter out imported packages
+                filter=filter,
+            )
+            return candidates.last()
+
+        return self.macro_lookup.find_resolved(
+            ('generate', root_project_name, component), self, resolve
         )
-        return candidates.last()
 
     def _find_macros_by_name(
         self,
@@ -521,21 +725,158 @@ class MacroMethods:
     ) -> CandidateList:
         """Find macros by their name.
         """
-        # avoid an import cycle
-        from dbt.adapters.factory import get_adapter_package_names
-        candidates: CandidateList = CandidateList()
-        packages = set(get_adapter_package_names(self.metadata.adapter_type))
-        for unique_id, macro in self.macros.items():
-            if macro.name != name:
-                continue
-            candidate = MacroCandidate(
-                locality=_get_locality(macro, root_project_name, packages),
-                macro=macro,
-            )
-            if filter is None or filter(candidate):
-                candidates.append(candidate)
+        candidates: CandidateList = self.macro_lookup.find_candidates(
+            name, root_project_name, self
+        )
+        if filter is None:
+            return candidates
+        return CandidateList(c for c in candidates if filter(c))
+
+
+_COMPACTED_MEMBERS = frozenset((MacroDependsOn, DependsOn, FileHash))
+_SCALAR_TYPES = frozenset((str, bool, int, float, type(None)))
+
+
+# Many nodes repeat the same strings (package names, paths, unique ids in
+# depends_on and refs, fqn parts, tags...), and a project's folders often
+# give many nodes the same config. The compactor interns those strings and
+# shares one config object between the nodes whose configs are equal, once
+# the manifest is parsed. Node contents and serialization don't change.
+# Because configs are shared, change a node's config by replacing it, not
+# in place.
+class ManifestCompactor:
+    # long strings that are seldom repeated, so not worth interning
+    SKIP_ATTRS = frozenset((
+        'raw_sql', 'compiled_sql', 'injected_sql', 'description',
+        'block_contents', 'macro_sql',
+    ))
 
-        return candidates
+    # how many distinct configs with the same scalar values are compared
+    MAX_CONFIG_CANDIDATES = 8
+
+    def __init__(self) -> None:
+        # scalar config values -> the distinct configs that have them
+        self._configs: Dict[Tuple[Any, ...], List[Any]] = {}
+
+    def _intern_list(self, values: List[Any]) -> None:
+        for idx, value in enumerate(values):
+            if type(value) is str:
+                values[idx] = sys.intern(value)
+            elif type(value) is list:
+                self._intern_list(value)
+
+    def intern_strings(self, obj: Any) -> None:
+        attrs = vars(obj)
+        # only values are replaced, so the dict can be changed while
+        # iterating over it
+        for name, value in attrs.items():
+            kind = type(value)
+            if kind is str:
+                if name not in self.SKIP_ATTRS:
+                    attrs[name] = sys.intern(value)
+            elif kind is list:
+                self._intern_list(value)
+            elif kind in _COMPACTED_MEMBERS:
+                self.intern_strings(value)
+
+    def _config_key(self, config: Any) -> Tuple[Any, ...]:
+        key: List[Any] = [type(config)]
+        for value in vars(config).values():
+            kind = type(value)
+            if kind in _SCALAR_TYPES:
+                key.append(value)
+            elif kind is list and all(type(item) is str for item in value):
+                key.append(tuple(value))
+        return tuple(key)
+
+    def share_config(self, node: Any) -> None:
+        config = node.config
+        candidates = self._configs.setdefault(self._config_key(config), [])
+        for candidate in candidates:
+            if candidate == config:
+                node.config = candidate
+                return
+        if len(candidates) < self.MAX_CONFIG_CANDIDATES:
+            self.intern_strings(config)
+            candidates.append(config)
+
+    def compact_node(self, node: Any, files: Mapping[str, Any]) -> None:
+        self.intern_strings(node)
+        if getattr(node, 'config', None) is not None:
+            self.share_config(node)
+        checksum = getattr(node, 'checksum', None)
+        if checksum is not None:
+            # the node's checksum is its file's checksum
+            source_file = files.get(node.file_id)
+            if source_file is not None and source_file.checksum == checksum:
+                node.checksum = source_file.checksum
+
+    def compact(self, manifest: 'Manifest') -> None:
+        nodes: List[Any] = [
+            *manifest.nodes.values(),
+            *manifest.sources.values(),
+            *manifest.macros.values(),
+            *manifest.exposures.values(),
+            *manifest.metrics.values(),
+        ]
+        for disabled in manifest.disabled.values():
+            nodes.extend(disabled)
+        for node in nodes:
+            self.compact_node(node, manifest.files)
+
+
+# The 'graph' context variable. The entries are serialized the first
+# time they're read, and serialized again after the node was replaced in
+# the manifest, so projects that don't use 'graph' don't pay for it.
+class FlatGraphSection(Mapping):
+    def __init__(self, manifest: 'Manifest', attr: str) -> None:
+        self.manifest = manifest
+        self.attr = attr
+        # unique_id -> (node, serialized node)
+        self._cache: Dict[str, Tuple[Any, Dict[str, Any]]] = {}
+
+    @property
+    def _items(self) -> Mapping[str, Any]:
+        return getattr(self.manifest, self.attr)
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        item = self._items[key]
+        cached = self._cache.get(key)
+        if cached is None or cached[0] is not item:
+            cached = (item, item.to_dict(omit_none=False))
+            self._cache[key] = cached
+        return cached[1]
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __repr__(self):
+        return repr(self.copy())
+
+    def copy(self) -> Dict[str, Dict[str, Any]]:
+        """Return the section as a dict, like the section was before it was
+        read lazily.
+        """
+        return dict(self)
+
+    # pickle and deepcopy get a dict, which doesn't refer to the manifest
+    def __reduce_ex__(self, protocol):
+        return dict, (self.copy(),)
+
+
+class FlatGraph(dict):
+    SECTIONS = ('exposures', 'metrics', 'nodes', 'sources')
+
+    def __init__(self, manifest: 'Manifest') -> None:
+        super().__init__(
+            (name, FlatGraphSection(manifest, name)) for name in self.SECTIONS
+        )
+
+    def __reduce_ex__(self, protocol):
+        return dict, (dict(self),)
 
 
 @dataclass
@@ -551,6 +892,18 @@ class ManifestStateCheck(dbtClassMixin):
     profile_env_vars_hash: FileHash = field(default_factory=FileHash.empty)
     profile_hash: FileHash = field(default_factory=FileHash.empty)
     project_hashes: MutableMapping[str, FileHash] = field(default_factory=dict)
+    # the checksum of the value of each --vars var
+    cli_vars_hashes: MutableMapping[str, str] = field(default_factory=dict)
+
+    def changed_cli_vars(self, other: 'ManifestStateCheck') -> Set[str]:
+        """Return the names of the --vars vars that were added, removed
+        or changed between 'other' and this state check.
+        """
+        names = set(self.cli_vars_hashes) | set(other.cli_vars_hashes)
+        return {
+            name for name in names
+            if self.cli_vars_hashes.get(name) != other.cli_vars_hashes.get(name)
+        }
 
 
 @dataclass
@@ -569,7 +922,7 @@ class Manifest(MacroMethods, DataClassMessagePackMixin, dbtClassMixin):
     selectors: MutableMapping[str, Any] = field(default_factory=dict)
     files: MutableMapping[str, AnySourceFile] = field(default_factory=dict)
     metadata: ManifestMetadata = field(default_factory=ManifestMetadata)
-    flat_graph: Dict[str, Any] = field(default_factory=dict)
+    flat_graph: Mapping[str, Any] = field(default_factory=dict)
     state_check: ManifestStateCheck = field(default_factory=ManifestStateCheck)
     source_patches: MutableMapping[SourceKey, SourcePatch] = field(default_factory=dict)
     disabled: MutableMapping[str, List[CompileResultNode]] = field(default_factory=dict)
@@ -590,6 +943,9 @@ class Manifest(MacroMethods, DataClassMessagePackMixin, dbtClassMixin):
     _analysis_lookup: Optional[AnalysisLookup] = field(
         default=None, metadata={'serialize': lambda x: None, 'deserialize': lambda x: None}
     )
+    _macro_lookup: Optional[MacroLookup] = field(
+        default=None, metadata={'serialize': lambda x: None, 'deserialize': lambda x: None}
+    )
     _parsing_info: ParsingInfo = field(
         default_factory=ParsingInfo,
         metadata={'serialize': lambda x: None, 'deserialize': lambda x: None}
@@ -598,6 +954,27 @@ class Manifest(MacroMethods, DataClassMessagePackMixin, dbtClassMixin):
         default_factory=flags.MP_CONTEXT.Lock,
         metadata={'serialize': lambda x: None, 'deserialize': lambda x: None}
     )
+    # The files that are shared with a copy of the manifest, by file_id.
+    # They're copied before they're changed, see 'deepcopy'.
+    _shared_files: Dict[str, AnySourceFile] = field(
+        default_factory=dict,
+        metadata={'serialize': lambda x: None, 'deserialize': lambda x: None}
+    )
+    # Not pickled with the other lookups because of its lock
+    _parent_child_lookup: Optional[ParentChildLookup] = field(
+        default=None, metadata={'serialize': lambda x: None, 'deserialize': lambda x: None}
+    )
+    # Counts the nodes, sources, exposures and metrics that the methods
+    # below added, replaced or removed, and the loads of the manifest, so
+    # the indexes of the node selector and the manifest writes know when
+    # they're out of date.
+    _member_changes: int = field(
+        default=0, metadata={'serialize': lambda x: None, 'deserialize': lambda x: 0}
+    )
+    # The arguments of the last write and the _member_changes at the time
+    _last_write: Optional[Tuple[Any, ...]] = field(
+        default=None, metadata={'serialize': lambda x: None, 'deserialize': lambda x: None}
+    )
 
     def __pre_serialize__(self):
         # serialization won't work with anything except an empty source_patches because
@@ -608,6 +985,8 @@ class Manifest(MacroMethods, DataClassMessagePackMixin, dbtClassMixin):
     @classmethod
     def __post_deserialize__(cls, obj):
         obj._lock = flags.MP_CONTEXT.Lock()
+        obj._shared_files = {}
+        obj._member_changes = 0
         return obj
 
     def sync_update_node(
@@ -628,44 +1007,59 @@ class Manifest(MacroMethods, DataClassMessagePackMixin, dbtClassMixin):
                 # already compiled -> must be a NonSourceCompiledNode
                 return cast(NonSourceCompiledNode, existing)
             _update_into(self.nodes, new_node)
+            self._edges_changed(new_node.unique_id)
             return new_node
 
     def update_exposure(self, new_exposure: ParsedExposure):
         _update_into(self.exposures, new_exposure)
+        self._edges_changed(new_exposure.unique_id)
 
     def update_metric(self, new_metric: ParsedMetric):
         _update_into(self.metrics, new_metric)
+        self._edges_changed(new_metric.unique_id)
 
     def update_node(self, new_node: ManifestNode):
         _update_into(self.nodes, new_node)
+        self._edges_changed(new_node.unique_id)
 
     def update_source(self, new_source: ParsedSourceDefinition):
         _update_into(self.sources, new_source)
+        self._edges_changed(new_source.unique_id)
+
+    def remove_node(self, unique_id: str) -> ManifestNode:
+        node = self.nodes.pop(unique_id)
+        self._edges_changed(unique_id)
+        return node
+
+    def remove_source(self, unique_id: str) -> ParsedSourceDefinition:
+        source = self.sources.pop(unique_id)
+        self._edges_changed(unique_id)
+        return source
+
+    def remove_exposure(self, unique_id: str) -> ParsedExposure:
+        exposure = self.exposures.pop(unique_id)
+        self._edges_changed(unique_id)
+        return exposure
+
+    def remove_metric(self, unique_id: str) -> ParsedMetric:
+        metric = self.metrics.pop(unique_id)
+        self._edges_changed(unique_id)
+        return metric
 
     def build_flat_graph(self):
         """This attribute is used in context.common by each node, so we want to
         only build it once and avoid any concurrency issues around it.
         Make sure you don't call this until you're done with building your
-        manifest!
+        manifest! The nodes are serialized when they're first read.
         """
-        self.flat_graph = {
-            'exposures': {
-                k: v.to_dict(omit_none=False)
-                for k, v in self.exposures.items()
-            },
-            'metrics': {
-                k: v.to_dict(omit_none=False)
-                for k, v in self.metrics.items()
-            },
-            'nodes': {
-                k: v.to_dict(omit_none=False)
-                for k, v in self.nodes.items()
-            },
-            'sources': {
-                k: v.to_dict(omit_none=False)
-                for k, v in self.sources.items()
-            }
-        }
+        self.flat_graph = FlatGraph(self)
+
+    def compact(self):
+        """Intern the strings that the nodes repeat and share the configs
+        that are equal, see ManifestCompactor. Call this once the manifest
+        is parsed.
+        """
+        ManifestCompactor().compact(self)
 
     def build_disabled_by_file_id(self):
         disabled_by_file_id = {}
@@ -698,14 +1092,20 @@ class Manifest(MacroMethods, DataClassMessagePackMixin, dbtClassMixin):
     def find_materialization_macro_by_name(
         self, project_name: str, materialization_name: str, adapter_type: str
     ) -> Optional[ParsedMacro]:
-        candidates: CandidateList = CandidateList(chain.from_iterable(
-            self._materialization_candidates_for(
-                project_name=project_name,
-                materialization_name=materialization_name,
-                adapter_type=atype,
-            ) for atype in (adapter_type, None)
-        ))
-        return candidates.last()
+        def resolve() -> Optional[ParsedMacro]:
+            candidates: CandidateList = CandidateList(chain.from_iterable(
+                self._materialization_candidates_for(
+                    project_name=project_name,
+                    materialization_name=materialization_name,
+                    adapter_type=atype,
+                ) for atype in (adapter_type, None)
+            ))
+            return candidates.last()
+
+        return self.macro_lookup.find_resolved(
+            ('materialization', project_name, materialization_name, adapter_type),
+            self, resolve
+        )
 
     def get_resource_fqns(self) -> Mapping[str, PathSet]:
         resource_fqns: Dict[str, Set[Tuple[str, ...]]] = {}
@@ -735,31 +1135,80 @@ class Manifest(MacroMethods, DataClassMessagePackMixin, dbtClassMixin):
             chain(self.nodes.values(), self.sources.values())
         )
 
+    def reset_for_partial_parse(self):
+        """Drop the state that's built up during and after parsing, so a
+        manifest that was kept in memory can be used for partial parsing
+        in the same way as one that was read from partial_parse.msgpack.
+        """
+        self.flat_graph = {}
+        self.source_patches = {}
+        self._doc_lookup = None
+        self._source_lookup = None
+        self._ref_lookup = None
+        self._disabled_lookup = None
+        self._analysis_lookup = None
+        self._macro_lookup = None
+        self._parsing_info = ParsingInfo()
+        for source_file in self.files.values():
+            if isinstance(source_file, SchemaSourceFile):
+                source_file.pp_dict = None
+                source_file.pp_test_index = None
+
     def deepcopy(self):
+        """Return a copy of the manifest that shares the nodes, sources,
+        macros, docs, exposures, metrics and files with this manifest,
+        so copying only copies the dicts. The nodes and other resources
+        are replaced, not changed, by the manifest's methods like
+        update_node, so the other manifest isn't affected. The add_*
+        methods copy a shared file before they change it. Code that
+        changes these objects in any other way must replace them first.
+        """
+        shared_files = dict(self.files)
+        self._shared_files.update(shared_files)
         return Manifest(
-            nodes={k: _deepcopy(v) for k, v in self.nodes.items()},
-            sources={k: _deepcopy(v) for k, v in self.sources.items()},
-            macros={k: _deepcopy(v) for k, v in self.macros.items()},
-            docs={k: _deepcopy(v) for k, v in self.docs.items()},
-            exposures={k: _deepcopy(v) for k, v in self.exposures.items()},
-            metrics={k: _deepcopy(v) for k, v in self.metrics.items()},
-            selectors={k: _deepcopy(v) for k, v in self.selectors.items()},
+            nodes=dict(self.nodes),
+            sources=dict(self.sources),
+            macros=dict(self.macros),
+            docs=dict(self.docs),
+            exposures=dict(self.exposures),
+            metrics=dict(self.metrics),
+            selectors=dict(self.selectors),
             metadata=self.metadata,
-            disabled={k: _deepcopy(v) for k, v in self.disabled.items()},
-            files={k: _deepcopy(v) for k, v in self.files.items()},
+            disabled={k: list(v) for k, v in self.disabled.items()},
+            files=dict(self.files),
             state_check=_deepcopy(self.state_check),
+            _shared_files=shared_files,
         )
 
+    def _writable_file(self, source_file: F) -> F:
+        """Return the file to change instead of 'source_file'. That's a
+        copy if the file is shared with a copy of the manifest.
+        """
+        file_id = source_file.file_id
+        if self._shared_files.get(file_id) is not source_file:
+            return source_file
+        if self.files.get(file_id) is source_file:
+            self.files[file_id] = _deepcopy(source_file)
+        return cast(F, self.files.get(file_id, source_file))
+
+    @property
+    def parent_child_lookup(self) -> ParentChildLookup:
+        if self._parent_child_lookup is None:
+            self._parent_child_lookup = ParentChildLookup(self)
+        return self._parent_child_lookup
+
+    def _edges_changed(self, unique_id: str) -> None:
+        self._member_changes += 1
+        if self._parent_child_lookup is not None:
+            self._parent_child_lookup.mark_changed(unique_id)
+
     def build_parent_and_child_maps(self):
-        edge_members = list(chain(
-            self.nodes.values(),
-            self.sources.values(),
-            self.exposures.values(),
-            self.metrics.values(),
-        ))
-        forward_edges, backward_edges = build_node_edges(edge_members)
-        self.child_map = forward_edges
-        self.parent_map = backward_edges
+        """Set child_map and parent_map. They're kept up to date by
+        ParentChildLookup, and each list is sorted when it's read.
+        """
+        self.parent_child_lookup.sync(self)
+        self.child_map: Mapping[str, List[str]] = EdgeMap(self, children=True)
+        self.parent_map: Mapping[str, List[str]] = EdgeMap(self, children=False)
 
     def build_macro_child_map(self):
         edge_members = list(chain(
@@ -781,12 +1230,28 @@ class Manifest(MacroMethods, DataClassMessagePackMixin, dbtClassMixin):
             selectors=self.selectors,
             metadata=self.metadata,
             disabled=self.disabled,
-            child_map=self.child_map,
-            parent_map=self.parent_map,
+            child_map=dict(self.child_map),
+            parent_map=dict(self.parent_map),
         )
 
-    def write(self, path):
-        self.writable_manifest().write(path)
+    def write(self, path, compression=None, artifact_format=None):
+        # The manifest is written after it's loaded, after --defer merged
+        # the other manifest into it and at the end of the run, often without
+        # a change in between. It's only serialized again if it changed or
+        # the artifact was replaced since the last write.
+        write = (path, compression, artifact_format, self._member_changes)
+        if write == self._last_write and WritableManifest.is_written(
+            path, compression, artifact_format
+        ):
+            return
+        self.writable_manifest().write(path, compression, artifact_format)
+        self._last_write = write
+
+    def mark_changed(self):
+        """Count a change that wasn't made with the methods that add,
+        replace or remove nodes, like a parse of the manifest.
+        """
+        self._member_changes += 1
 
     # Called in dbt.compilation.Linker.write_graph and
     # dbt.graph.queue.get and ._include_in_cost
@@ -944,18 +1409,22 @@ class Manifest(MacroMethods, DataClassMessagePackMixin, dbtClassMixin):
         """
         refables = set(NodeType.refable())
         merged = set()
-        for unique_id, node in other.nodes.items():
+        for unique_id in other.nodes:
             current = self.nodes.get(unique_id)
-            if current and (
+            if not current or unique_id in selected:
+                continue
+            # the nodes of a manifest that was read lazily are decoded here
+            node = other.nodes[unique_id]
+            if (
                 node.resource_type in refables and
                 not node.is_ephemeral and
-                unique_id not in selected and
                 not adapter.get_relation(
                     current.database, current.schema, current.identifier
                 )
             ):
                 merged.add(unique_id)
                 self.nodes[unique_id] = node.replace(deferred=True)
+                self._edges_changed(unique_id)
 
         # log up to 5 items
         sample = list(islice(merged, 5))
@@ -988,7 +1457,10 @@ class Manifest(MacroMethods, DataClassMessagePackMixin, dbtClassMixin):
             raise_compiler_error(msg)
 
         self.macros[macro.unique_id] = macro
+        source_file = self._writable_file(source_file)
         source_file.macros.append(macro.unique_id)
+        if self._macro_lookup is not None:
+            self._macro_lookup.add_macro(macro)
 
     def has_file(self, source_file: SourceFile) -> bool:
         key = source_file.file_id
@@ -1005,29 +1477,62 @@ class Manifest(MacroMethods, DataClassMessagePackMixin, dbtClassMixin):
         # sources can't be overwritten!
         _check_duplicates(source, self.sources)
         self.sources[source.unique_id] = source  # type: ignore
+        self._edges_changed(source.unique_id)
+        source_file = self._writable_file(source_file)
         source_file.sources.append(source.unique_id)
 
     def add_node_nofile(self, node: ManifestNodes):
         # nodes can't be overwritten!
         _check_duplicates(node, self.nodes)
         self.nodes[node.unique_id] = node
+        self._edges_changed(node.unique_id)
 
     def add_node(self, source_file: AnySourceFile, node: ManifestNodes, test_from=None):
         self.add_node_nofile(node)
+        source_file = self._writable_file(source_file)
         if isinstance(source_file, SchemaSourceFile):
             assert test_from
             source_file.add_test(node.unique_id, test_from)
         else:
             source_file.nodes.append(node.unique_id)
 
+    def add_var_to_file(self, node, var_name: str):
+        """Save the name of a var that was used while parsing the node in
+        the node's file, so partial parsing can reparse the file if the var
+        changes.
+        """
+        # hooks come from dbt_project.yml which doesn't have a real file_id
+        file_id = getattr(node, 'file_id', None)
+        if file_id not in self.files:
+            return
+        source_file = self._writable_file(self.files[file_id])
+        if isinstance(source_file, SchemaSourceFile):
+            if node.resource_type == NodeType.Test and node.file_key_name:
+                (yaml_key, name) = node.file_key_name.split('.')
+            elif node.resource_type == NodeType.Source:
+                (yaml_key, name) = ('sources', node.source_name)
+            elif node.resource_type == NodeType.Exposure:
+                (yaml_key, name) = ('exposures', node.name)
+            elif node.resource_type == NodeType.Metric:
+                (yaml_key, name) = ('metrics', node.name)
+            else:
+                return
+            source_file.add_var(var_name, yaml_key, name)
+        else:
+            source_file.add_var(var_name)
+
     def add_exposure(self, source_file: SchemaSourceFile, exposure: ParsedExposure):
         _check_duplicates(exposure, self.exposures)
         self.exposures[exposure.unique_id] = exposure
+        self._edges_changed(exposure.unique_id)
+        source_file = self._writable_file(source_file)
         source_file.exposures.append(exposure.unique_id)
 
     def add_metric(self, source_file: SchemaSourceFile, metric: ParsedMetric):
         _check_duplicates(metric, self.metrics)
         self.metrics[metric.unique_id] = metric
+        self._edges_changed(metric.unique_id)
+        source_file = self._writable_file(source_file)
         source_file.metrics.append(metric.unique_id)
 
     def add_disabled_nofile(self, node: CompileResultNode):
@@ -1039,6 +1544,7 @@ class Manifest(MacroMethods, DataClassMessagePackMixin, dbtClassMixin):
 
     def add_disabled(self, source_file: AnySourceFile, node: CompileResultNode, test_from=None):
         self.add_disabled_nofile(node)
+        source_file = self._writable_file(source_file)
         if isinstance(source_file, SchemaSourceFile):
             assert test_from
             source_file.add_test(node.unique_id, test_from)
@@ -1048,6 +1554,7 @@ class Manifest(MacroMethods, DataClassMessagePackMixin, dbtClassMixin):
     def add_doc(self, source_file: SourceFile, doc: ParsedDocumentation):
         _check_duplicates(doc, self.docs)
         self.docs[doc.unique_id] = doc
+        source_file = self._writable_file(source_file)
         source_file.docs.append(doc.unique_id)
 
     # end of methods formerly in ParseResult
@@ -1080,6 +1587,7 @@ class Manifest(MacroMethods, DataClassMessagePackMixin, dbtClassMixin):
             self._ref_lookup,
             self._disabled_lookup,
             self._analysis_lookup,
+            self._macro_lookup,
         )
         return self.__class__, args
 
@@ -1088,6 +1596,7 @@ class MacroManifest(MacroMethods):
     def __init__(self, macros):
         self.macros = macros
         self.metadata = ManifestMetadata()
+        self._macro_lookup = None
         # This is returned by the 'graph' context property
         # in the ProviderContext class.
         self.flat_graph = {}
@@ -1099,6 +1608,12 @@ AnyManifest = Union[Manifest, MacroManifest]
 @dataclass
 @schema_version('manifest', 4)
 class WritableManifest(ArtifactMixin):
+    _streamed_fields: ClassVar[Tuple[str, ...]] = (
+        'nodes', 'sources', 'macros', 'docs', 'exposures', 'metrics', 'disabled',
+        'parent_map', 'child_map',
+    )
+    _indexed: ClassVar[bool] = True
+
     nodes: Mapping[UniqueID, ManifestNode] = field(
         metadata=dict(description=(
             'The nodes defined in the dbt project and its dependencies'
@@ -382,6 +382,12 @@ class NodeAndTestConfig(BaseConfig):
         default_factory=dict,
         metadata=MergeBehavior.Update.meta(),
     )
+    # the pool limits how many of its nodes run at the same time, which
+    # doesn't change what the node builds
+    concurrency_pool: Optional[str] = field(
+        default=None,
+        metadata=CompareBehavior.Exclude.meta(),
+    )
 
 
 @dataclass
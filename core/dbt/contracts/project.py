@@ -203,6 +203,7 @@ class Project(HyphenatedDbtClassMixin, Replaceable):
     on_run_end: Optional[List[str]] = field(default_factory=list_str)
     require_dbt_version: Optional[Union[List[str], str]] = None
     dispatch: List[Dict[str, Any]] = field(default_factory=list)
+    concurrency_pools: Dict[str, int] = field(default_factory=dict)
     models: Dict[str, Any] = field(default_factory=dict)
     seeds: Dict[str, Any] = field(default_factory=dict)
     snapshots: Dict[str, Any] = field(default_factory=dict)
@@ -232,6 +233,13 @@ class Project(HyphenatedDbtClassMixin, Replaceable):
                 if ('macro_namespace' not in entry or 'search_order' not in entry or
                         not isinstance(entry['search_order'], list)):
                     raise ValidationError(f"Invalid project dispatch config: {entry}")
+        # validate concurrency pool limits
+        for pool, limit in (data.get('concurrency-pools') or {}).items():
+            if not isinstance(limit, int) or limit < 1:
+                raise ValidationError(
+                    f"Invalid limit for concurrency pool '{pool}': {limit}. "
+                    "It must be a positive integer"
+                )
 
 
 @dataclass
@@ -239,8 +247,15 @@ class UserConfig(ExtensibleDbtClassMixin, Replaceable, UserConfigContract):
     send_anonymous_usage_stats: bool = DEFAULT_SEND_ANONYMOUS_USAGE_STATS
     use_colors: Optional[bool] = None
     partial_parse: Optional[bool] = None
+    strict_partial_parse: Optional[bool] = None
+    parse_workers: Optional[int] = None
+    compile_workers: Optional[int] = None
+    artifact_compression: Optional[str] = None
+    artifact_format: Optional[str] = None
+    scheduling: Optional[str] = None
     printer_width: Optional[int] = None
     write_json: Optional[bool] = None
+    write_history: Optional[bool] = None
     warn_error: Optional[bool] = None
     log_format: Optional[str] = None
     debug: Optional[bool] = None
@@ -25,11 +25,9 @@ import agate
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import (
-    Union, Dict, List, Optional, Any, NamedTuple, Sequence,
+    Union, Dict, List, Optional, Any, NamedTuple, Sequence, ClassVar, Tuple,
 )
 
-from dbt.clients.system import write_json
-
 
 @dataclass
 class TimingInfo(dbtClassMixin):
@@ -148,6 +146,16 @@ class ExecutionResult(dbtClassMixin):
         return self.results[idx]
 
 
+@dataclass
+class ConcurrencyPoolStats(dbtClassMixin):
+    limit: int
+    # the number of the pool's nodes that ran
+    nodes: int = 0
+    # the seconds that the pool's nodes were ready to run but waited for
+    # a slot in the pool, in total
+    slot_wait_time: float = 0.0
+
+
 @dataclass
 class RunResultsMetadata(BaseArtifactMetadata):
     dbt_schema_version: str = field(
@@ -180,22 +188,34 @@ class RunExecutionResult(
     results: Sequence[RunResult]
     args: Dict[str, Any] = field(default_factory=dict)
     generated_at: datetime = field(default_factory=datetime.utcnow)
+    concurrency_pools: Dict[str, ConcurrencyPoolStats] = field(default_factory=dict)
 
-    def write(self, path: str):
+    def write(
+        self,
+        path: str,
+        compression: Optional[str] = None,
+        artifact_format: Optional[str] = None,
+    ):
         writable = RunResultsArtifact.from_execution_results(
             results=self.results,
             elapsed_time=self.elapsed_time,
             generated_at=self.generated_at,
             args=self.args,
+            concurrency_pools=self.concurrency_pools,
         )
-        writable.write(path)
+        writable.write(path, compression, artifact_format)
 
 
 @dataclass
-@schema_version('run-results', 4)
+@schema_version('run-results', 5)
 class RunResultsArtifact(ExecutionResult, ArtifactMixin):
+    _streamed_fields: ClassVar[Tuple[str, ...]] = ('results',)
+    # v5 added concurrency_pools
+    compatible_schema_versions: ClassVar[Tuple[int, ...]] = (4,)
+
     results: Sequence[RunResultOutput]
     args: Dict[str, Any] = field(default_factory=dict)
+    concurrency_pools: Dict[str, ConcurrencyPoolStats] = field(default_factory=dict)
 
     @classmethod
     def from_execution_results(
@@ -204,6 +224,7 @@ class RunResultsArtifact(ExecutionResult, ArtifactMixin):
         elapsed_time: float,
         generated_at: datetime,
         args: Dict,
+        concurrency_pools: Optional[Dict[str, ConcurrencyPoolStats]] = None,
     ):
         processed_results = [process_run_result(result) for result in results]
         meta = RunResultsMetadata(
@@ -214,12 +235,10 @@ class RunResultsArtifact(ExecutionResult, ArtifactMixin):
             metadata=meta,
             results=processed_results,
             elapsed_time=elapsed_time,
-            args=args
+            args=args,
+            concurrency_pools=concurrency_pools or {},
         )
 
-    def write(self, path: str):
-        write_json(path, self.to_dict(omit_none=False))
-
 
 @dataclass
 class RunOperationResult(ExecutionResult):
@@ -2,6 +2,7 @@ from pathlib import Path
 from .graph.manifest import WritableManifest
 from .results import RunResultsArtifact
 from typing import Optional
+from dbt.clients.system import find_artifact
 from dbt.exceptions import IncompatibleSchemaException
 
 
@@ -9,22 +10,34 @@ class PreviousState:
     def __init__(self, path: Path):
         self.path: Path = path
         self.manifest: Optional[WritableManifest] = None
-        self.results: Optional[RunResultsArtifact] = None
+        self._results: Optional[RunResultsArtifact] = None
+        self._results_read = False
 
-        manifest_path = self.path / 'manifest.json'
-        if manifest_path.exists() and manifest_path.is_file():
+        # the artifacts can be compressed, like manifest.json.gz
+        manifest_path = find_artifact(str(self.path / 'manifest.json'))
+        if manifest_path is not None:
             try:
-                # we want to bail with an error if schema versions don't match
-                self.manifest = WritableManifest.read_and_check_versions(str(manifest_path))
+                # we want to bail with an error if schema versions don't match.
+                # The nodes are only decoded when the state selectors or
+                # --defer read them.
+                self.manifest = WritableManifest.read_lazily(manifest_path)
             except IncompatibleSchemaException as exc:
-                exc.add_filename(str(manifest_path))
+                exc.add_filename(manifest_path)
                 raise
 
-        results_path = self.path / 'run_results.json'
-        if results_path.exists() and results_path.is_file():
+    @property
+    def results(self) -> Optional[RunResultsArtifact]:
+        # only the result selectors use the run results, so they're read
+        # the first time they're needed
+        if self._results_read:
+            return self._results
+        results_path = find_artifact(str(self.path / 'run_results.json'))
+        if results_path is not None:
             try:
                 # we want to bail with an error if schema versions don't match
-                self.results = RunResultsArtifact.read_and_check_versions(str(results_path))
+                self._results = RunResultsArtifact.read_and_check_versions(results_path)
             except IncompatibleSchemaException as exc:
-                exc.add_filename(str(results_path))
+                exc.add_filename(results_path)
                 raise
+        self._results_read = True
+        return self._results
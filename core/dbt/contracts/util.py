@@ -1,11 +1,26 @@
+import copy
 import dataclasses
+import functools
+import json
+import mmap
 import os
+import re
+import struct
 from datetime import datetime
+from json.decoder import scanstring  # type: ignore
 from typing import (
-    List, Tuple, ClassVar, Type, TypeVar, Dict, Any, Optional
+    List, Tuple, ClassVar, Type, TypeVar, Dict, Any, Optional, Iterator, Mapping, Union,
+    Callable, Container, get_type_hints
 )
 
-from dbt.clients.system import write_json, read_json
+import msgpack  # type: ignore
+
+import dbt.utils
+from dbt.clients.system import (
+    MSGPACK_SUFFIX, artifact_index_path, get_stat_key, load_artifact_contents,
+    is_written_artifact, msgpack_artifact_path, read_json, remove_artifact,
+    write_artifact
+)
 from dbt.exceptions import (
     InternalException,
     RuntimeException,
@@ -17,6 +32,24 @@ from dbt.dataclass_schema import dbtClassMixin
 
 SourceKey = Tuple[str, str]
 
+ARTIFACT_FORMATS = ('json', 'msgpack', 'both')
+
+# The layout of the msgpack artifacts, like manifest.msgpack, is:
+#
+#   magic | format version (1 byte) | header length (4 bytes) | header
+#   fields | index | index length (4 bytes)
+#
+# The header is a small msgpack dictionary with the dbt_schema_version of
+# the artifact and the dbt version that wrote it, so the schema version is
+# checked without decoding anything else. Each field of the artifact is
+# packed on its own, and the index at the end has the offsets of the
+# fields and of the items of the streamed mappings, so read_lazily decodes
+# only the items that are read.
+ARTIFACT_MSGPACK_MAGIC = b'DBTAF'
+ARTIFACT_MSGPACK_FORMAT_VERSION = 1
+_FORMAT_VERSION = struct.Struct('<B')
+_LENGTH = struct.Struct('<I')
+
 
 def list_str() -> List[str]:
     """Mypy gets upset about stuff like:
@@ -55,11 +88,376 @@ class Mergeable(Replaceable):
         return self.replace(**replacements)
 
 
+def _to_json_value(value: Any) -> Any:
+    if isinstance(value, dbtClassMixin):
+        return value.to_dict(omit_none=False)
+    if isinstance(value, (list, tuple)):
+        return [_to_json_value(item) for item in value]
+    return value
+
+
 class Writable:
-    def write(self, path: str):
-        write_json(
-            path, self.to_dict(omit_none=False)  # type: ignore
-        )
+    # The mapping and list fields that are serialized one item at a time
+    # while writing, so the whole artifact is never in memory as a dict
+    _streamed_fields: ClassVar[Tuple[str, ...]] = ()
+    # Whether an index of where the items of the streamed mappings are in
+    # the artifact is written next to it, for read_lazily
+    _indexed: ClassVar[bool] = False
+
+    def _split_streamed_fields(self) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        # serialize everything but the streamed fields in one go
+        shell = copy.copy(self)
+        streamed = {}
+        for name in self._streamed_fields:
+            value = getattr(self, name)
+            if value is not None:
+                streamed[name] = value
+                setattr(shell, name, {} if isinstance(value, Mapping) else [])
+        return shell.to_dict(omit_none=False), streamed  # type: ignore
+
+    def iter_json(self, index: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """Yield the json of this object in chunks. Joined, they are the
+        same as json.dumps(self.to_dict(omit_none=False)). Once all chunks
+        were yielded, 'index' is filled in with the offsets of the fields
+        and of the items of the streamed mappings.
+        """
+        # The encoder escapes everything that isn't ASCII, so the offsets
+        # of the characters are also the offsets of the bytes
+        encoder = dbt.utils.JSONEncoder()
+        data, streamed = self._split_streamed_fields()
+
+        fields: Dict[str, List[int]] = {}
+        sections: Dict[str, Dict[str, List[int]]] = {}
+        check = None
+        position = 1
+        yield '{'
+        for field_index, (key, value) in enumerate(data.items()):
+            chunk = '{}{}: '.format(', ' if field_index else '', encoder.encode(key))
+            position += len(chunk)
+            yield chunk
+            start = position
+            if key not in streamed:
+                chunk = encoder.encode(value)
+                position += len(chunk)
+                if key == 'metadata':
+                    # to check that the index matches the artifact
+                    check = chunk
+                yield chunk
+            elif isinstance(streamed[key], Mapping):
+                offsets = sections[key] = {}
+                position += 1
+                yield '{'
+                for item_index, (item_key, item) in enumerate(streamed[key].items()):
+                    prefix = '{}{}: '.format(', ' if item_index else '', encoder.encode(item_key))
+                    chunk = encoder.encode(_to_json_value(item))
+                    position += len(prefix)
+                    offsets[item_key] = [position, position + len(chunk)]
+                    position += len(chunk)
+                    yield prefix + chunk
+                position += 1
+                yield '}'
+            else:
+                position += 1
+                yield '['
+                for item_index, item in enumerate(streamed[key]):
+                    chunk = '{}{}'.format(
+                        ', ' if item_index else '', encoder.encode(_to_json_value(item))
+                    )
+                    position += len(chunk)
+                    yield chunk
+                position += 1
+                yield ']'
+            fields[key] = [start, position]
+        yield '}'
+
+        if index is not None:
+            index.update(size=position + 1, fields=fields, sections=sections, check=check)
+
+    def iter_msgpack(self) -> Iterator[bytes]:
+        """Yield the binary artifact of this object in chunks, see
+        read_msgpack_artifact for its layout. The streamed fields are packed
+        one item at a time.
+        """
+        encoder = dbt.utils.JSONEncoder()
+        # anything that isn't a msgpack type is converted like it is for json
+        packer = msgpack.Packer(use_bin_type=True, default=encoder.default)
+        data, streamed = self._split_streamed_fields()
+        header = packer.pack({
+            'dbt_schema_version': str(getattr(self, 'dbt_schema_version', None)),
+            'dbt_version': __version__,
+        })
+        chunk = b''.join([
+            ARTIFACT_MSGPACK_MAGIC,
+            _FORMAT_VERSION.pack(ARTIFACT_MSGPACK_FORMAT_VERSION),
+            _LENGTH.pack(len(header)),
+            header,
+        ])
+        position = len(chunk)
+        yield chunk
+
+        fields: Dict[str, List[int]] = {}
+        sections: Dict[str, Dict[str, List[int]]] = {}
+        for key, value in data.items():
+            start = position
+            if key not in streamed:
+                chunk = packer.pack(value)
+                position += len(chunk)
+                yield chunk
+            elif isinstance(streamed[key], Mapping):
+                offsets = sections[key] = {}
+                chunk = packer.pack_map_header(len(streamed[key]))
+                position += len(chunk)
+                yield chunk
+                for item_key, item in streamed[key].items():
+                    chunk = packer.pack(item_key)
+                    position += len(chunk)
+                    item_chunk = packer.pack(_to_json_value(item))
+                    offsets[item_key] = [position, position + len(item_chunk)]
+                    position += len(item_chunk)
+                    yield chunk + item_chunk
+            else:
+                chunk = packer.pack_array_header(len(streamed[key]))
+                position += len(chunk)
+                yield chunk
+                for item in streamed[key]:
+                    chunk = packer.pack(_to_json_value(item))
+                    position += len(chunk)
+                    yield chunk
+            fields[key] = [start, position]
+
+        index = packer.pack({'fields': fields, 'sections': sections})
+        yield index + _LENGTH.pack(len(index))
+
+    def write(
+        self,
+        path: str,
+        compression: Optional[str] = None,
+        artifact_format: Optional[str] = None,
+    ):
+        """Write the artifact as json to 'path', and for the 'msgpack' or
+        'both' formats as msgpack to the same path with a .msgpack suffix
+        instead of .json. An artifact of the format that isn't written is
+        removed, so it can't be read as the current one.
+        """
+        artifact_format = artifact_format or 'json'
+        if artifact_format not in ARTIFACT_FORMATS:
+            raise RuntimeException(
+                f'Invalid artifact format "{artifact_format}", expected one of: '
+                f'{", ".join(ARTIFACT_FORMATS)}'
+            )
+        if artifact_format in ('json', 'both'):
+            index: Optional[Dict[str, Any]] = {} if self._indexed else None
+            write_artifact(path, self.iter_json(index), compression)
+            if index is not None:
+                write_artifact(artifact_index_path(path), [json.dumps(index)])
+        else:
+            remove_artifact(path)
+        if artifact_format in ('msgpack', 'both'):
+            write_artifact(msgpack_artifact_path(path), self.iter_msgpack())
+        else:
+            remove_artifact(msgpack_artifact_path(path))
+
+    @classmethod
+    def is_written(
+        cls,
+        path: str,
+        compression: Optional[str] = None,
+        artifact_format: Optional[str] = None,
+    ) -> bool:
+        """Return True if this process wrote the artifacts that write writes
+        for these arguments, and they weren't changed since.
+        """
+        artifact_format = artifact_format or 'json'
+        if artifact_format in ('json', 'both'):
+            if not is_written_artifact(path, compression):
+                return False
+            if cls._indexed and not is_written_artifact(artifact_index_path(path)):
+                return False
+        if artifact_format in ('msgpack', 'both'):
+            return is_written_artifact(msgpack_artifact_path(path))
+        return True
+
+
+class LazyArtifactMapping(Mapping[str, Any]):
+    """A mapping field of an artifact that was read with read_lazily. The
+    keys come from the artifact's index, and an item is decoded the first
+    time it's read.
+    """
+    def __init__(
+        self,
+        contents: Union[bytes, mmap.mmap],
+        offsets: Dict[str, List[int]],
+        decode: Callable[[Any], Any],
+        loads: Callable[[bytes], Any] = json.loads,
+    ) -> None:
+        self._contents = contents
+        self._offsets = offsets
+        self._decode = decode
+        self._loads = loads
+        self._items: Dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._items:
+            start, end = self._offsets[key]
+            self._items[key] = self._decode(self._loads(self._contents[start:end]))
+        return self._items[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._offsets
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._offsets)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_item_decoder(cls: Type, name: str) -> Callable[[Any], Any]:
+    # decode the items of the mapping field 'name' like from_dict decodes
+    # them as part of the whole object, which matters for the unions of
+    # node types
+    field_type = get_type_hints(cls)[name]
+    if getattr(field_type, '__origin__', None) is Union:
+        # Optional[Mapping[K, V]]
+        field_type = next(arg for arg in field_type.__args__ if arg is not type(None))
+    item_class = dataclasses.make_dataclass(
+        f'{cls.__name__}Item', [('item', field_type.__args__[1])], bases=(dbtClassMixin,)
+    )
+    return lambda data: item_class.from_dict({'item': data}).item  # type: ignore
+
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+def _scan_object(
+    text: str, position: int, nested: Container[str] = ()
+) -> Tuple[Dict[str, Any], int]:
+    # Find the offsets of the values of the json object that starts at
+    # 'position', and of the items of the values whose keys are in 'nested'
+    # if they are objects too. Return them and the offset after the object.
+    decoder = json.JSONDecoder()
+    offsets: Dict[str, Any] = {}
+    position = _WHITESPACE.match(text, position + 1).end()  # type: ignore
+    if text[position] == '}':
+        return offsets, position + 1
+    while True:
+        if text[position] != '"':
+            raise ValueError(f'Expected a key at offset {position}')
+        key, position = scanstring(text, position + 1)
+        position = _WHITESPACE.match(text, position).end()  # type: ignore
+        if text[position] != ':':
+            raise ValueError(f'Expected ":" at offset {position}')
+        start = _WHITESPACE.match(text, position + 1).end()  # type: ignore
+        if key in nested and text[start] == '{':
+            items, end = _scan_object(text, start)
+            offsets[key] = (start, end, items)
+        else:
+            _, end = decoder.raw_decode(text, start)
+            offsets[key] = (start, end, None)
+        position = _WHITESPACE.match(text, end).end()  # type: ignore
+        if text[position] == '}':
+            return offsets, position + 1
+        if text[position] != ',':
+            raise ValueError(f'Expected "," or "}}" at offset {position}')
+        position = _WHITESPACE.match(text, position + 1).end()  # type: ignore
+
+
+def build_artifact_index(
+    contents: Union[bytes, mmap.mmap], sections: Container[str]
+) -> Dict[str, Any]:
+    """Build the index that Writable.write writes next to an artifact, for
+    an artifact that was written without one. This reads the whole
+    artifact, but doesn't keep the values it parses.
+    """
+    # Decoded as latin-1 every byte is one character, so the offsets in
+    # the text are the offsets in 'contents'. The json syntax is ASCII,
+    # and the other bytes are only ever inside strings.
+    text = contents[:].decode('latin-1')
+    start = _WHITESPACE.match(text).end()  # type: ignore
+    if not text.startswith('{', start):
+        raise ValueError('The artifact is not a json object')
+    offsets, _ = _scan_object(text, start, sections)
+    index: Dict[str, Any] = {'size': len(contents), 'fields': {}, 'sections': {}}
+    for key, (start, end, items) in offsets.items():
+        index['fields'][key] = [start, end]
+        if items is not None:
+            index['sections'][key] = {
+                item_key: [item_start, item_end]
+                for item_key, (item_start, item_end, _) in items.items()
+            }
+    return index
+
+
+def _index_matches(index: Dict[str, Any], contents: Union[bytes, mmap.mmap]) -> bool:
+    if not isinstance(index, dict) or index.get('size') != len(contents):
+        return False
+    if 'metadata' not in index.get('fields', {}) or not index.get('check'):
+        return False
+    # The metadata has the time the artifact was generated at
+    start, end = index['fields']['metadata']
+    return contents[start:end] == index['check'].encode('utf-8')
+
+
+def _unpack(data: bytes) -> Any:
+    return msgpack.unpackb(data, raw=False)
+
+
+def read_msgpack_index(
+    contents: Union[bytes, mmap.mmap]
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Return the header and the index of the msgpack artifact in
+    'contents'.
+    """
+    magic_length = len(ARTIFACT_MSGPACK_MAGIC)
+    if contents[:magic_length] != ARTIFACT_MSGPACK_MAGIC:
+        raise ValueError('Not a dbt msgpack artifact')
+    try:
+        version, = _FORMAT_VERSION.unpack_from(contents, magic_length)
+        header_length, = _LENGTH.unpack_from(contents, magic_length + _FORMAT_VERSION.size)
+        index_length, = _LENGTH.unpack_from(contents, len(contents) - _LENGTH.size)
+    except struct.error as exc:
+        raise ValueError(f'Truncated msgpack artifact: {exc}') from exc
+    if version != ARTIFACT_MSGPACK_FORMAT_VERSION:
+        raise ValueError(f'Unsupported msgpack artifact format version {version}')
+    header_start = magic_length + _FORMAT_VERSION.size + _LENGTH.size
+    header = _unpack(contents[header_start:header_start + header_length])
+    index_end = len(contents) - _LENGTH.size
+    index = _unpack(contents[index_end - index_length:index_end])
+    return header, index
+
+
+# The indexes of the artifacts that were read with read_lazily, by path,
+# with the modification time and size of the artifact when it was indexed
+_artifact_indexes: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+
+
+def get_artifact_index(
+    path: str, contents: Union[bytes, mmap.mmap], sections: Container[str]
+) -> Dict[str, Any]:
+    """Return the index of the artifact at 'path'. It's read from the index
+    file written with the artifact, or built if there is none or it
+    doesn't match the artifact, and cached until the artifact changes.
+    """
+    stat_key = get_stat_key(path)
+    cached = _artifact_indexes.get(path)
+    if cached is not None and cached[0] == stat_key:
+        return cached[1]
+
+    index = None
+    index_path = artifact_index_path(path)
+    if os.path.isfile(index_path):
+        try:
+            index = read_json(index_path)
+        except (EnvironmentError, ValueError):
+            index = None
+        if index is not None and not _index_matches(index, contents):
+            index = None
+    if index is None:
+        index = build_artifact_index(contents, sections)
+    if stat_key is not None:
+        _artifact_indexes[path] = (stat_key, index)
+    return index
 
 
 class AdditionalPropertiesMixin:
@@ -205,6 +603,9 @@ def schema_version(name: str, version: int):
 @dataclasses.dataclass
 class VersionedSchema(dbtClassMixin):
     dbt_schema_version: ClassVar[SchemaVersion]
+    # The earlier versions of the schema that can be read as this version,
+    # because the later versions only added fields that have defaults
+    compatible_schema_versions: ClassVar[Tuple[int, ...]] = ()
 
     @classmethod
     def json_schema(cls, embeddable: bool = False) -> Dict[str, Any]:
@@ -215,6 +616,8 @@ class VersionedSchema(dbtClassMixin):
 
     @classmethod
     def read_and_check_versions(cls, path: str):
+        if path.endswith(MSGPACK_SUFFIX):
+            return cls.read_msgpack_and_check_versions(path)
         try:
             data = read_json(path)
         except (EnvironmentError, ValueError) as exc:
@@ -222,6 +625,30 @@ class VersionedSchema(dbtClassMixin):
                 f'Could not read {cls.__name__} at "{path}" as JSON: {exc}'
             ) from exc
 
+        cls.check_version(data)
+        return cls.from_dict(data)  # type: ignore
+
+    @classmethod
+    def read_msgpack_and_check_versions(cls, path: str):
+        try:
+            contents = load_artifact_contents(path)
+            header, index = read_msgpack_index(contents)
+            # check the version before decoding the rest
+            cls.check_version({'metadata': header})
+            data = {
+                key: _unpack(contents[start:end])
+                for key, (start, end) in index['fields'].items()
+            }
+        except (EnvironmentError, ValueError) as exc:
+            raise RuntimeException(
+                f'Could not read {cls.__name__} at "{path}" as msgpack: {exc}'
+            ) from exc
+
+        cls.check_version(data)
+        return cls.from_dict(data)  # type: ignore
+
+    @classmethod
+    def check_version(cls, data: Dict[str, Any]) -> None:
         # Check metadata version. There is a class variable 'dbt_schema_version', but
         # that doesn't show up in artifacts, where it only exists in the 'metadata'
         # dictionary.
@@ -229,14 +656,16 @@ class VersionedSchema(dbtClassMixin):
             if 'metadata' in data and 'dbt_schema_version' in data['metadata']:
                 previous_schema_version = data['metadata']['dbt_schema_version']
                 # cls.dbt_schema_version is a SchemaVersion object
-                if str(cls.dbt_schema_version) != previous_schema_version:
+                compatible = {str(cls.dbt_schema_version)} | {
+                    str(SchemaVersion(name=cls.dbt_schema_version.name, version=version))
+                    for version in cls.compatible_schema_versions
+                }
+                if previous_schema_version not in compatible:
                     raise IncompatibleSchemaException(
                         expected=str(cls.dbt_schema_version),
                         found=previous_schema_version
                     )
 
-        return cls.from_dict(data)  # type: ignore
-
 
 T = TypeVar('T', bound='ArtifactMixin')
 
@@ -250,6 +679,45 @@ T = TypeVar('T', bound='ArtifactMixin')
 class ArtifactMixin(VersionedSchema, Writable, Readable):
     metadata: BaseArtifactMetadata
 
+    @classmethod
+    def read_lazily(cls, path: str):
+        """Like read_and_check_versions, but the items of the streamed
+        mappings, like the nodes of the manifest, are only decoded when
+        they're read. Where they are in the artifact comes from the index
+        written with it, so only the other fields are parsed up front.
+        """
+        is_msgpack = path.endswith(MSGPACK_SUFFIX)
+        loads: Callable[[Any], Any] = json.loads
+        if is_msgpack:
+            loads = _unpack
+        try:
+            contents = load_artifact_contents(path)
+            if is_msgpack:
+                header, index = read_msgpack_index(contents)
+                cls.check_version({'metadata': header})
+            else:
+                index = get_artifact_index(path, contents, cls._streamed_fields)
+            data = {
+                key: loads(contents[start:end])
+                for key, (start, end) in index['fields'].items()
+                if key not in index['sections']
+            }
+        except (EnvironmentError, ValueError, IndexError) as exc:
+            file_format = 'msgpack' if is_msgpack else 'JSON'
+            raise RuntimeException(
+                f'Could not read {cls.__name__} at "{path}" as {file_format}: {exc}'
+            ) from exc
+
+        cls.check_version(data)
+        for name in index['sections']:
+            data[name] = {}
+        obj = cls.from_dict(data)  # type: ignore
+        for name, offsets in index['sections'].items():
+            setattr(obj, name, LazyArtifactMapping(
+                contents, offsets, _get_item_decoder(cls, name), loads
+            ))
+        return obj
+
     @classmethod
     def validate(cls, data):
         super().validate(data)
@@ -93,10 +93,12 @@ def setup_event_logger(log_path, level_override=None):
     stdout_handler = logging.StreamHandler(sys.stdout)
     stdout_handler.setFormatter(stdout_passthrough_formatter)
     stdout_handler.setLevel(level)
-    # clear existing stdout TextIOWrapper stream handlers
+    # clear existing stdout TextIOWrapper stream handlers, which colorama
+    # might have wrapped
+    stdout_stream_types = (TextIOWrapper, colorama.ansitowin32.StreamWrapper)
     this.STDOUT_LOG.handlers = [
         h for h in this.STDOUT_LOG.handlers
-        if not (hasattr(h, 'stream') and isinstance(h.stream, TextIOWrapper))  # type: ignore
+        if not (hasattr(h, 'stream') and isinstance(h.stream, stdout_stream_types))  # type: ignore
     ]
     this.STDOUT_LOG.addHandler(stdout_handler)
 
@@ -1129,6 +1129,45 @@ class InvalidRefInTestNode(DebugLevel):
         return self.msg
 
 
+@dataclass
+class WatchingForChanges(InfoLevel):
+    watcher: str
+    path_count: int
+    code: str = "I052"
+
+    def message(self) -> str:
+        return (
+            f"Watching {self.path_count} directories for changes ({self.watcher}). "
+            "Press Ctrl-C to stop."
+        )
+
+
+@dataclass
+class WatchDetectedChanges(InfoLevel):
+    path_count: int
+    code: str = "I053"
+
+    def message(self) -> str:
+        return f"Detected changes to {pluralize(self.path_count, 'file')}, parsing."
+
+
+@dataclass
+class WatchReloadingConfig(InfoLevel):
+    code: str = "I054"
+
+    def message(self) -> str:
+        return "The project or profile configuration changed, reloading it."
+
+
+@dataclass
+class WatchParseError(ErrorLevel):
+    exc: str
+    code: str = "I055"
+
+    def message(self) -> str:
+        return f"Encountered an error while parsing, waiting for changes:\n{self.exc}"
+
+
 @dataclass
 class RunningOperationCaughtError(ErrorLevel):
     exc: Exception
@@ -1518,6 +1557,33 @@ class ServingDocsExitInfo(InfoLevel):
         return "Press Ctrl+C to exit."
 
 
+@dataclass
+class ServerListening(InfoLevel):
+    socket_path: str
+    code: str = "Z049"
+
+    def message(self) -> str:
+        return f"Listening for requests on {self.socket_path}. Press Ctrl+C to exit."
+
+
+@dataclass
+class ServerHandlingRequest(InfoLevel):
+    args: str
+    code: str = "Z050"
+
+    def message(self) -> str:
+        return f"Handling request: dbt {self.args}"
+
+
+@dataclass
+class ServerRequestFailed(ErrorLevel):
+    exc: str
+    code: str = "Z051"
+
+    def message(self) -> str:
+        return f"Could not handle request:\n{self.exc}"
+
+
 @dataclass
 class SeedHeader(InfoLevel):
     header: str
@@ -2035,6 +2101,43 @@ class DefaultSelector(InfoLevel):
         return f"Using default selector {self.name}"
 
 
+@dataclass
+class ExecutionTimesNotRead(DebugLevel):
+    path: str
+    exc: str
+    code: str = "Q036"
+
+    def message(self) -> str:
+        return (
+            f"Could not read the execution times in {self.path}, scheduling by depth: "
+            f"{self.exc}"
+        )
+
+
+@dataclass
+class ExecutionHistoryNotWritten(DebugLevel):
+    path: str
+    exc: str
+    code: str = "Q037"
+
+    def message(self) -> str:
+        return f"Could not write the execution history to {self.path}: {self.exc}"
+
+
+@dataclass
+class CompilePoolStarted(DebugLevel):
+    workers: int
+    nodes: int
+    introspective: int
+    code: str = "Q038"
+
+    def message(self) -> str:
+        return (
+            f"Compiling {self.nodes} nodes in {self.workers} worker processes, and "
+            f"{self.introspective} nodes that query the database in the threads that run them"
+        )
+
+
 @dataclass
 class NodeStart(DebugLevel, NodeInfo):
     unique_id: str
@@ -2368,6 +2471,10 @@ if 1 == 0:
     ManifestChecked()
     ManifestFlatGraphBuilt()
     ReportPerformancePath(path="")
+    WatchingForChanges(watcher='', path_count=0)
+    WatchDetectedChanges(path_count=0)
+    WatchReloadingConfig()
+    WatchParseError(exc='')
     GitSparseCheckoutSubdirectory(subdir="")
     GitProgressCheckoutRevision(revision="")
     GitProgressUpdatingExistingDependency(dir="")
@@ -2517,6 +2624,9 @@ if 1 == 0:
     ServingDocsPort(address='', port=0)
     ServingDocsAccessInfo(port='')
     ServingDocsExitInfo()
+    ServerListening(socket_path='')
+    ServerHandlingRequest(args='')
+    ServerRequestFailed(exc='')
     SeedHeader(header='')
     SeedHeaderSeparator(len_header=0)
     RunResultWarning(resource_type='', node_name='', path='')
@@ -2669,6 +2779,9 @@ if 1 == 0:
     )
     PrintCancelLine(conn_name='')
     DefaultSelector(name='')
+    ExecutionTimesNotRead(path='', exc='')
+    ExecutionHistoryNotWritten(path='', exc='')
+    CompilePoolStarted(workers=0, nodes=0, introspective=0)
     NodeStart(node_info={}, unique_id='')
     NodeFinished(node_info={}, unique_id='', run_result={})
     QueryCancelationUnsupported(type='')
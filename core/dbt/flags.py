@@ -23,7 +23,14 @@ USE_EXPERIMENTAL_PARSER = None
 STATIC_PARSER = None
 WARN_ERROR = None
 WRITE_JSON = None
+WRITE_HISTORY = None
 PARTIAL_PARSE = None
+STRICT_PARTIAL_PARSE = None
+PARSE_WORKERS = None
+COMPILE_WORKERS = None
+ARTIFACT_COMPRESSION = None
+ARTIFACT_FORMAT = None
+SCHEDULING = None
 USE_COLORS = None
 DEBUG = None
 LOG_FORMAT = None
@@ -44,7 +51,14 @@ flag_defaults = {
     "STATIC_PARSER": True,
     "WARN_ERROR": False,
     "WRITE_JSON": True,
+    "WRITE_HISTORY": True,
     "PARTIAL_PARSE": True,
+    "STRICT_PARTIAL_PARSE": False,
+    "PARSE_WORKERS": 1,
+    "COMPILE_WORKERS": 1,
+    "ARTIFACT_COMPRESSION": 'none',
+    "ARTIFACT_FORMAT": 'json',
+    "SCHEDULING": 'depth',
     "USE_COLORS": True,
     "PROFILES_DIR": DEFAULT_PROFILES_DIR,
     "DEBUG": False,
@@ -103,7 +117,8 @@ def set_from_args(args, user_config):
         USE_EXPERIMENTAL_PARSER, STATIC_PARSER, WRITE_JSON, PARTIAL_PARSE, \
         USE_COLORS, STORE_FAILURES, PROFILES_DIR, DEBUG, LOG_FORMAT, INDIRECT_SELECTION, \
         VERSION_CHECK, FAIL_FAST, SEND_ANONYMOUS_USAGE_STATS, PRINTER_WIDTH, \
-        WHICH, LOG_CACHE_EVENTS, EVENT_BUFFER_SIZE
+        WHICH, LOG_CACHE_EVENTS, EVENT_BUFFER_SIZE, STRICT_PARTIAL_PARSE, PARSE_WORKERS, \
+        ARTIFACT_COMPRESSION, ARTIFACT_FORMAT, SCHEDULING, COMPILE_WORKERS, WRITE_HISTORY
 
     STRICT_MODE = False  # backwards compatibility
     # cli args without user_config or env var option
@@ -116,7 +131,14 @@ def set_from_args(args, user_config):
     STATIC_PARSER = get_flag_value('STATIC_PARSER', args, user_config)
     WARN_ERROR = get_flag_value('WARN_ERROR', args, user_config)
     WRITE_JSON = get_flag_value('WRITE_JSON', args, user_config)
+    WRITE_HISTORY = get_flag_value('WRITE_HISTORY', args, user_config)
     PARTIAL_PARSE = get_flag_value('PARTIAL_PARSE', args, user_config)
+    STRICT_PARTIAL_PARSE = get_flag_value('STRICT_PARTIAL_PARSE', args, user_config)
+    PARSE_WORKERS = get_flag_value('PARSE_WORKERS', args, user_config)
+    COMPILE_WORKERS = get_flag_value('COMPILE_WORKERS', args, user_config)
+    ARTIFACT_COMPRESSION = get_flag_value('ARTIFACT_COMPRESSION', args, user_config)
+    ARTIFACT_FORMAT = get_flag_value('ARTIFACT_FORMAT', args, user_config)
+    SCHEDULING = get_flag_value('SCHEDULING', args, user_config)
     USE_COLORS = get_flag_value('USE_COLORS', args, user_config)
     PROFILES_DIR = get_flag_value('PROFILES_DIR', args, user_config)
     DEBUG = get_flag_value('DEBUG', args, user_config)
@@ -145,7 +167,12 @@ def get_flag_value(flag, args, user_config):
                 'PRINTER_WIDTH',
                 'PROFILES_DIR',
                 'INDIRECT_SELECTION',
-                'EVENT_BUFFER_SIZE'
+                'EVENT_BUFFER_SIZE',
+                'PARSE_WORKERS',
+                'COMPILE_WORKERS',
+                'ARTIFACT_COMPRESSION',
+                'ARTIFACT_FORMAT',
+                'SCHEDULING',
             ]:
                 flag_value = env_value
             else:
@@ -154,7 +181,9 @@ def get_flag_value(flag, args, user_config):
             flag_value = getattr(user_config, lc_flag)
         else:
             flag_value = flag_defaults[flag]
-    if flag in ['PRINTER_WIDTH', 'EVENT_BUFFER_SIZE']:  # must be ints
+    if flag in [  # must be ints
+        'PRINTER_WIDTH', 'EVENT_BUFFER_SIZE', 'PARSE_WORKERS', 'COMPILE_WORKERS'
+    ]:
         flag_value = int(flag_value)
     if flag == 'PROFILES_DIR':
         flag_value = os.path.abspath(flag_value)
@@ -168,7 +197,14 @@ def get_flag_dict():
         "static_parser": STATIC_PARSER,
         "warn_error": WARN_ERROR,
         "write_json": WRITE_JSON,
+        "write_history": WRITE_HISTORY,
         "partial_parse": PARTIAL_PARSE,
+        "strict_partial_parse": STRICT_PARTIAL_PARSE,
+        "parse_workers": PARSE_WORKERS,
+        "compile_workers": COMPILE_WORKERS,
+        "artifact_compression": ARTIFACT_COMPRESSION,
+        "artifact_format": ARTIFACT_FORMAT,
+        "scheduling": SCHEDULING,
         "use_colors": USE_COLORS,
         "profiles_dir": PROFILES_DIR,
         "debug": DEBUG,
@@ -14,4 +14,4 @@ from .cli import (  # noqa: F401
     parse_from_selectors_definition,
 )
 from .queue import GraphQueue  # noqa: F401
-from .graph import Graph, UniqueId  # noqa: F401
+from .graph import Graph, ReachabilityIndex, UniqueId  # noqa: F401
@@ -1,5 +1,5 @@
 from typing import (
-    Set, Iterable, Iterator, Optional, NewType
+    Dict, Set, Iterable, Iterator, List, Optional, NewType
 )
 from itertools import product
 import networkx as nx  # type: ignore
@@ -9,12 +9,128 @@ from dbt.exceptions import InternalException
 UniqueId = NewType('UniqueId', str)
 
 
+# maps the bytes that have bits set to 1
+_NONZERO_BYTES = bytes([0] + [1] * 255)
+
+
+def _iter_bits(mask: int, nodes: List[UniqueId]) -> Iterator[UniqueId]:
+    # the nodes whose bits are set in 'mask', the lowest bit first
+    data = mask.to_bytes((mask.bit_length() + 7) // 8, 'little')
+    nonzero = data.translate(_NONZERO_BYTES)
+    index = nonzero.find(1)
+    while index != -1:
+        byte = data[index]
+        while byte:
+            low = byte & -byte
+            yield nodes[index * 8 + low.bit_length() - 1]
+            byte ^= low
+        index = nonzero.find(1, index + 1)
+
+
+class ReachabilityIndex:
+    """The ancestors and descendants of the nodes of a DAG, as bitsets: ints
+    with the bit of each node in the set, numbered by the node's position in
+    the graph. The bitsets of a node are computed from the bitsets of its
+    parents or children the first time they're needed, and kept, so each
+    node's are computed once however many queries need them.
+
+    A query that finds a cycle raises NetworkXUnfeasible. The index is for
+    the graph as it was when the index was created.
+    """
+    def __init__(self, graph: nx.DiGraph) -> None:
+        self.order: List[UniqueId] = list(graph)
+        self.position: Dict[UniqueId, int] = {
+            node: index for index, node in enumerate(self.order)
+        }
+        self._predecessors = graph.pred
+        self._successors = graph.succ
+        self._ancestors: Dict[UniqueId, int] = {}
+        self._descendants: Dict[UniqueId, int] = {}
+
+    def bits(self, nodes: Iterable[UniqueId]) -> int:
+        mask = 0
+        for node in nodes:
+            mask |= 1 << self.position[node]
+        return mask
+
+    def nodes(self, mask: int) -> Iterator[UniqueId]:
+        """The nodes in the bitset, in the order of the graph's nodes"""
+        return _iter_bits(mask, self.order)
+
+    def ancestor_bits(self, node: UniqueId) -> int:
+        return self._closure(node, self._ancestors, self._predecessors)
+
+    def descendant_bits(self, node: UniqueId) -> int:
+        return self._closure(node, self._descendants, self._successors)
+
+    def _closure(self, node, bitsets, neighbors) -> int:
+        if node in bitsets:
+            return bitsets[node]
+        position = self.position
+        # Depth first, computing the bitset of each node after its
+        # neighbors' bitsets. A neighbor on the path to the node is a cycle.
+        path = {node}
+        stack = [(node, iter(neighbors[node]))]
+        while stack:
+            current, unvisited = stack[-1]
+            for neighbor in unvisited:
+                if neighbor in bitsets:
+                    continue
+                if neighbor in path:
+                    raise nx.NetworkXUnfeasible(f'Found a cycle through {neighbor}')
+                path.add(neighbor)
+                stack.append((neighbor, iter(neighbors[neighbor])))
+                break
+            else:
+                stack.pop()
+                path.discard(current)
+                mask = 0
+                for neighbor in neighbors[current]:
+                    mask |= bitsets[neighbor] | (1 << position[neighbor])
+                bitsets[current] = mask
+        return bitsets[node]
+
+
 class Graph:
     """A wrapper around the networkx graph that understands SelectionCriteria
     and how they interact with the graph.
     """
     def __init__(self, graph):
         self.graph = graph
+        self._reachability: Optional[ReachabilityIndex] = None
+        self._reachability_built = False
+
+    @property
+    def reachability(self) -> Optional[ReachabilityIndex]:
+        """The reachability index of the graph, or None once a query found
+        a cycle. It's created the first time it's needed, so the networkx
+        graph must not change after the graph is queried.
+        """
+        if not self._reachability_built:
+            if self.graph.is_directed():
+                self._reachability = ReachabilityIndex(self.graph)
+            self._reachability_built = True
+        return self._reachability
+
+    def _reachable(self, nodes: Iterable[UniqueId], ancestors: bool) -> Optional[Set[UniqueId]]:
+        # the ancestors or descendants of the nodes from the index, or None
+        # if there's no index
+        index = self.reachability
+        if index is None:
+            return None
+        mask = 0
+        try:
+            for node in nodes:
+                self._check_node(node)
+                if ancestors:
+                    mask |= index.ancestor_bits(node)
+                else:
+                    mask |= index.descendant_bits(node)
+        except nx.NetworkXUnfeasible:
+            # the searches work with cycles
+            self._reachability = None
+            return None
+        return set(index.nodes(mask))
 
     def nodes(self) -> Set[UniqueId]:
         return set(self.graph.nodes())
@@ -25,12 +141,19 @@ class Graph:
     def __iter__(self) -> Iterator[UniqueId]:
         return iter(self.graph.nodes())
 
+    def _check_node(self, node: UniqueId) -> None:
+        if not self.graph.has_node(node):
+            raise InternalException(f'Node {node} not found in the graph!')
+
     def ancestors(
         self, node: UniqueId, max_depth: Optional[int] = None
     ) -> Set[UniqueId]:
         """Returns all nodes having a path to `node` in `graph`"""
-        if not self.graph.has_node(node):
-            raise InternalException(f'Node {node} not found in the graph!')
+        self._check_node(node)
+        if max_depth is None:
+            reachable = self._reachable([node], ancestors=True)
+            if reachable is not None:
+                return reachable
         # This used to use nx.utils.reversed(self.graph), but that is deprecated,
         # so changing to use self.graph.reverse(copy=False) as recommeneded
         G = self.graph.reverse(copy=False) if self.graph.is_directed() else self.graph
@@ -44,8 +167,11 @@ class Graph:
         self, node: UniqueId, max_depth: Optional[int] = None
     ) -> Set[UniqueId]:
         """Returns all nodes reachable from `node` in `graph`"""
-        if not self.graph.has_node(node):
-            raise InternalException(f'Node {node} not found in the graph!')
+        self._check_node(node)
+        if max_depth is None:
+            reachable = self._reachable([node], ancestors=False)
+            if reachable is not None:
+                return reachable
         des = nx.single_source_shortest_path_length(G=self.graph,
                                                     source=node,
                                                     cutoff=max_depth)\
@@ -61,6 +187,10 @@ class Graph:
     def select_children(
         self, selected: Set[UniqueId], max_depth: Optional[int] = None
     ) -> Set[UniqueId]:
+        if max_depth is None:
+            reachable = self._reachable(selected, ancestors=False)
+            if reachable is not None:
+                return reachable
         descendants: Set[UniqueId] = set()
         for node in selected:
             descendants.update(self.descendants(node, max_depth))
@@ -69,6 +199,10 @@ class Graph:
     def select_parents(
         self, selected: Set[UniqueId], max_depth: Optional[int] = None
     ) -> Set[UniqueId]:
+        if max_depth is None:
+            reachable = self._reachable(selected, ancestors=True)
+            if reachable is not None:
+                return reachable
         ancestors: Set[UniqueId] = set()
         for node in selected:
             ancestors.update(self.ancestors(node, max_depth))
@@ -81,13 +215,56 @@ class Graph:
         return successors
 
     def get_subset_graph(self, selected: Iterable[UniqueId]) -> "Graph":
-        """Create and return a new graph that is a shallow copy of the graph,
-        but with only the nodes in include_nodes. Transitive edges across
-        removed nodes are preserved as explicit new edges.
+        """Create and return a new graph with only the selected nodes. Two
+        selected nodes are connected if there's a path between them whose
+        other nodes aren't selected, so transitive edges across removed
+        nodes are preserved as explicit new edges.
         """
+        include_nodes = set(selected)
+        for node in include_nodes:
+            if node not in self.graph:
+                raise ValueError(
+                    "Couldn't find model '{}' -- does it exist or is "
+                    "it disabled?".format(node)
+                )
+        try:
+            order = list(nx.topological_sort(self.graph))
+        except nx.NetworkXUnfeasible:
+            return self._get_subset_graph_with_cycles(include_nodes)
+
+        new_graph = self.graph.__class__()
+        new_graph.graph.update(self.graph.graph)
+        new_graph.add_nodes_from(
+            (node, data) for node, data in self.graph.nodes(data=True)
+            if node in include_nodes
+        )
+        # The selected nodes are numbered, and a set of them is an int
+        # with their bits set. Going from the last node to the first, each
+        # node that isn't selected gets the set of selected nodes that it
+        # reaches without going through another selected node, and each
+        # selected node gets edges to the selected nodes that it reaches.
+        selected_nodes = [node for node in order if node in include_nodes]
+        bits = {node: 1 << index for index, node in enumerate(selected_nodes)}
+        reachable: Dict[UniqueId, int] = {}
+        successors = self.graph.succ
+        for node in reversed(order):
+            mask = 0
+            for child in successors[node]:
+                mask |= bits[child] if child in bits else reachable[child]
+            if node in bits:
+                new_graph.add_edges_from(
+                    (node, target) for target in _iter_bits(mask, selected_nodes)
+                )
+            else:
+                reachable[node] = mask
+
+        return Graph(new_graph)
 
+    def _get_subset_graph_with_cycles(self, include_nodes: Set[UniqueId]) -> "Graph":
+        # Remove the nodes that aren't selected one at a time, connecting
+        # their parents to their children. This is quadratic in the number
+        # of edges of each removed node, but works when there are cycles.
         new_graph = self.graph.copy()
-        include_nodes = set(selected)
 
         for node in self:
             if node not in include_nodes:
@@ -102,17 +279,13 @@ class Graph:
                 new_graph.add_edges_from(non_cyclic_new_edges)
                 new_graph.remove_node(node)
 
-        for node in include_nodes:
-            if node not in new_graph:
-                raise ValueError(
-                    "Couldn't find model '{}' -- does it exist or is "
-                    "it disabled?".format(node)
-                )
-
         return Graph(new_graph)
 
     def subgraph(self, nodes: Iterable[UniqueId]) -> 'Graph':
         return Graph(self.graph.subgraph(nodes))
 
     def get_dependent_nodes(self, node: UniqueId):
-        return nx.descendants(self.graph, node)
+        reachable = self._reachable([node], ancestors=False)
+        if reachable is None:
+            return nx.descendants(self.graph, node)
+        return reachable
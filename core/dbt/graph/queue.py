@@ -1,13 +1,16 @@
+import heapq
 import networkx as nx  # type: ignore
 import threading
+import time
 
 from queue import PriorityQueue
-from typing import Dict, Set, List, Generator, Optional
+from typing import Any, Dict, Set, List, Generator, Mapping, Optional, Tuple, Union
 
 from .graph import UniqueId
 from dbt.contracts.graph.parsed import ParsedSourceDefinition, ParsedExposure, ParsedMetric
 from dbt.contracts.graph.compiled import GraphMemberNode
 from dbt.contracts.graph.manifest import Manifest
+from dbt.contracts.results import ConcurrencyPoolStats
 from dbt.node_types import NodeType
 
 
@@ -18,9 +21,20 @@ class GraphQueue:
     This queue is thread-safe for `mark_done` calls, though you must ensure
     that separate threads do not call `.empty()` or `__len__()` and `.get()` at
     the same time, as there is an unlocked race!
+
+    Nodes in a concurrency pool are only given out while fewer of the pool's
+    nodes than its limit are in progress. The others wait outside of the
+    inner queue until one of the pool's nodes is done.
     """
 
-    def __init__(self, graph: nx.DiGraph, manifest: Manifest, selected: Set[UniqueId]):
+    def __init__(
+        self,
+        graph: nx.DiGraph,
+        manifest: Manifest,
+        selected: Set[UniqueId],
+        execution_times: Optional[Mapping[str, float]] = None,
+        pool_limits: Optional[Mapping[str, int]] = None,
+    ):
         self.graph = graph
         self.manifest = manifest
         self._selected = selected
@@ -33,8 +47,24 @@ class GraphQueue:
         self.queued: Set[UniqueId] = set()
         # this lock controls most things
         self.lock = threading.Lock()
-        # store the 'score' of each node as a number. Lower is higher priority.
-        self._scores = self._get_scores(self.graph)
+        # store the 'score' of each node. Lower is higher priority.
+        self._scores: Mapping[str, Union[int, Tuple[float, int]]]
+        if execution_times:
+            self._scores = self._get_critical_path_scores(self.graph, execution_times)
+        else:
+            self._scores = self._get_scores(self.graph)
+        # the concurrency pool of each node that's in one, the number of
+        # each pool's nodes in progress, and the nodes that wait for a slot
+        # in each pool, as a heap of queue items
+        self.pool_stats: Dict[str, ConcurrencyPoolStats] = {
+            pool: ConcurrencyPoolStats(limit=limit) for pool, limit in (pool_limits or {}).items()
+        }
+        self._pools = self._get_pools(self.graph)
+        self._pool_in_progress: Dict[str, int] = {pool: 0 for pool in self.pool_stats}
+        self._pool_waiting: Dict[str, List[Tuple[Any, UniqueId]]] = {
+            pool: [] for pool in self.pool_stats
+        }
+        self._waiting_since: Dict[UniqueId, float] = {}
         # populate the initial queue
         self._find_new_additions()
         # awaits after task end
@@ -43,6 +73,25 @@ class GraphQueue:
     def get_selected_nodes(self) -> Set[UniqueId]:
         return self._selected.copy()
 
+    def get_nodes_in_order(self) -> List[UniqueId]:
+        """The selected nodes in the order in which the queue gets the nodes
+        that are ready to run.
+        """
+        return sorted(
+            self.get_selected_nodes(), key=lambda node: (self._scores[node], node)
+        )
+
+    def _get_pools(self, graph: nx.DiGraph) -> Dict[UniqueId, str]:
+        pools: Dict[UniqueId, str] = {}
+        if not self.pool_stats:
+            return pools
+        for node_id in graph:
+            config = getattr(self.manifest.expect(node_id), 'config', None)
+            pool = getattr(config, 'concurrency_pool', None)
+            if pool in self.pool_stats:
+                pools[node_id] = pool
+        return pools
+
     def _include_in_cost(self, node_id: UniqueId) -> bool:
         node = self.manifest.expect(node_id)
         if node.resource_type != NodeType.Model:
@@ -108,6 +157,33 @@ class GraphQueue:
 
         return scores
 
+    def _get_critical_path_scores(
+        self, graph: nx.DiGraph, execution_times: Mapping[str, float]
+    ) -> Dict[str, Tuple[float, int]]:
+        """Scoring nodes for processing order by their critical path.
+
+        The critical path of a node is the longest chain of the node and its descendants,
+        with each node weighted by its execution time. The run can't finish before the
+        critical path of a node is done, so the longest one should be processed first.
+        Nodes without an execution time weigh nothing, and ties are broken by the graph
+        depth level, so nodes whose critical paths have no execution times are processed
+        in the same order as `_get_scores` processes them.
+
+        Args:
+            graph: The graph to be scored.
+            execution_times: The execution time of each node that has one, in seconds.
+
+        Returns:
+            A dictionary consisting of `node name`:`(-critical path, depth)` pairs.
+        """
+        depths = self._get_scores(graph)
+        critical_paths: Dict[str, float] = {}
+        for node in reversed(list(nx.topological_sort(graph))):
+            critical_paths[node] = execution_times.get(node, 0.0) + max(
+                (critical_paths[child] for child in graph.successors(node)), default=0.0
+            )
+        return {node: (-critical_paths[node], depths[node]) for node in graph}
+
     def get(
         self, block: bool = True, timeout: Optional[float] = None
     ) -> GraphMemberNode:
@@ -122,9 +198,19 @@ class GraphQueue:
         See `queue.PriorityQueue` for more information on `get()` behavior and
         exceptions.
         """
-        _, node_id = self.inner.get(block=block, timeout=timeout)
-        with self.lock:
-            self._mark_in_progress(node_id)
+        while True:
+            item = self.inner.get(block=block, timeout=timeout)
+            node_id = item[1]
+            with self.lock:
+                pool = self._pools.get(node_id)
+                if pool is None or self._pool_in_progress[pool] < self.pool_stats[pool].limit:
+                    self._mark_in_progress(node_id)
+                    break
+                # Wait for a slot in the pool. The node goes back in the
+                # inner queue when it has one, which counts as a new task.
+                heapq.heappush(self._pool_waiting[pool], item)
+                self._waiting_since.setdefault(node_id, time.monotonic())
+                self.inner.task_done()
         return self.manifest.expect(node_id)
 
     def __len__(self) -> int:
@@ -176,6 +262,9 @@ class GraphQueue:
             self.in_progress.remove(node_id)
             self.graph.remove_node(node_id)
             self._find_new_additions()
+            pool = self._pools.get(node_id)
+            if pool is not None:
+                self._release_pool_slot(pool)
             self.inner.task_done()
             self.some_task_done.notify_all()
 
@@ -188,6 +277,25 @@ class GraphQueue:
         """
         self.queued.remove(node_id)
         self.in_progress.add(node_id)
+        pool = self._pools.get(node_id)
+        if pool is not None:
+            self._pool_in_progress[pool] += 1
+            stats = self.pool_stats[pool]
+            stats.nodes += 1
+            if node_id in self._waiting_since:
+                stats.slot_wait_time += time.monotonic() - self._waiting_since.pop(node_id)
+
+    def _release_pool_slot(self, pool: str) -> None:
+        """Free the slot of a node in the pool, and put the first node that
+        waits for a slot back in the inner queue.
+
+        Callers must hold the lock.
+
+        :param str pool: The pool's name.
+        """
+        self._pool_in_progress[pool] -= 1
+        if self._pool_waiting[pool]:
+            self.inner.put(heapq.heappop(self._pool_waiting[pool]))
 
     def join(self) -> None:
         """Join the queue. Blocks until all tasks are marked as done.
@@ -1,4 +1,4 @@
-from typing import Set, List, Optional, Tuple
+from typing import Set, List, Mapping, Optional, Tuple
 
 from .graph import Graph, UniqueId
 from .queue import GraphQueue
@@ -275,14 +275,26 @@ class NodeSelector(MethodManager):
 
         return filtered_nodes
 
-    def get_graph_queue(self, spec: SelectionSpec) -> GraphQueue:
+    def get_graph_queue(
+        self,
+        spec: SelectionSpec,
+        execution_times: Optional[Mapping[str, float]] = None,
+        pool_limits: Optional[Mapping[str, int]] = None,
+        selected_nodes: Optional[Set[UniqueId]] = None,
+    ) -> GraphQueue:
         """Returns a queue over nodes in the graph that tracks progress of
-        dependecies.
+        dependecies. With execution times, the queue gives out the nodes
+        on the longest paths first. With pool limits, it gives out no more
+        nodes of a concurrency pool at a time than the pool's limit. The
+        nodes are selected with the spec, unless the caller already did.
         """
-        selected_nodes = self.get_selected(spec)
+        if selected_nodes is None:
+            selected_nodes = self.get_selected(spec)
         new_graph = self.full_graph.get_subset_graph(selected_nodes)
         # should we give a way here for consumers to mutate the graph?
-        return GraphQueue(new_graph.graph, self.manifest, selected_nodes)
+        return GraphQueue(
+            new_graph.graph, self.manifest, selected_nodes, execution_times, pool_limits
+        )
 
 
 class ResourceTypeSelector(NodeSelector):
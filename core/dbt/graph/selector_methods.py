@@ -1,7 +1,9 @@
 import abc
 from itertools import chain
 from pathlib import Path
-from typing import Set, List, Dict, Iterator, Tuple, Any, Union, Type, Optional, Callable
+from typing import (
+    Set, List, Dict, Iterable, Iterator, Mapping, Tuple, Any, Union, Type, Optional, Callable
+)
 
 from dbt.dataclass_schema import StrEnum
 
@@ -76,17 +78,169 @@ def is_selected_node(fqn: List[str], node_selector: str):
 
 SelectorTarget = Union[ParsedSourceDefinition, ManifestNode, ParsedExposure, ParsedMetric]
 
+# The types of the config values that are compared as keys of a dict, where
+# they're equal to a selector value only if they have the same hash.
+_HASHED_CONFIG_TYPES = (str, int, float, bool, type(None))
+
+
+class SelectorIndex:
+    """The unique ids of the manifest's nodes, sources, exposures and metrics
+    by the values that the selector methods match, so a method doesn't read
+    every node for each selector. Each index is built the first time a
+    method needs it and shared by the methods of a MethodManager, so a
+    selection with many criteria reads the manifest once for each method.
+
+    The indexes are built again after the manifest's members are added,
+    replaced or removed, by the manifest's methods or by replacing one of
+    its dicts. The ids in each index are in the order of the manifest.
+    """
+    def __init__(self, manifest: Manifest) -> None:
+        self.manifest = manifest
+        self._sections: Tuple[Mapping[str, Any], ...] = ()
+        self._sizes: Tuple[int, ...] = ()
+        self._member_changes = -1
+        self._indexes: Dict[Any, Any] = {}
+
+    def _get(self, key: Any, build: Callable[[], Any]) -> Any:
+        manifest = self.manifest
+        sections: Tuple[Mapping[str, Any], ...] = (
+            manifest.nodes, manifest.sources, manifest.exposures, manifest.metrics
+        )
+        sizes = tuple(len(section) for section in sections)
+        if (
+            manifest._member_changes != self._member_changes or
+            sizes != self._sizes or
+            any(section is not old for section, old in zip(sections, self._sections))
+        ):
+            self._indexes.clear()
+            self._member_changes = manifest._member_changes
+            self._sections = sections
+            self._sizes = sizes
+        if key not in self._indexes:
+            self._indexes[key] = build()
+        return self._indexes[key]
+
+    def _all_nodes(self) -> Iterator[Tuple[UniqueId, SelectorTarget]]:
+        manifest = self.manifest
+        for key, node in chain(
+            manifest.nodes.items(), manifest.sources.items(),
+            manifest.exposures.items(), manifest.metrics.items(),
+        ):
+            yield UniqueId(key), node
+
+    def _group(
+        self, members: Iterable[Tuple[UniqueId, Iterable[Any]]]
+    ) -> Dict[Any, List[UniqueId]]:
+        groups: Dict[Any, List[UniqueId]] = {}
+        for unique_id, values in members:
+            for value in values:
+                groups.setdefault(value, []).append(unique_id)
+        return groups
+
+    def by_tag(self) -> Dict[str, List[UniqueId]]:
+        return self._get('tag', lambda: self._group(
+            (unique_id, set(node.tags)) for unique_id, node in self._all_nodes()
+        ))
+
+    def by_package(self) -> Dict[str, List[UniqueId]]:
+        return self._get('package', lambda: self._group(
+            (unique_id, (node.package_name,)) for unique_id, node in self._all_nodes()
+        ))
+
+    def by_resource_type(self) -> Dict[NodeType, List[UniqueId]]:
+        return self._get('resource_type', lambda: self._group(
+            (UniqueId(key), (node.resource_type,))
+            for key, node in self.manifest.nodes.items()
+        ))
+
+    def by_test_name(self) -> Dict[str, List[UniqueId]]:
+        return self._get('test_name', lambda: self._group(
+            (UniqueId(key), (node.test_metadata.name,))
+            for key, node in self.manifest.nodes.items()
+            if isinstance(node, HasTestMetadata)
+        ))
+
+    def by_path(self) -> Dict[Path, Dict[Path, List[UniqueId]]]:
+        """The nodes under each root path, by their original file path and
+        each directory that it's in: the paths of a trie of the directories,
+        each with the nodes below it.
+        """
+        def build():
+            roots: Dict[Path, Dict[Path, List[UniqueId]]] = {}
+            for unique_id, node in self._all_nodes():
+                paths = roots.setdefault(Path(node.root_path), {})
+                ofp = Path(node.original_file_path)
+                for path in chain((ofp,), ofp.parents):
+                    paths.setdefault(path, []).append(unique_id)
+            return roots
+        return self._get('path', build)
+
+    def by_fqn(
+        self
+    ) -> Tuple[Dict[str, List[UniqueId]], Dict[Tuple[str, ...], Dict[UniqueId, int]]]:
+        """The nodes by the last part of their fqn, and by each prefix of
+        their fqn and of their fqn without the package, split on dots like
+        is_selected_node does: the paths of a trie of the fqns, each with
+        the nodes below it and the length of their longest fqn with it.
+        """
+        def build():
+            names: Dict[str, List[UniqueId]] = {}
+            prefixes: Dict[Tuple[str, ...], Dict[UniqueId, int]] = {}
+            for key, node in self.manifest.nodes.items():
+                unique_id = UniqueId(key)
+                names.setdefault(node.fqn[-1], []).append(unique_id)
+                for fqn in (node.fqn, node.fqn[1:]):
+                    flat_fqn = tuple(item for segment in fqn for item in segment.split('.'))
+                    for end in range(len(flat_fqn) + 1):
+                        lengths = prefixes.setdefault(flat_fqn[:end], {})
+                        lengths[unique_id] = max(lengths.get(unique_id, 0), len(flat_fqn))
+            return names, prefixes
+        return self._get('fqn', build)
+
+    def by_config(
+        self, parts: Tuple[str, ...]
+    ) -> Tuple[Dict[Any, List[UniqueId]], List[Tuple[UniqueId, Any]]]:
+        """The nodes and sources by the config value at 'parts', for the
+        values of the types in _HASHED_CONFIG_TYPES, and the nodes with
+        the other values with their value.
+        """
+        def build():
+            values: Dict[Any, List[UniqueId]] = {}
+            others: List[Tuple[UniqueId, Any]] = []
+            manifest = self.manifest
+            for key, node in chain(manifest.nodes.items(), manifest.sources.items()):
+                try:
+                    value = _getattr_descend(node.config, list(parts))
+                except AttributeError:
+                    continue
+                if type(value) in _HASHED_CONFIG_TYPES:
+                    values.setdefault(value, []).append(UniqueId(key))
+                else:
+                    others.append((UniqueId(key), value))
+            return values, others
+        return self._get(('config', parts), build)
+
+
+def _lookup(index: Mapping[Any, List[UniqueId]], value: Any) -> List[UniqueId]:
+    try:
+        return index.get(value, [])
+    except TypeError:
+        # unhashable, so it isn't equal to a key
+        return []
+
 
 class SelectorMethod(metaclass=abc.ABCMeta):
     def __init__(
         self,
         manifest: Manifest,
         previous_state: Optional[PreviousState],
-        arguments: List[str]
+        arguments: List[str],
+        index: Optional[SelectorIndex] = None,
     ):
         self.manifest: Manifest = manifest
         self.previous_state = previous_state
         self.arguments: List[str] = arguments
+        self.index: SelectorIndex = index if index is not None else SelectorIndex(manifest)
 
     def parsed_nodes(
         self,
@@ -156,6 +310,15 @@ class SelectorMethod(metaclass=abc.ABCMeta):
                          self.exposure_nodes(included_nodes),
                          self.metric_nodes(included_nodes))
 
+    def included(
+        self,
+        included_nodes: Set[UniqueId],
+        unique_ids: Iterable[UniqueId],
+    ) -> Iterator[UniqueId]:
+        for unique_id in unique_ids:
+            if unique_id in included_nodes:
+                yield unique_id
+
     @abc.abstractmethod
     def search(
         self,
@@ -190,10 +353,19 @@ class QualifiedNameSelectorMethod(SelectorMethod):
 
         :param str selector: The selector or node name
         """
-        parsed_nodes = list(self.parsed_nodes(included_nodes))
-        for node, real_node in parsed_nodes:
-            if self.node_is_match(selector, real_node.fqn):
-                yield node
+        names, prefixes = self.index.by_fqn()
+        selector_parts = selector.split('.')
+        # Like node_is_match: the nodes named like the selector, and the
+        # nodes with the parts of the selector before a glob at the start
+        # of their fqn, if it has at least as many parts as the selector.
+        end = len(selector_parts)
+        if SELECTOR_GLOB in selector_parts:
+            end = selector_parts.index(SELECTOR_GLOB)
+        matches = dict.fromkeys(names.get(selector, ()))
+        for node, length in prefixes.get(tuple(selector_parts[:end]), {}).items():
+            if length >= len(selector_parts):
+                matches[node] = None
+        yield from self.included(included_nodes, matches)
 
 
 class TagSelectorMethod(SelectorMethod):
@@ -201,9 +373,7 @@ class TagSelectorMethod(SelectorMethod):
         self, included_nodes: Set[UniqueId], selector: str
     ) -> Iterator[UniqueId]:
         """ yields nodes from included that have the specified tag """
-        for node, real_node in self.all_nodes(included_nodes):
-            if selector in real_node.tags:
-                yield node
+        yield from self.included(included_nodes, _lookup(self.index.by_tag(), selector))
 
 
 class SourceSelectorMethod(SelectorMethod):
@@ -303,14 +473,11 @@ class PathSelectorMethod(SelectorMethod):
         # use '.' and not 'root' for easy comparison
         root = Path.cwd()
         paths = set(p.relative_to(root) for p in root.glob(selector))
-        for node, real_node in self.all_nodes(included_nodes):
-            if Path(real_node.root_path) != root:
-                continue
-            ofp = Path(real_node.original_file_path)
-            if ofp in paths:
-                yield node
-            elif any(parent in paths for parent in ofp.parents):
-                yield node
+        nodes_by_path = self.index.by_path().get(root, {})
+        matches: Dict[UniqueId, None] = {}
+        for path in paths:
+            matches.update(dict.fromkeys(nodes_by_path.get(path, ())))
+        yield from self.included(included_nodes, matches)
 
 
 class PackageSelectorMethod(SelectorMethod):
@@ -318,9 +485,7 @@ class PackageSelectorMethod(SelectorMethod):
         self, included_nodes: Set[UniqueId], selector: str
     ) -> Iterator[UniqueId]:
         """Yields nodes from included that have the specified package"""
-        for node, real_node in self.all_nodes(included_nodes):
-            if real_node.package_name == selector:
-                yield node
+        yield from self.included(included_nodes, _lookup(self.index.by_package(), selector))
 
 
 def _getattr_descend(obj: Any, attrs: List[str]) -> Any:
@@ -364,14 +529,16 @@ class ConfigSelectorMethod(SelectorMethod):
         # search sources is kind of useless now source configs only have
         # 'enabled', which you can't really filter on anyway, but maybe we'll
         # add more someday, so search them anyway.
-        for node, real_node in self.configurable_nodes(included_nodes):
-            try:
-                value = _getattr_descend(real_node.config, parts)
-            except AttributeError:
-                continue
-            else:
-                if selector == value:
-                    yield node
+        values, others = self.index.by_config(tuple(parts))
+        if type(selector) in _HASHED_CONFIG_TYPES:
+            matches = list(values.get(selector, []))
+        else:
+            matches = [
+                node for value, nodes in values.items() if selector == value
+                for node in nodes
+            ]
+        matches.extend(node for node, value in others if selector == value)
+        yield from self.included(included_nodes, matches)
 
 
 class ResourceTypeSelectorMethod(SelectorMethod):
@@ -384,19 +551,16 @@ class ResourceTypeSelectorMethod(SelectorMethod):
             raise RuntimeException(
                 f'Invalid resource_type selector "{selector}"'
             ) from exc
-        for node, real_node in self.parsed_nodes(included_nodes):
-            if real_node.resource_type == resource_type:
-                yield node
+        yield from self.included(
+            included_nodes, _lookup(self.index.by_resource_type(), resource_type)
+        )
 
 
 class TestNameSelectorMethod(SelectorMethod):
     def search(
         self, included_nodes: Set[UniqueId], selector: str
     ) -> Iterator[UniqueId]:
-        for node, real_node in self.parsed_nodes(included_nodes):
-            if isinstance(real_node, HasTestMetadata):
-                if real_node.test_metadata.name == selector:
-                    yield node
+        yield from self.included(included_nodes, _lookup(self.index.by_test_name(), selector))
 
 
 class TestTypeSelectorMethod(SelectorMethod):
@@ -595,6 +759,14 @@ class MethodManager:
     ):
         self.manifest = manifest
         self.previous_state = previous_state
+        self._index: Optional[SelectorIndex] = None
+
+    @property
+    def index(self) -> SelectorIndex:
+        """The index that the methods share, for the current manifest"""
+        if self._index is None or self._index.manifest is not self.manifest:
+            self._index = SelectorIndex(self.manifest)
+        return self._index
 
     def get_method(
         self, method: MethodName, method_arguments: List[str]
@@ -606,4 +778,4 @@ class MethodManager:
                 f'method name, but it is not handled'
             )
         cls: Type[SelectorMethod] = self.SELECTOR_METHODS[method]
-        return cls(self.manifest, self.previous_state, method_arguments)
+        return cls(self.manifest, self.previous_state, method_arguments, self.index)
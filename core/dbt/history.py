@@ -0,0 +1,204 @@
+import json
+import sqlite3
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from dbt.contracts.results import RunExecutionResult
+from dbt.version import __version__
+
+
+HISTORY_FILE_NAME = 'run_history.db'
+
+# The version of the tables, in the database's user_version. The tables are
+# created when a database with an older version is opened.
+SCHEMA_VERSION = 1
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS invocations (
+    id INTEGER PRIMARY KEY,
+    invocation_id TEXT NOT NULL,
+    command TEXT,
+    dbt_version TEXT NOT NULL,
+    generated_at REAL NOT NULL,
+    elapsed_time REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS node_results (
+    invocation INTEGER NOT NULL REFERENCES invocations (id),
+    unique_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    thread_id TEXT,
+    execution_time REAL NOT NULL,
+    compile_started_at REAL,
+    compile_completed_at REAL,
+    execute_started_at REAL,
+    execute_completed_at REAL,
+    rows_affected INTEGER,
+    failures INTEGER,
+    adapter_response TEXT,
+    message TEXT
+);
+CREATE INDEX IF NOT EXISTS node_results_unique_id ON node_results (unique_id, invocation);
+'''
+
+
+def _timestamp(value: Optional[datetime]) -> Optional[float]:
+    if value is None:
+        return None
+    # the result timestamps are naive utc datetimes
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """The q-th percentile of the sorted values, interpolated linearly
+    between the closest ranks.
+    """
+    position = (len(values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+class ExecutionHistory:
+    """The results of the nodes that dbt ran, across invocations, in a
+    SQLite database. Each invocation appends a row to `invocations` and a
+    row per node to `node_results`, with the node's status, its execution
+    time, the start and end of its compile and execute steps and its adapter
+    response. Nothing is updated or removed.
+
+    The database can be queried directly, or with get_percentiles.
+    """
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._connection: Optional[sqlite3.Connection] = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            # another invocation can be writing to it
+            connection = sqlite3.connect(self.path, timeout=30)
+            try:
+                version = connection.execute('PRAGMA user_version').fetchone()[0]
+                if version < SCHEMA_VERSION:
+                    with connection:
+                        connection.executescript(SCHEMA)
+                        connection.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+            except sqlite3.Error:
+                connection.close()
+                raise
+            self._connection = connection
+        return self._connection
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def __enter__(self) -> 'ExecutionHistory':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def record(self, result: RunExecutionResult, invocation_id: str) -> None:
+        rows = []
+        for node_result in result.results:
+            timing = {info.name: info for info in node_result.timing}
+            compile_timing = timing.get('compile')
+            execute_timing = timing.get('execute')
+            adapter_response = node_result.adapter_response or {}
+            rows.append((
+                node_result.node.unique_id,
+                str(node_result.status),
+                node_result.thread_id,
+                node_result.execution_time,
+                _timestamp(compile_timing.started_at) if compile_timing else None,
+                _timestamp(compile_timing.completed_at) if compile_timing else None,
+                _timestamp(execute_timing.started_at) if execute_timing else None,
+                _timestamp(execute_timing.completed_at) if execute_timing else None,
+                adapter_response.get('rows_affected'),
+                node_result.failures,
+                json.dumps(adapter_response, separators=(',', ':'), default=str),
+                node_result.message,
+            ))
+
+        with self.connection as connection:
+            cursor = connection.execute(
+                'INSERT INTO invocations '
+                '(invocation_id, command, dbt_version, generated_at, elapsed_time) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (
+                    invocation_id,
+                    result.args.get('which'),
+                    __version__,
+                    _timestamp(result.generated_at),
+                    result.elapsed_time,
+                )
+            )
+            connection.executemany(
+                f'INSERT INTO node_results VALUES ({cursor.lastrowid}, '
+                '?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                rows
+            )
+
+    def get_percentiles(
+        self,
+        percentiles: Sequence[float] = (50.0,),
+        unique_ids: Optional[Iterable[str]] = None,
+        recent: Optional[int] = None,
+        exclude_commands: Iterable[str] = (),
+    ) -> Dict[str, List[float]]:
+        """Return the percentiles of the execution times of each node, in
+        the order of 'percentiles', from the node's 'recent' latest results
+        or all of them. Skipped nodes have no execution time, so those
+        results aren't counted.
+        """
+        connection = self.connection
+        source = 'node_results'
+        if unique_ids is not None:
+            # there can be more unique ids than query parameters
+            with connection:
+                connection.execute(
+                    'CREATE TEMP TABLE IF NOT EXISTS wanted_ids (unique_id TEXT PRIMARY KEY)'
+                )
+                connection.execute('DELETE FROM temp.wanted_ids')
+                connection.executemany(
+                    'INSERT OR IGNORE INTO temp.wanted_ids VALUES (?)',
+                    ((unique_id,) for unique_id in unique_ids)
+                )
+            # CROSS JOIN makes SQLite look up each wanted node in the index,
+            # instead of scanning the results of every node
+            source = (
+                'temp.wanted_ids CROSS JOIN node_results '
+                'ON node_results.unique_id = wanted_ids.unique_id'
+            )
+        where = "node_results.status != 'skipped'"
+        parameters: List[Any] = list(exclude_commands)
+        if parameters:
+            marks = ', '.join('?' * len(parameters))
+            where += f" AND coalesce(invocations.command, '') NOT IN ({marks})"
+        # the latest results of each node come first in the index on
+        # (unique_id, invocation)
+        query = (
+            'SELECT unique_id, execution_time FROM ('
+            'SELECT node_results.unique_id, node_results.execution_time, '
+            'ROW_NUMBER() OVER ('
+            'PARTITION BY node_results.unique_id ORDER BY node_results.invocation DESC'
+            ') AS position '
+            f'FROM {source} JOIN invocations '
+            'ON node_results.invocation = invocations.id '
+            f'WHERE {where})'
+        )
+        if recent is not None:
+            query += ' WHERE position <= ?'
+            parameters.append(recent)
+
+        execution_times: Dict[str, List[float]] = {}
+        for unique_id, execution_time in connection.execute(query, parameters):
+            execution_times.setdefault(unique_id, []).append(execution_time)
+
+        return {
+            unique_id: [percentile(sorted(times), q) for q in percentiles]
+            for unique_id, times in execution_times.items()
+        }
@@ -29,6 +29,7 @@ import dbt.task.run as run_task
 import dbt.task.run_operation as run_operation_task
 import dbt.task.seed as seed_task
 import dbt.task.serve as serve_task
+import dbt.task.server as server_task
 import dbt.task.snapshot as snapshot_task
 import dbt.task.test as test_task
 from dbt.profiler import profiler
@@ -218,12 +219,14 @@ def track_run(task):
         dbt.tracking.flush()
 
 
-def run_from_args(parsed):
+def run_from_args(parsed, task=None):
     log_cache_events(getattr(parsed, 'log_cache_events', False))
 
-    # this will convert DbtConfigErrors into RuntimeExceptions
-    # task could be any one of the task objects
-    task = parsed.cls.from_args(args=parsed)
+    # The dbt server passes in a task that was created with its config
+    if task is None:
+        # this will convert DbtConfigErrors into RuntimeExceptions
+        # task could be any one of the task objects
+        task = parsed.cls.from_args(args=parsed)
 
     # Set up logging
     log_path = None
@@ -554,6 +557,15 @@ def _build_parse_subparser(subparsers, base_subparser):
                      rpc_method='parse')
     sub.add_argument('--write-manifest', action='store_true')
     sub.add_argument('--compile', action='store_true')
+    sub.add_argument(
+        '--watch',
+        action='store_true',
+        help='''
+        After parsing, keep the manifest in memory and parse the project
+        again every time a file changes, until interrupted. Each parse
+        updates the partial parse file that other commands start from.
+        '''
+    )
     return sub
 
 
@@ -711,6 +723,30 @@ def _build_docs_serve_subparser(subparsers, base_subparser):
     return serve_sub
 
 
+def _build_server_subparser(subparsers, base_subparser):
+    sub = subparsers.add_parser(
+        'server',
+        parents=[base_subparser],
+        help='''
+        Parse the project once and keep it in memory, then run build,
+        compile, ls, run, run-operation, seed, snapshot and test requests
+        that are sent to a local socket, without loading the project again.
+        Only supported on Linux.
+        '''
+    )
+    sub.add_argument(
+        '--socket',
+        default=None,
+        type=str,
+        help='''
+        The path of the Unix domain socket to listen on. Default is
+        dbt.sock in the target path.
+        '''
+    )
+    sub.set_defaults(cls=server_task.ServerTask, which='server', rpc_method=None)
+    return sub
+
+
 def _build_test_subparser(subparsers, base_subparser):
     sub = subparsers.add_parser(
         'test',
@@ -943,6 +979,17 @@ def parse_args(args, cls=DBTArgumentParser):
         If set, skip writing the manifest and run_results.json files to disk
         '''
     )
+
+    p.add_argument(
+        '--no-write-history',
+        action='store_false',
+        default=None,
+        dest='write_history',
+        help='''
+        If set, skip appending the results of the run to the execution history
+        in run_history.db in the target path
+        '''
+    )
     colors_flag = p.add_mutually_exclusive_group()
     colors_flag.add_argument(
         '--use-colors',
@@ -1011,6 +1058,78 @@ def parse_args(args, cls=DBTArgumentParser):
         ''',
     )
 
+    p.add_argument(
+        '--strict-partial-parse',
+        action='store_true',
+        default=None,
+        help='''
+        When partial parsing, read and hash every project file instead of
+        trusting the size, modification time and inode of files that were
+        unchanged since the last parse.
+        '''
+    )
+
+    p.add_argument(
+        '--parse-workers',
+        dest='parse_workers',
+        type=int,
+        help='''
+        The number of processes used to parse model, snapshot and analysis
+        files. The default, 1, parses them in the dbt process. Worker
+        processes are only used on Linux.
+        '''
+    )
+
+    p.add_argument(
+        '--compile-workers',
+        dest='compile_workers',
+        type=int,
+        help='''
+        The number of processes that compile the selected models, tests,
+        snapshots and analyses ahead of the threads that run them. Nodes
+        whose SQL or macros query the database, like with run_query or
+        adapter.get_relation, are compiled by the thread that runs them.
+        The default, 1, compiles every node in the thread that runs it.
+        Worker processes are only used on Linux.
+        '''
+    )
+
+    p.add_argument(
+        '--artifact-compression',
+        dest='artifact_compression',
+        choices=['none', 'gzip', 'zstd'],
+        help='''
+        Compress the manifest.json and run_results.json artifacts, which are
+        then written as manifest.json.gz or manifest.json.zst. zstd needs the
+        zstandard package. The default is none.
+        '''
+    )
+
+    p.add_argument(
+        '--artifact-format',
+        dest='artifact_format',
+        choices=['json', 'msgpack', 'both'],
+        help='''
+        Write the manifest, run results and source freshness artifacts as
+        json, as msgpack (manifest.msgpack), which is faster to read, or as
+        both. --state reads the msgpack artifacts too. The default is json.
+        '''
+    )
+
+    p.add_argument(
+        '--scheduling',
+        dest='scheduling',
+        choices=['depth', 'critical-path'],
+        help='''
+        The order in which nodes whose parents are done are run. "depth"
+        runs the nodes closest to the roots of the DAG first. "critical-path"
+        runs the nodes with the longest chain of descendants first, weighting
+        each node by its median execution time in the execution history in
+        the target path (run_history.db); nodes without one are ordered by
+        depth. The default is depth.
+        '''
+    )
+
     # if set, run dbt in single-threaded mode: thread count is ignored, and
     # calls go through `map` instead of the thread pool. This is useful for
     # getting performance information about aspects of dbt that normally run in
@@ -1105,6 +1224,7 @@ def parse_args(args, cls=DBTArgumentParser):
     run_sub = _build_run_subparser(subs, base_subparser)
     compile_sub = _build_compile_subparser(subs, base_subparser)
     parse_sub = _build_parse_subparser(subs, base_subparser)
+    _build_server_subparser(subs, base_subparser)
     generate_sub = _build_docs_generate_subparser(docs_subs, base_subparser)
     test_sub = _build_test_subparser(subs, base_subparser)
     seed_sub = _build_seed_subparser(subs, base_subparser)
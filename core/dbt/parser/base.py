@@ -12,6 +12,7 @@ from dbt.clients.jinja import MacroGenerator
 from dbt.context.providers import (
     generate_parser_model_context,
     generate_generate_name_macro_context,
+    GenerateNameVar,
 )
 from dbt.adapters.factory import get_adapter  # noqa: F401
 from dbt.clients.jinja import get_rendered
@@ -105,13 +106,19 @@ class RelationUpdate:
             macro, config, manifest
         )
         self.updater = MacroGenerator(macro, root_context)
+        self.var: GenerateNameVar = root_context['var']
         self.component = component
 
     def __call__(
         self, parsed_node: Any, config_dict: Dict[str, Any]
     ) -> None:
         override = config_dict.get(self.component)
-        new_value = self.updater(override, parsed_node)
+        # the vars that the macro uses are saved in the node's file
+        self.var.named_node = parsed_node
+        try:
+            new_value = self.updater(override, parsed_node)
+        finally:
+            self.var.named_node = None
         if isinstance(new_value, str):
             new_value = new_value.strip()
         setattr(parsed_node, self.component, new_value)
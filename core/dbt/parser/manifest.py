@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from dataclasses import field
 from datetime import datetime
+import json
 import os
 import traceback
 from typing import (
@@ -41,14 +42,19 @@ from dbt.context.macro_resolver import MacroResolver, TestMacroNamespace
 from dbt.context.configured import generate_macro_context
 from dbt.context.providers import ParseProvider
 from dbt.contracts.files import FileHash, ParseFileType, SchemaSourceFile
-from dbt.parser.read_files import read_files, load_source_file
+from dbt.parser.read_files import read_files, load_source_file, load_deferred_contents
 from dbt.parser.partial import PartialParsing, special_override_macros
+from dbt.parser.partial_store import (
+    ENTRY_SECTIONS, PartialParseChanges, PartialParseReader, PartialParseSnapshot,
+    write_partial_parse_manifest,
+)
 from dbt.contracts.graph.compiled import ManifestNode
 from dbt.contracts.graph.manifest import (
     Manifest, Disabled, MacroManifest, ManifestStateCheck, ParsingInfo
 )
 from dbt.contracts.graph.parsed import (
-    ParsedSourceDefinition, ParsedNode, ParsedMacro, ColumnInfo, ParsedExposure, ParsedMetric
+    ParsedSourceDefinition, ParsedNode, ParsedMacro, ColumnInfo, ParsedExposure, ParsedMetric,
+    ParsedDocumentation,
 )
 from dbt.contracts.util import Writable
 from dbt.exceptions import (
@@ -66,6 +72,10 @@ from dbt.parser.docs import DocumentationParser
 from dbt.parser.hooks import HookParser
 from dbt.parser.macros import MacroParser
 from dbt.parser.models import ModelParser
+from dbt.parser.parallel import (
+    PARALLEL_PARSER_TYPES, PARALLEL_PARSE_MIN_FILES, get_parallel_context,
+    parse_files_in_parallel
+)
 from dbt.parser.schemas import SchemaParser
 from dbt.parser.search import FileBlock
 from dbt.parser.seeds import SeedParser
@@ -120,6 +130,8 @@ class ManifestLoaderInfo(dbtClassMixin, Writable):
     is_partial_parse_enabled: Optional[bool] = None
     is_static_analysis_enabled: Optional[bool] = None
     read_files_elapsed: Optional[float] = None
+    discover_files_elapsed: Optional[float] = None
+    load_files_elapsed: Optional[float] = None
     load_macros_elapsed: Optional[float] = None
     parse_project_elapsed: Optional[float] = None
     patch_sources_elapsed: Optional[float] = None
@@ -142,6 +154,8 @@ class ManifestLoader:
         root_project: RuntimeConfig,
         all_projects: Mapping[str, Project],
         macro_hook: Optional[Callable[[Manifest], Any]] = None,
+        saved_manifest: Optional[Manifest] = None,
+        partial_parse_snapshot: Optional[PartialParseSnapshot] = None,
     ) -> None:
         self.root_project: RuntimeConfig = root_project
         self.all_projects: Mapping[str, Project] = all_projects
@@ -169,8 +183,17 @@ class ManifestLoader:
         self.partially_parsing = False
         self.partial_parser = None
 
+        # The contents of the partial parse file as it was read, so that only
+        # the differences need to be written back to it.
+        self.partial_parse_snapshot: Optional[PartialParseSnapshot] = partial_parse_snapshot
         # This is a saved manifest from a previous run that's used for partial parsing
-        self.saved_manifest: Optional[Manifest] = self.read_manifest_for_partial_parse()
+        self.saved_manifest: Optional[Manifest]
+        if saved_manifest is None:
+            self.saved_manifest = self.read_manifest_for_partial_parse()
+        else:
+            # A manifest that was kept in memory by a long running
+            # process, like 'dbt parse --watch'
+            self.saved_manifest = self.reuse_manifest_for_partial_parse(saved_manifest)
 
     # This is the method that builds a complete manifest. We sometimes
     # use an abbreviated process in tests.
@@ -200,6 +223,7 @@ class ManifestLoader:
             manifest = loader.load()
 
             _check_manifest(manifest, config)
+            manifest.compact()
             manifest.build_flat_graph()
 
             # This needs to happen after loading from a partial parse,
@@ -225,14 +249,24 @@ class ManifestLoader:
         if self.saved_manifest:
             saved_files = self.saved_manifest.files
         for project in self.all_projects.values():
-            read_files(project, self.manifest.files, project_parser_files, saved_files)
+            read_files(
+                project, self.manifest.files, project_parser_files, saved_files, self._perf_info
+            )
         orig_project_parser_files = project_parser_files
         self._perf_info.path_count = len(self.manifest.files)
         self._perf_info.read_files_elapsed = (time.perf_counter() - start_read_files)
 
         skip_parsing = False
         if self.saved_manifest is not None:
-            self.partial_parser = PartialParsing(self.saved_manifest, self.manifest.files)
+            changed_cli_vars = self.manifest.state_check.changed_cli_vars(
+                self.saved_manifest.state_check
+            )
+            self.partial_parser = PartialParsing(
+                self.saved_manifest, self.manifest.files, changed_cli_vars
+            )
+            # The saved manifest gets the current state_check, which has the
+            # current hashes of the vars
+            self.saved_manifest.state_check = self.manifest.state_check
             skip_parsing = self.partial_parser.skip_parsing()
             if skip_parsing:
                 # nothing changed, so we don't need to generate project_parser_files
@@ -298,6 +332,7 @@ class ManifestLoader:
             # the other files are loaded.  Also need to parse tests, specifically
             # generic tests
             start_load_macros = time.perf_counter()
+            load_deferred_contents(self.manifest.files, project_parser_files)
             self.load_and_parse_macros(project_parser_files)
 
             # If we're partially parsing check that certain macros have not been changed
@@ -308,6 +343,7 @@ class ManifestLoader:
                 self.manifest = self.new_manifest  # contains newly read files
                 project_parser_files = orig_project_parser_files
                 self.partially_parsing = False
+                load_deferred_contents(self.manifest.files, project_parser_files)
                 self.load_and_parse_macros(project_parser_files)
 
             self._perf_info.load_macros_elapsed = (time.perf_counter() - start_load_macros)
@@ -388,6 +424,9 @@ class ManifestLoader:
             # write out the fully parsed manifest
             self.write_manifest_for_partial_parse()
 
+        # Parsing also changes the macros, docs and metadata, which aren't
+        # counted by the manifest's methods, so manifest.json is written again
+        self.manifest.mark_changed()
         return self.manifest
 
     def load_and_parse_macros(self, project_parser_files):
@@ -442,18 +481,29 @@ class ManifestLoader:
 
             # Parse the project files for this parser
             parser: Parser = parser_cls(project, self.manifest, self.root_project)
-            for file_id in parser_files[parser_name]:
-                block = FileBlock(self.manifest.files[file_id])
-                if isinstance(parser, SchemaParser):
-                    assert isinstance(block.file, SchemaSourceFile)
-                    if self.partially_parsing:
-                        dct = block.file.pp_dict
+            if self.should_parse_in_parallel(parser_cls, parser_files[parser_name]):
+                parse_files_in_parallel(
+                    project,
+                    self.root_project,
+                    self.manifest,
+                    parser_cls,
+                    parser_files[parser_name],
+                    flags.PARSE_WORKERS or 1,
+                )
+                project_parsed_path_count += len(parser_files[parser_name])
+            else:
+                for file_id in parser_files[parser_name]:
+                    block = FileBlock(self.manifest.files[file_id])
+                    if isinstance(parser, SchemaParser):
+                        assert isinstance(block.file, SchemaSourceFile)
+                        if self.partially_parsing:
+                            dct = block.file.pp_dict
+                        else:
+                            dct = block.file.dict_from_yaml
+                        parser.parse_file(block, dct=dct)
                     else:
-                        dct = block.file.dict_from_yaml
-                    parser.parse_file(block, dct=dct)
-                else:
-                    parser.parse_file(block)
-                project_parsed_path_count += 1
+                        parser.parse_file(block)
+                    project_parsed_path_count += 1
 
             # Save timing info
             project_loader_info.parsers.append(ParserInfo(
@@ -486,6 +536,16 @@ class ManifestLoader:
             self._perf_info.parsed_path_count + total_parsed_path_count
         )
 
+    # Model, snapshot and analysis files can be parsed in worker processes,
+    # if --parse-workers is set and there are enough of them.
+    def should_parse_in_parallel(self, parser_cls: Type[Parser], file_ids: List[str]) -> bool:
+        return (
+            (flags.PARSE_WORKERS or 1) > 1 and
+            parser_cls in PARALLEL_PARSER_TYPES and
+            len(file_ids) >= PARALLEL_PARSE_MIN_FILES and
+            get_parallel_context() is not None
+        )
+
     # This should only be called after the macros have been loaded
     def build_macro_resolver(self):
         internal_package_names = get_adapter_package_names(
@@ -536,50 +596,109 @@ class ManifestLoader:
                     version=self.manifest.metadata.dbt_version)
                 )
                 self.manifest.metadata.dbt_version = __version__
-            manifest_msgpack = self.manifest.to_msgpack()
             make_directory(os.path.dirname(path))
-            with open(path, 'wb') as fp:
-                fp.write(manifest_msgpack)
+            changes = None
+            if self.partially_parsing:
+                changes = self.build_partial_parse_changes()
+            self.partial_parse_snapshot = write_partial_parse_manifest(
+                path, self.manifest, self.partial_parse_snapshot, changes
+            )
         except Exception:
             raise
 
+    def build_partial_parse_changes(self) -> PartialParseChanges:
+        """Collect the entries that partial parsing removed from the saved
+        manifest and the entries that were parsed in this load, so only
+        those are written to the partial parse file.
+        """
+        assert self.partial_parser is not None
+        changes = PartialParseChanges()
+        file_diff = self.partial_parser.file_diff
+        file_ids = set(file_diff['added'])
+        file_ids.update(file_diff['changed'], file_diff['changed_schema_files'])
+        file_ids.update(self.partial_parser.touched_files)
+        for parser_files in self.partial_parser.project_parser_files.values():
+            for parser_file_ids in parser_files.values():
+                file_ids.update(parser_file_ids)
+
+        def parsed_in_this_load(item) -> bool:
+            # docs don't have a created_at, but they're only parsed from
+            # the files that are parsed again
+            if isinstance(item, ParsedDocumentation):
+                return item.file_id in file_ids
+            return item.created_at >= self.started_at
+
+        deleted_manifest = self.partial_parser.deleted_manifest
+        for name in ENTRY_SECTIONS:
+            changes.add_deleted(name, getattr(deleted_manifest, name).keys())
+            if name == 'files':
+                continue
+            current = getattr(self.manifest, name)
+            changed = {
+                unique_id for unique_id, entry in current.items()
+                if any(parsed_in_this_load(item) for item in _entry_items(name, entry))
+            }
+            changes.add_changed(name, changed)
+            # adding or removing an entry changes its file, and the schema
+            # file with its patch
+            for entry in chain(
+                (current[unique_id] for unique_id in changed),
+                getattr(deleted_manifest, name).values(),
+            ):
+                for item in _entry_items(name, entry):
+                    file_ids.add(item.file_id)
+                    if getattr(item, 'patch_path', None):
+                        file_ids.add(item.patch_path)
+        # the disabled nodes with the same unique_id as a removed node have
+        # their patch_path cleared
+        changes.add_changed('disabled', deleted_manifest.nodes.keys())
+        changes.add_changed('files', file_ids)
+        return changes
+
     def is_partial_parsable(self, manifest: Manifest) -> Tuple[bool, Optional[str]]:
         """Compare the global hashes of the read-in parse results' values to
         the known ones, and return if it is ok to re-use the results.
         """
+        return self.is_state_partial_parsable(
+            manifest.metadata.dbt_version, manifest.state_check
+        )
+
+    def is_state_partial_parsable(
+        self, dbt_version: str, state_check: ManifestStateCheck
+    ) -> Tuple[bool, Optional[str]]:
         valid = True
         reparse_reason = None
 
-        if manifest.metadata.dbt_version != __version__:
+        if dbt_version != __version__:
             # #3757 log both versions because of reports of invalid cases of mismatch.
-            fire_event(PartialParsingVersionMismatch(saved_version=manifest.metadata.dbt_version,
+            fire_event(PartialParsingVersionMismatch(saved_version=dbt_version,
                                                      current_version=__version__))
             # If the version is wrong, the other checks might not work
             return False, ReparseReason.version_mismatch
-        if self.manifest.state_check.vars_hash != manifest.state_check.vars_hash:
+        if self.manifest.state_check.vars_hash != state_check.vars_hash:
             fire_event(PartialParsingFailedBecauseConfigChange())
             valid = False
             reparse_reason = ReparseReason.vars_changed
-        if self.manifest.state_check.profile_hash != manifest.state_check.profile_hash:
+        if self.manifest.state_check.profile_hash != state_check.profile_hash:
             # Note: This should be made more granular. We shouldn't need to invalidate
             # partial parsing if a non-used profile section has changed.
             fire_event(PartialParsingFailedBecauseProfileChange())
             valid = False
             reparse_reason = ReparseReason.profile_changed
         if self.manifest.state_check.project_env_vars_hash != \
-                manifest.state_check.project_env_vars_hash:
+                state_check.project_env_vars_hash:
             fire_event(PartialParsingProjectEnvVarsChanged())
             valid = False
             reparse_reason = ReparseReason.proj_env_vars_changed
         if self.manifest.state_check.profile_env_vars_hash != \
-                manifest.state_check.profile_env_vars_hash:
+                state_check.profile_env_vars_hash:
             fire_event(PartialParsingProfileEnvVarsChanged())
             valid = False
             reparse_reason = ReparseReason.prof_env_vars_changed
 
         missing_keys = {
             k for k in self.manifest.state_check.project_hashes
-            if k not in manifest.state_check.project_hashes
+            if k not in state_check.project_hashes
         }
         if missing_keys:
             fire_event(PartialParsingFailedBecauseNewProjectDependency())
@@ -587,8 +706,8 @@ class ManifestLoader:
             reparse_reason = ReparseReason.deps_changed
 
         for key, new_value in self.manifest.state_check.project_hashes.items():
-            if key in manifest.state_check.project_hashes:
-                old_value = manifest.state_check.project_hashes[key]
+            if key in state_check.project_hashes:
+                old_value = state_check.project_hashes[key]
                 if new_value != old_value:
                     fire_event(PartialParsingFailedBecauseHashChanged())
                     valid = False
@@ -621,19 +740,22 @@ class ManifestLoader:
 
         if os.path.exists(path):
             try:
-                with open(path, 'rb') as fp:
-                    manifest_mp = fp.read()
-                manifest: Manifest = Manifest.from_msgpack(manifest_mp)  # type: ignore
-                # keep this check inside the try/except in case something about
-                # the file has changed in weird ways, perhaps due to being a
-                # different version of dbt
-                is_partial_parsable, reparse_reason = self.is_partial_parsable(manifest)
-                if is_partial_parsable:
-                    # We don't want to have stale generated_at dates
-                    manifest.metadata.generated_at = datetime.utcnow()
-                    # or invocation_ids
-                    manifest.metadata.invocation_id = get_invocation_id()
-                    return manifest
+                with PartialParseReader(path) as reader:
+                    # keep this check inside the try/except in case something about
+                    # the file has changed in weird ways, perhaps due to being a
+                    # different version of dbt. Only the header has been decoded
+                    # at this point, so this is cheap.
+                    is_partial_parsable, reparse_reason = self.is_state_partial_parsable(
+                        reader.dbt_version, reader.state_check
+                    )
+                    if is_partial_parsable:
+                        self.partial_parse_snapshot = reader.snapshot()
+                        manifest = reader.read_manifest()
+                        # We don't want to have stale generated_at dates
+                        manifest.metadata.generated_at = datetime.utcnow()
+                        # or invocation_ids
+                        manifest.metadata.invocation_id = get_invocation_id()
+                        return manifest
             except Exception as exc:
                 fire_event(ParsedFileLoadFailed(path=path, exc=exc))
                 reparse_reason = ReparseReason.load_file_failure
@@ -646,6 +768,21 @@ class ManifestLoader:
 
         return None
 
+    def reuse_manifest_for_partial_parse(self, manifest: Manifest) -> Optional[Manifest]:
+        if not flags.PARTIAL_PARSE:
+            fire_event(PartialParsingNotEnabled())
+            return None
+        is_partial_parsable, reparse_reason = self.is_partial_parsable(manifest)
+        if not is_partial_parsable:
+            dbt.tracking.track_partial_parser({'full_reparse_reason': reparse_reason})
+            # As when reading the file, a full reparse rewrites it
+            self.partial_parse_snapshot = None
+            return None
+        manifest.reset_for_partial_parse()
+        manifest.metadata.generated_at = datetime.utcnow()
+        manifest.metadata.invocation_id = get_invocation_id()
+        return manifest
+
     def build_perf_info(self):
         mli = ManifestLoaderInfo(
             is_partial_parse_enabled=flags.PARTIAL_PARSE,
@@ -671,19 +808,23 @@ class ManifestLoader:
         all_projects = self.all_projects
         # if any of these change, we need to reject the parser
 
-        # Create a FileHash of vars string, profile name and target name
-        # This does not capture vars in dbt_project, just the command line
-        # arg vars, but since any changes to that file will cause state_check
-        # to not pass, it doesn't matter.  If we move to more granular checking
-        # of env_vars, that would need to change.
+        # Create a FileHash of the profile name and target name. The command
+        # line arg vars are not included. The names of the vars used in each
+        # file are saved in the file, and files are reparsed if those vars
+        # change, using the hash of each var in cli_vars_hashes.
         vars_hash = FileHash.from_contents(
             '\x00'.join([
-                getattr(config.args, 'vars', '{}') or '{}',
                 getattr(config.args, 'profile', '') or '',
                 getattr(config.args, 'target', '') or '',
                 __version__
             ])
         )
+        cli_vars_hashes = {
+            name: FileHash.from_contents(
+                json.dumps(value, sort_keys=True, default=str)
+            ).checksum
+            for name, value in config.cli_vars.items()
+        }
 
         # Create a FileHash of the env_vars in the project
         key_list = list(config.project_env_vars.keys())
@@ -701,17 +842,25 @@ class ManifestLoader:
             env_var_str += f'{key}:{config.profile_env_vars[key]}|'
         profile_env_vars_hash = FileHash.from_contents(env_var_str)
 
-        # Create a FileHash of the profile file
-        profile_path = os.path.join(flags.PROFILES_DIR, 'profiles.yml')
-        with open(profile_path) as fp:
-            profile_hash = FileHash.from_contents(fp.read())
+        # Create a FileHash of the active profile and target, as rendered, so
+        # that changes to other profiles or targets don't cause a reparse
+        profile_info = config.to_profile_info(serialize_credentials=True)
+        del profile_info['threads']
+        profile_hash = FileHash.from_contents(
+            json.dumps(profile_info, sort_keys=True, default=str)
+        )
 
-        # Create a FileHashes for dbt_project for all dependencies
+        # Create a FileHashes for dbt_project for all dependencies. The
+        # rendered project is included because the project can use vars
+        # from the command line.
         project_hashes = {}
         for name, project in all_projects.items():
             path = os.path.join(project.project_root, 'dbt_project.yml')
             with open(path) as fp:
-                project_hashes[name] = FileHash.from_contents(fp.read())
+                project_hashes[name] = FileHash.from_contents('\x00'.join([
+                    fp.read(),
+                    json.dumps(project.to_project_config(), sort_keys=True, default=str),
+                ]))
 
         # Create the ManifestStateCheck object
         state_check = ManifestStateCheck(
@@ -720,6 +869,7 @@ class ManifestLoader:
             vars_hash=vars_hash,
             profile_hash=profile_hash,
             project_hashes=project_hashes,
+            cli_vars_hashes=cli_vars_hashes,
         )
         return state_check
 
@@ -974,6 +1124,11 @@ def _warn_for_unused_resource_config_paths(
     config.warn_for_unused_resource_config_paths(resource_fqns, disabled_fqns)
 
 
+def _entry_items(section: str, entry):
+    # the values of manifest.disabled are lists of nodes
+    return entry if section == 'disabled' else [entry]
+
+
 def _check_manifest(manifest: Manifest, config: RuntimeConfig) -> None:
     _check_resource_uniqueness(manifest, config)
     _warn_for_unused_resource_config_paths(manifest, config)
@@ -1159,7 +1314,8 @@ def _process_refs_for_node(
         if target_model is None or isinstance(target_model, Disabled):
             # This may raise. Even if it doesn't, we don't want to add
             # this node to the graph b/c there is no destination node
-            node.config.enabled = False
+            # the config can be shared with other nodes
+            node.config = node.config.replace(enabled=False)
             invalid_ref_fail_unless_test(
                 node, target_model_name, target_model_package,
                 disabled=(isinstance(target_model, Disabled))
@@ -1239,7 +1395,8 @@ def _process_sources_for_node(
 
         if target_source is None or isinstance(target_source, Disabled):
             # this folows the same pattern as refs
-            node.config.enabled = False
+            # the config can be shared with other nodes
+            node.config = node.config.replace(enabled=False)
             invalid_source_fail_unless_test(
                 node,
                 source_name,
@@ -0,0 +1,205 @@
+import multiprocessing
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Type, Tuple
+
+from dbt.config import Project, RuntimeConfig
+from dbt.contracts.files import SourceFile
+from dbt.contracts.graph.manifest import Manifest
+from dbt.contracts.graph.parsed import ManifestNodes
+from dbt.parser.analysis import AnalysisParser
+from dbt.parser.base import Parser
+from dbt.parser.models import ModelParser
+from dbt.parser.search import FileBlock
+from dbt.parser.snapshots import SnapshotParser
+
+
+# Only these parsers are run in worker processes. They create nodes from
+# a single sql file, and the only manifest state they update is the nodes,
+# the disabled nodes, the env_vars, the parsing info and their own files.
+PARALLEL_PARSER_TYPES: Tuple[Type[Parser], ...] = (
+    ModelParser, SnapshotParser, AnalysisParser
+)
+
+# Below this number of files the cost of starting the processes is
+# higher than the cost of parsing the files serially
+PARALLEL_PARSE_MIN_FILES = 100
+
+
+@dataclass
+class ParsedFileResult:
+    file_id: str
+    # The nodes created from this file, in the order they were created.
+    # Nodes that are not enabled go in manifest.disabled.
+    nodes: List[ManifestNodes] = field(default_factory=list)
+    env_vars: List[str] = field(default_factory=list)
+    vars: List[str] = field(default_factory=list)
+
+
+@dataclass
+class ParsedShardResult:
+    files: List[ParsedFileResult] = field(default_factory=list)
+    env_vars: Dict[str, str] = field(default_factory=dict)
+    static_analysis_path_count: int = 0
+    static_analysis_parsed_path_count: int = 0
+
+
+@dataclass
+class ParallelParseState:
+    project: Project
+    root_project: RuntimeConfig
+    manifest: Manifest
+    parser_cls: Type[Parser]
+
+
+# The state used by the worker processes. It's set in the parent before the
+# worker processes are forked, so every worker has its own copy of the
+# manifest (including the macros) and the configs without pickling them.
+_parallel_parse_state: Optional[ParallelParseState] = None
+
+
+def get_parallel_context():
+    # The worker processes depend on inheriting the parent's state, so they
+    # need fork, which is only safe on Linux. Elsewhere (including macOS,
+    # where fork is available but unsafe) the work is done serially.
+    if not sys.platform.startswith('linux'):
+        return None
+    return multiprocessing.get_context('fork')
+
+
+def _find_new_node(manifest: Manifest, unique_id: str, file_id: str) -> ManifestNodes:
+    if unique_id in manifest.nodes and manifest.nodes[unique_id].file_id == file_id:
+        return manifest.nodes[unique_id]  # type: ignore
+    disabled = [
+        node for node in manifest.disabled.get(unique_id, [])
+        if node.file_id == file_id
+    ]
+    return disabled[-1]  # type: ignore
+
+
+# This runs in a worker process. Returns None if parsing failed, so the
+# caller can parse the shard serially and report the error the same way
+# a serial parse would.
+def parse_shard(file_ids: List[str]) -> Optional[ParsedShardResult]:
+    state = _parallel_parse_state
+    assert state is not None
+    manifest = state.manifest
+    parser = state.parser_cls(state.project, manifest, state.root_project)
+    parsing_info = manifest._parsing_info
+    assert parsing_info is not None
+    start_path_count = parsing_info.static_analysis_path_count
+    start_parsed_path_count = parsing_info.static_analysis_parsed_path_count
+    start_env_vars = dict(manifest.env_vars)
+
+    result = ParsedShardResult()
+    try:
+        for file_id in file_ids:
+            source_file = manifest.files[file_id]
+            assert isinstance(source_file, SourceFile)
+            start_node_count = len(source_file.nodes)
+            start_env_var_count = len(source_file.env_vars)
+            start_var_count = len(source_file.vars)
+            parser.parse_file(FileBlock(source_file))
+            result.files.append(ParsedFileResult(
+                file_id=file_id,
+                nodes=[
+                    _find_new_node(manifest, unique_id, file_id)
+                    for unique_id in source_file.nodes[start_node_count:]
+                ],
+                env_vars=source_file.env_vars[start_env_var_count:],
+                vars=source_file.vars[start_var_count:],
+            ))
+    except Exception:
+        return None
+
+    result.env_vars = {
+        key: value for key, value in manifest.env_vars.items()
+        if start_env_vars.get(key) != value
+    }
+    result.static_analysis_path_count = (
+        parsing_info.static_analysis_path_count - start_path_count
+    )
+    result.static_analysis_parsed_path_count = (
+        parsing_info.static_analysis_parsed_path_count - start_parsed_path_count
+    )
+    return result
+
+
+def shard_file_ids(file_ids: List[str], shard_count: int) -> List[List[str]]:
+    """Split the file_ids into contiguous shards of nearly equal size"""
+    shard_size, remainder = divmod(len(file_ids), shard_count)
+    shards = []
+    start = 0
+    for index in range(shard_count):
+        end = start + shard_size + (1 if index < remainder else 0)
+        if end > start:
+            shards.append(file_ids[start:end])
+        start = end
+    return shards
+
+
+def merge_file_result(manifest: Manifest, file_result: ParsedFileResult) -> None:
+    source_file = manifest.files[file_result.file_id]
+    assert isinstance(source_file, SourceFile)
+    for var in file_result.env_vars:
+        source_file.env_vars.append(var)
+    for var in file_result.vars:
+        source_file.add_var(var)
+    for node in file_result.nodes:
+        if node.config.enabled:
+            manifest.add_node(source_file, node)
+        else:
+            manifest.add_disabled(source_file, node)
+
+
+def parse_files_in_parallel(
+    project: Project,
+    root_project: RuntimeConfig,
+    manifest: Manifest,
+    parser_cls: Type[Parser],
+    file_ids: List[str],
+    worker_count: int,
+) -> None:
+    """Parse the files in worker processes and merge the results into the
+    manifest, in the order of 'file_ids', so the result is the same as
+    parsing them serially.
+    """
+    global _parallel_parse_state
+    context = get_parallel_context()
+    assert context is not None
+    shards = shard_file_ids(file_ids, worker_count)
+    _parallel_parse_state = ParallelParseState(
+        project=project,
+        root_project=root_project,
+        manifest=manifest,
+        parser_cls=parser_cls,
+    )
+    shard_results: List[Optional[ParsedShardResult]]
+    try:
+        with context.Pool(processes=len(shards)) as pool:
+            shard_results = pool.map(parse_shard, shards)
+    except Exception:
+        # The results couldn't be returned from the workers. Parse
+        # everything in this process instead.
+        shard_results = [None for _ in shards]
+    finally:
+        _parallel_parse_state = None
+
+    assert manifest._parsing_info is not None
+    parser = parser_cls(project, manifest, root_project)
+    for shard, shard_result in zip(shards, shard_results):
+        if shard_result is None:
+            # Something went wrong in the worker. Parse the files in this
+            # process to raise the error.
+            for file_id in shard:
+                parser.parse_file(FileBlock(manifest.files[file_id]))
+            continue
+        for file_result in shard_result.files:
+            merge_file_result(manifest, file_result)
+        manifest.env_vars.update(shard_result.env_vars)
+        manifest._parsing_info.static_analysis_path_count += (
+            shard_result.static_analysis_path_count
+        )
+        manifest._parsing_info.static_analysis_parsed_path_count += (
+            shard_result.static_analysis_parsed_path_count
+        )
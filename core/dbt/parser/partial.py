@@ -1,6 +1,6 @@
 import os
 from copy import deepcopy
-from typing import MutableMapping, Dict, List
+from typing import MutableMapping, Dict, List, Optional, AbstractSet
 from dbt.contracts.graph.manifest import Manifest
 from dbt.contracts.files import (
     AnySourceFile, ParseFileType, parse_file_type_to_parser,
@@ -61,9 +61,16 @@ special_override_macros = [
 # to preserve an unchanged file object in case we need to drop back to a
 # a full parse (such as for certain macro changes)
 class PartialParsing:
-    def __init__(self, saved_manifest: Manifest, new_files: MutableMapping[str, AnySourceFile]):
+    def __init__(
+        self,
+        saved_manifest: Manifest,
+        new_files: MutableMapping[str, AnySourceFile],
+        changed_cli_vars: Optional[AbstractSet[str]] = None,
+    ):
         self.saved_manifest = saved_manifest
         self.new_files = new_files
+        # --vars vars whose values are different than in the saved manifest
+        self.changed_cli_vars: AbstractSet[str] = changed_cli_vars or set()
         self.project_parser_files: Dict = {}
         self.saved_files = self.saved_manifest.files
         self.project_parser_files = {}
@@ -109,9 +116,16 @@ class PartialParsing:
         changed = []
         changed_schema_files = []
         unchanged = []
+        # unchanged files whose stat was updated
+        self.touched_files = []
         for file_id in common:
             if self.saved_files[file_id].checksum == self.new_files[file_id].checksum:
                 unchanged.append(file_id)
+                # The contents are the same, but the file might have been
+                # touched. Save the new stat so it isn't read again next time.
+                if self.saved_files[file_id].stat != self.new_files[file_id].stat:
+                    self.saved_files[file_id].stat = self.new_files[file_id].stat
+                    self.touched_files.append(file_id)
             else:
                 # separate out changed schema files
                 if self.saved_files[file_id].parse_file_type == ParseFileType.Schema:
@@ -292,7 +306,7 @@ class PartialParsing:
     def remove_node_in_saved(self, source_file, unique_id):
         if unique_id in self.saved_manifest.nodes:
             # delete node in saved
-            node = self.saved_manifest.nodes.pop(unique_id)
+            node = self.saved_manifest.remove_node(unique_id)
             self.deleted_manifest.nodes[unique_id] = node
         elif (source_file.file_id in self.disabled_by_file_id and
                 unique_id in self.saved_manifest.disabled):
@@ -304,6 +318,7 @@ class PartialParsing:
             if dis_node:
                 # Remove node from disabled and unique_id from disabled dict if necessary
                 del self.saved_manifest.disabled[unique_id][dis_index]
+                self.deleted_manifest.disabled.setdefault(unique_id, []).append(node)
                 if not self.saved_manifest.disabled[unique_id]:
                     self.saved_manifest.disabled.pop(unique_id)
         else:
@@ -780,6 +795,7 @@ class PartialParsing:
             if not found:
                 pp_dict[key].append(patch)
         schema_file.delete_from_env_vars(key, patch['name'])
+        schema_file.delete_from_vars(key, patch['name'])
         self.add_to_pp_files(schema_file)
 
     # For model, seed, snapshot, analysis schema dictionary keys,
@@ -801,7 +817,7 @@ class PartialParsing:
         if elem_unique_id:
             # might have been already removed
             if elem_unique_id in self.saved_manifest.nodes:
-                node = self.saved_manifest.nodes.pop(elem_unique_id)
+                node = self.saved_manifest.remove_node(elem_unique_id)
                 self.deleted_manifest.nodes[elem_unique_id] = node
                 # need to add the node source_file to pp_files
                 file_id = node.file_id
@@ -823,7 +839,7 @@ class PartialParsing:
         tests = schema_file.get_tests(dict_key, name)
         for test_unique_id in tests:
             if test_unique_id in self.saved_manifest.nodes:
-                node = self.saved_manifest.nodes.pop(test_unique_id)
+                node = self.saved_manifest.remove_node(test_unique_id)
                 self.deleted_manifest.nodes[test_unique_id] = node
         schema_file.remove_tests(dict_key, name)
 
@@ -838,7 +854,7 @@ class PartialParsing:
             if unique_id in self.saved_manifest.sources:
                 source = self.saved_manifest.sources[unique_id]
                 if source.source_name == source_name:
-                    source = self.saved_manifest.sources.pop(unique_id)
+                    source = self.saved_manifest.remove_source(unique_id)
                     self.deleted_manifest.sources[unique_id] = source
                     schema_file.sources.remove(unique_id)
                     self.schedule_referencing_nodes_for_parsing(unique_id)
@@ -868,7 +884,7 @@ class PartialParsing:
             if unique_id in self.saved_manifest.exposures:
                 if exposure.name == exposure_name:
                     self.deleted_manifest.exposures[unique_id] = \
-                        self.saved_manifest.exposures.pop(unique_id)
+                        self.saved_manifest.remove_exposure(unique_id)
                     schema_file.exposures.remove(unique_id)
                     fire_event(PartialParsingDeletedExposure(unique_id=unique_id))
 
@@ -882,7 +898,7 @@ class PartialParsing:
             if unique_id in self.saved_manifest.metrics:
                 if metric.name == metric_name:
                     self.deleted_manifest.metrics[unique_id] = \
-                        self.saved_manifest.metrics.pop(unique_id)
+                        self.saved_manifest.remove_metric(unique_id)
                     schema_file.metrics.remove(unique_id)
                     fire_event(PartialParsingDeletedMetric(id=unique_id))
 
@@ -919,7 +935,7 @@ class PartialParsing:
             self.add_to_pp_files(orig_file)
 
     # This builds a dictionary of files that need to be scheduled for parsing
-    # because the env var has changed.
+    # because an env var or a --vars var that was used in the file has changed.
     # source_files
     #   env_vars_changed_source_files: [file_id, file_id...]
     # schema_files
@@ -950,27 +966,33 @@ class PartialParsing:
         # a list of vars.
         # Create a list of file_ids for source_files that need to be reparsed, and
         # a dictionary of file_ids to yaml_keys to names.
+        # The vars are recorded the same way.
         for source_file in self.saved_files.values():
             file_id = source_file.file_id
-            if not source_file.env_vars:
-                continue
+            used_vars = [(source_file.env_vars, changed_vars)]
+            if self.changed_cli_vars:
+                used_vars.append((source_file.vars, self.changed_cli_vars))
             if source_file.parse_file_type == ParseFileType.Schema:
-                for yaml_key in source_file.env_vars.keys():
-                    for name in source_file.env_vars[yaml_key].keys():
-                        for env_var in source_file.env_vars[yaml_key][name]:
-                            if env_var in changed_vars:
-                                if file_id not in env_vars_changed_schema_files:
-                                    env_vars_changed_schema_files[file_id] = {}
-                                if yaml_key not in env_vars_changed_schema_files[file_id]:
-                                    env_vars_changed_schema_files[file_id][yaml_key] = []
-                                if name not in env_vars_changed_schema_files[file_id][yaml_key]:
-                                    env_vars_changed_schema_files[file_id][yaml_key].append(name)
-                                break  # if one env_var is changed we can stop
+                for file_vars, changed in used_vars:
+                    for yaml_key in file_vars.keys():
+                        for name in file_vars[yaml_key].keys():
+                            for var in file_vars[yaml_key][name]:
+                                if var in changed:
+                                    if file_id not in env_vars_changed_schema_files:
+                                        env_vars_changed_schema_files[file_id] = {}
+                                    changed_names = env_vars_changed_schema_files[file_id]
+                                    if yaml_key not in changed_names:
+                                        changed_names[yaml_key] = []
+                                    if name not in changed_names[yaml_key]:
+                                        changed_names[yaml_key].append(name)
+                                    break  # if one var is changed we can stop
 
             else:
-                for env_var in source_file.env_vars:
-                    if env_var in changed_vars:
-                        env_vars_changed_source_files.append(file_id)
-                        break  # if one env_var is changed we can stop
+                if any(
+                    var in changed
+                    for file_vars, changed in used_vars
+                    for var in file_vars
+                ):
+                    env_vars_changed_source_files.append(file_id)
 
         return (env_vars_changed_source_files, env_vars_changed_schema_files)
@@ -0,0 +1,413 @@
+import mmap
+import os
+import struct
+import zlib
+from dataclasses import dataclass, field
+from typing import AbstractSet, Any, Dict, List, Optional, Set, Tuple
+
+import msgpack  # type: ignore
+from mashumaro.serializer.msgpack import DEFAULT_DICT_PARAMS
+
+from dbt.contracts.files import FileStat
+from dbt.contracts.graph.manifest import Manifest, ManifestStateCheck
+from dbt.exceptions import InternalException
+
+
+# The layout of partial_parse.msgpack is:
+#
+#   magic | format version (1 byte) | header length (4 bytes) | header | sections
+#   [delta segment]*
+#
+# The header is a small msgpack dictionary with the dbt version, the
+# ManifestStateCheck and the offset and length of each section. Each
+# section is the msgpack encoding of one Manifest attribute ('nodes',
+# 'macros', 'files', etc), so the state check can be read without
+# decoding the rest of the file, and each section can be decoded
+# independently of the others.
+#
+# After a partial parse only the entries that partial parsing added,
+# replaced or removed are appended, as a delta segment:
+#
+#   delta magic | header length | body length | crc32 | header | body
+#
+# The delta header has the same shape as the file header, and each delta
+# section is either {'replace': value} or, for dictionaries,
+# {'changed': {key: value}, 'deleted': [key]}. Deltas are applied in
+# order when a section is read. A segment that's incomplete or doesn't
+# match its checksum (because the process was killed while appending it)
+# ends the file, so the file is always read as the result of the last
+# complete write.
+PARTIAL_PARSE_MAGIC = b'DBTPP'
+PARTIAL_PARSE_FORMAT_VERSION = 2
+_FORMAT_VERSION = struct.Struct('<B')
+_HEADER_LENGTH = struct.Struct('<I')
+_PREAMBLE_LENGTH = len(PARTIAL_PARSE_MAGIC) + _FORMAT_VERSION.size + _HEADER_LENGTH.size
+
+PARTIAL_PARSE_DELTA_MAGIC = b'DBTPD'
+_DELTA_PREAMBLE = struct.Struct('<III')
+_DELTA_PREAMBLE_LENGTH = len(PARTIAL_PARSE_DELTA_MAGIC) + _DELTA_PREAMBLE.size
+
+# The file is rewritten from scratch instead of appending another delta
+# when there are this many deltas already...
+PARTIAL_PARSE_MAX_DELTAS = 20
+# ...or when the deltas would be larger than this fraction of the sections
+# they're applied to.
+PARTIAL_PARSE_MAX_DELTA_RATIO = 0.5
+
+# The Manifest attributes that are dictionaries of entries keyed by
+# unique_id or file_id, which a delta updates entry by entry. The other
+# attributes are small and are replaced in each delta.
+ENTRY_SECTIONS = (
+    'nodes', 'sources', 'macros', 'docs', 'exposures', 'metrics', 'files', 'disabled'
+)
+
+
+def _pack(value: Any) -> bytes:
+    return msgpack.packb(value, use_bin_type=True)
+
+
+def _unpack(data) -> Any:
+    return msgpack.unpackb(data, raw=False)
+
+
+@dataclass
+class PartialParseSnapshot:
+    """Where a partial parse file ends and how large its deltas are, as
+    of the last time it was read or written. A later write uses this to
+    decide whether it can append to the file.
+    """
+    path: str
+    stat: FileStat
+    end: int
+    base_length: int
+    delta_count: int = 0
+    delta_length: int = 0
+
+
+@dataclass
+class PartialParseChanges:
+    """The keys of the entries in each of the ENTRY_SECTIONS that were
+    added or changed ('changed') or removed ('deleted') since the manifest
+    was last written. A removed key that's in the manifest again was
+    replaced, and is written as changed.
+    """
+    changed: Dict[str, Set[str]] = field(default_factory=dict)
+    deleted: Dict[str, Set[str]] = field(default_factory=dict)
+
+    def add_changed(self, name: str, keys: AbstractSet[str]) -> None:
+        self.changed.setdefault(name, set()).update(keys)
+
+    def add_deleted(self, name: str, keys: AbstractSet[str]) -> None:
+        self.deleted.setdefault(name, set()).update(keys)
+
+
+def _pack_sections(sections: Dict[str, Any]) -> Tuple[Dict[str, List[int]], bytes]:
+    offsets: Dict[str, List[int]] = {}
+    blobs: List[bytes] = []
+    offset = 0
+    for name, value in sections.items():
+        blob = _pack(value)
+        offsets[name] = [offset, len(blob)]
+        blobs.append(blob)
+        offset += len(blob)
+    return offsets, b''.join(blobs)
+
+
+def _pack_header(
+    manifest: Manifest, offsets: Dict[str, List[int]], state_check: Dict[str, Any]
+) -> bytes:
+    return _pack({
+        'dbt_version': manifest.metadata.dbt_version,
+        'state_check': state_check,
+        'sections': offsets,
+    })
+
+
+def serialize_partial_parse_manifest(manifest: Manifest) -> bytes:
+    sections = manifest.to_dict(**DEFAULT_DICT_PARAMS)
+    offsets, body = _pack_sections(sections)
+    header = _pack_header(manifest, offsets, sections['state_check'])
+    return b''.join([
+        PARTIAL_PARSE_MAGIC,
+        _FORMAT_VERSION.pack(PARTIAL_PARSE_FORMAT_VERSION),
+        _HEADER_LENGTH.pack(len(header)),
+        header,
+        body,
+    ])
+
+
+def delta_sections(manifest: Manifest, changes: PartialParseChanges) -> Dict[str, Any]:
+    """Return the delta sections that write 'changes' to a file that has
+    the previous version of 'manifest'. Only the changed entries are
+    serialized.
+    """
+    entries: Dict[str, Any] = {}
+    deleted: Dict[str, List[str]] = {}
+    for name in ENTRY_SECTIONS:
+        current = getattr(manifest, name)
+        keys = changes.changed.get(name, set()) | changes.deleted.get(name, set())
+        entries[name] = {key: current[key] for key in sorted(keys) if key in current}
+        deleted[name] = sorted(key for key in changes.deleted.get(name, ()) if key not in current)
+    # The changed entries are serialized as part of a manifest that has
+    # only those entries, so they're written exactly as they would be in
+    # a full write.
+    changed = Manifest(
+        selectors=manifest.selectors,
+        metadata=manifest.metadata,
+        flat_graph=manifest.flat_graph,
+        state_check=manifest.state_check,
+        env_vars=manifest.env_vars,
+        **entries,
+    )
+    delta: Dict[str, Any] = {}
+    for name, value in changed.to_dict(**DEFAULT_DICT_PARAMS).items():
+        if name not in ENTRY_SECTIONS:
+            delta[name] = {'replace': value}
+        elif value or deleted[name]:
+            delta[name] = {'changed': value, 'deleted': deleted[name]}
+    return delta
+
+
+def apply_delta_section(value: Any, delta_section: Dict[str, Any]) -> Any:
+    if 'replace' in delta_section:
+        return delta_section['replace']
+    value = dict(value)
+    value.update(delta_section['changed'])
+    for key in delta_section['deleted']:
+        value.pop(key, None)
+    return value
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    # Write to a temporary file in the same directory and rename it over
+    # the old file, so the file is never partially written.
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        with os.fdopen(fd, 'wb') as fp:
+            fp.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _can_append(path: str, previous: Optional[PartialParseSnapshot]) -> bool:
+    if previous is None or previous.path != path:
+        return False
+    if previous.delta_count >= PARTIAL_PARSE_MAX_DELTAS:
+        return False
+    try:
+        # if something else has written the file since it was read, the
+        # delta would be applied to the wrong sections.
+        return FileStat.from_path(path) == previous.stat
+    except OSError:
+        return False
+
+
+def _append_delta(
+    manifest: Manifest,
+    previous: PartialParseSnapshot,
+    delta: Dict[str, Any],
+) -> Optional[PartialParseSnapshot]:
+    offsets, body = _pack_sections(delta)
+    header = _pack_header(manifest, offsets, delta['state_check']['replace'])
+    checksum = zlib.crc32(header + body)
+    segment = b''.join([
+        PARTIAL_PARSE_DELTA_MAGIC,
+        _DELTA_PREAMBLE.pack(len(header), len(body), checksum),
+        header,
+        body,
+    ])
+    delta_length = previous.delta_length + len(segment)
+    if delta_length > previous.base_length * PARTIAL_PARSE_MAX_DELTA_RATIO:
+        return None
+
+    with open(previous.path, 'r+b') as fp:
+        # drop anything after the last complete segment
+        fp.truncate(previous.end)
+        fp.seek(previous.end)
+        fp.write(segment)
+    return PartialParseSnapshot(
+        path=previous.path,
+        stat=FileStat.from_path(previous.path),
+        end=previous.end + len(segment),
+        base_length=previous.base_length,
+        delta_count=previous.delta_count + 1,
+        delta_length=delta_length,
+    )
+
+
+def write_partial_parse_manifest(
+    path: str,
+    manifest: Manifest,
+    previous: Optional[PartialParseSnapshot] = None,
+    changes: Optional[PartialParseChanges] = None,
+) -> PartialParseSnapshot:
+    """Write the manifest to 'path'. If 'previous' is the snapshot of the
+    file that's there now and 'changes' has what changed in the manifest
+    since then, only the changed entries are appended to it, unless there
+    are enough deltas already that the file should be compacted.
+    """
+    if changes is not None and _can_append(path, previous):
+        assert previous is not None
+        snapshot = _append_delta(manifest, previous, delta_sections(manifest, changes))
+        if snapshot is not None:
+            return snapshot
+
+    data = serialize_partial_parse_manifest(manifest)
+    _write_atomic(path, data)
+    return PartialParseSnapshot(
+        path=path,
+        stat=FileStat.from_path(path),
+        end=len(data),
+        base_length=len(data),
+    )
+
+
+@dataclass
+class _DeltaSegment:
+    header: Dict[str, Any]
+    body_start: int
+
+
+class PartialParseReader:
+    """Read a partial parse file written by write_partial_parse_manifest.
+
+    The file is memory-mapped, only the headers are decoded when it's
+    opened, and sections are decoded the first time they're requested.
+    """
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._fp = open(path, 'rb')
+        try:
+            self._stat = FileStat.from_path(path)
+            self._data = mmap.mmap(self._fp.fileno(), 0, access=mmap.ACCESS_READ)
+            self._base_header, self._data_start = self._read_header()
+            self._base_end = self._data_start + sum(
+                length for _, length in self._base_header['sections'].values()
+            )
+            self._deltas, self.end = self._read_deltas(self._base_end)
+        except Exception:
+            self.close()
+            raise
+        self._decoded: Dict[str, Any] = {}
+
+    def _read_header(self) -> Tuple[Dict[str, Any], int]:
+        magic_end = len(PARTIAL_PARSE_MAGIC)
+        if self._data[:magic_end] != PARTIAL_PARSE_MAGIC:
+            raise InternalException(f'{self.path} is not a partial parse file')
+        version_end = magic_end + _FORMAT_VERSION.size
+        (version,) = _FORMAT_VERSION.unpack(self._data[magic_end:version_end])
+        if version != PARTIAL_PARSE_FORMAT_VERSION:
+            raise InternalException(
+                f'{self.path} has partial parse format version {version}, '
+                f'expected {PARTIAL_PARSE_FORMAT_VERSION}'
+            )
+        (header_length,) = _HEADER_LENGTH.unpack(self._data[version_end:_PREAMBLE_LENGTH])
+        data_start = _PREAMBLE_LENGTH + header_length
+        if data_start > len(self._data):
+            raise InternalException(f'{self.path} is truncated')
+        header = _unpack(self._data[_PREAMBLE_LENGTH:data_start])
+        return header, data_start
+
+    def _read_deltas(self, start: int) -> Tuple[List[_DeltaSegment], int]:
+        deltas: List[_DeltaSegment] = []
+        position = start
+        magic_length = len(PARTIAL_PARSE_DELTA_MAGIC)
+        while position + _DELTA_PREAMBLE_LENGTH <= len(self._data):
+            if self._data[position:position + magic_length] != PARTIAL_PARSE_DELTA_MAGIC:
+                break
+            header_length, body_length, checksum = _DELTA_PREAMBLE.unpack(
+                self._data[position + magic_length:position + _DELTA_PREAMBLE_LENGTH]
+            )
+            header_start = position + _DELTA_PREAMBLE_LENGTH
+            body_start = header_start + header_length
+            end = body_start + body_length
+            if end > len(self._data):
+                break
+            if zlib.crc32(self._data[header_start:end]) != checksum:
+                break
+            deltas.append(_DeltaSegment(
+                header=_unpack(self._data[header_start:body_start]),
+                body_start=body_start,
+            ))
+            position = end
+        return deltas, position
+
+    @property
+    def header(self) -> Dict[str, Any]:
+        if self._deltas:
+            return self._deltas[-1].header
+        return self._base_header
+
+    @property
+    def dbt_version(self) -> str:
+        return self.header['dbt_version']
+
+    @property
+    def state_check(self) -> ManifestStateCheck:
+        return ManifestStateCheck.from_dict(self.header['state_check'])
+
+    @property
+    def section_names(self) -> List[str]:
+        names = list(self._base_header['sections'])
+        for delta in self._deltas:
+            names.extend(name for name in delta.header['sections'] if name not in names)
+        return names
+
+    def _unpack_at(self, start: int, offset: int, length: int) -> Any:
+        start += offset
+        return _unpack(self._data[start:start + length])
+
+    def read_section(self, name: str) -> Any:
+        if name not in self._decoded:
+            if name not in self.section_names:
+                raise InternalException(f'No section named {name} in {self.path}')
+            value = None
+            if name in self._base_header['sections']:
+                value = self._unpack_at(
+                    self._data_start, *self._base_header['sections'][name]
+                )
+            for delta in self._deltas:
+                if name in delta.header['sections']:
+                    value = apply_delta_section(
+                        value,
+                        self._unpack_at(delta.body_start, *delta.header['sections'][name]),
+                    )
+            self._decoded[name] = value
+        return self._decoded[name]
+
+    def read_sections(self) -> Dict[str, Any]:
+        return {name: self.read_section(name) for name in self.section_names}
+
+    def read_manifest(self) -> Manifest:
+        return Manifest.from_dict(self.read_sections(), **DEFAULT_DICT_PARAMS)
+
+    def snapshot(self) -> PartialParseSnapshot:
+        return PartialParseSnapshot(
+            path=self.path,
+            stat=self._stat,
+            end=self.end,
+            base_length=self._base_end,
+            delta_count=len(self._deltas),
+            delta_length=self.end - self._base_end,
+        )
+
+    def close(self) -> None:
+        data: Optional[mmap.mmap] = getattr(self, '_data', None)
+        if data is not None:
+            data.close()
+        self._fp.close()
+
+    def __enter__(self) -> 'PartialParseReader':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+def read_partial_parse_manifest(path: str) -> Manifest:
+    with PartialParseReader(path) as reader:
+        return reader.read_manifest()
@@ -1,38 +1,66 @@
+import os
 import pathlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+import dbt.flags as flags
 from dbt.clients.system import load_file_contents
 from dbt.contracts.files import (
-    FilePath, ParseFileType, SourceFile, FileHash, AnySourceFile, SchemaSourceFile
+    FilePath, ParseFileType, SourceFile, FileHash, FileStat, AnySourceFile, SchemaSourceFile
 )
 
 from dbt.parser.schemas import yaml_from_file, schema_file_keys, check_format_version
+from dbt.events.functions import fire_event
+from dbt.events.types import SystemErrorRetrievingModTime
 from dbt.exceptions import ParsingException
-from dbt.parser.search import filesystem_search
-from typing import Optional
+from typing import Optional, Dict, List, Tuple
 
 
-# This loads the files contents and creates the SourceFile object
+# Returns True if the file is known to be unchanged since it was saved in
+# the partial parsing manifest, based on its size, modification time and
+# inode. This is skipped with --strict-partial-parse.
+def file_unchanged(
+    source_file: AnySourceFile, saved_files, stat: Optional[FileStat]
+) -> bool:
+    if flags.STRICT_PARTIAL_PARSE or not saved_files:
+        return False
+    if source_file.file_id not in saved_files:
+        return False
+    old_source_file = saved_files[source_file.file_id]
+    if old_source_file.parse_file_type != source_file.parse_file_type:
+        return False
+    if stat is not None and old_source_file.stat is not None:
+        return stat == old_source_file.stat
+    # Fall back to the modification time for schema files
+    return (
+        source_file.parse_file_type == ParseFileType.Schema and
+        source_file.path.modification_time != 0.0 and
+        old_source_file.path.modification_time == source_file.path.modification_time
+    )
+
+
+# This loads the files contents and creates the SourceFile object.
+# If the file hasn't changed since the saved manifest, it isn't read,
+# and the contents are only loaded if the file needs to be parsed.
 def load_source_file(
         path: FilePath, parse_file_type: ParseFileType,
-        project_name: str, saved_files,) -> Optional[AnySourceFile]:
+        project_name: str, saved_files,
+        stat: Optional[FileStat] = None) -> Optional[AnySourceFile]:
 
     sf_cls = SchemaSourceFile if parse_file_type == ParseFileType.Schema else SourceFile
     source_file = sf_cls(path=path, checksum=FileHash.empty(),
-                         parse_file_type=parse_file_type, project_name=project_name)
+                         parse_file_type=parse_file_type, project_name=project_name,
+                         stat=stat)
 
-    skip_loading_schema_file = False
-    if (parse_file_type == ParseFileType.Schema and
-            saved_files and source_file.file_id in saved_files):
+    if file_unchanged(source_file, saved_files, stat):
         old_source_file = saved_files[source_file.file_id]
-        if (source_file.path.modification_time != 0.0 and
-                old_source_file.path.modification_time == source_file.path.modification_time):
-            source_file.checksum = old_source_file.checksum
+        source_file.checksum = old_source_file.checksum
+        if isinstance(source_file, SchemaSourceFile):
             source_file.dfy = old_source_file.dfy
-            skip_loading_schema_file = True
+        return source_file
 
-    if not skip_loading_schema_file:
-        file_contents = load_file_contents(path.absolute_path, strip=False)
-        source_file.checksum = FileHash.from_contents(file_contents)
-        source_file.contents = file_contents.strip()
+    file_contents = load_file_contents(path.absolute_path, strip=False)
+    source_file.checksum = FileHash.from_contents(file_contents)
+    source_file.contents = file_contents.strip()
 
     if parse_file_type == ParseFileType.Schema and source_file.contents:
         dfy = yaml_from_file(source_file)
@@ -44,6 +72,22 @@ def load_source_file(
     return source_file
 
 
+# The contents of files that were unchanged since the saved manifest are not
+# loaded by 'load_source_file'. Load them for the files that will be parsed.
+def load_deferred_contents(files, project_parser_files):
+    for parser_files in project_parser_files.values():
+        for file_ids in parser_files.values():
+            for file_id in file_ids:
+                source_file = files[file_id]
+                if (source_file.contents is not None or
+                        source_file.parse_file_type == ParseFileType.Schema):
+                    continue
+                file_contents = load_file_contents(
+                    source_file.path.absolute_path, strip=False
+                )
+                source_file.contents = file_contents.strip()
+
+
 # Do some minimal validation of the yaml in a schema file.
 # Check version, that key values are lists and that each element in
 # the lists has a 'name' key
@@ -68,108 +112,171 @@ def validate_yaml(file_path, dct):
 
 
 # Special processing for big seed files
-def load_seed_source_file(match: FilePath, project_name) -> SourceFile:
+def load_seed_source_file(
+    match: FilePath, project_name, saved_files=None, stat: Optional[FileStat] = None
+) -> SourceFile:
     if match.seed_too_large():
         # We don't want to calculate a hash of this file. Use the path.
         source_file = SourceFile.big_seed(match)
     else:
-        file_contents = load_file_contents(match.absolute_path, strip=False)
-        checksum = FileHash.from_contents(file_contents)
-        source_file = SourceFile(path=match, checksum=checksum)
+        source_file = SourceFile(path=match, checksum=FileHash.empty())
+        source_file.parse_file_type = ParseFileType.Seed
+        source_file.project_name = project_name
+        if file_unchanged(source_file, saved_files, stat):
+            source_file.checksum = saved_files[source_file.file_id].checksum
+        else:
+            file_contents = load_file_contents(match.absolute_path, strip=False)
+            source_file.checksum = FileHash.from_contents(file_contents)
         source_file.contents = ''
     source_file.parse_file_type = ParseFileType.Seed
     source_file.project_name = project_name
+    source_file.stat = stat
     return source_file
 
 
-# Use the FilesystemSearcher to get a bunch of FilePaths, then turn
-# them into a bunch of FileSource objects
-def get_source_files(project, paths, extension, parse_file_type, saved_files):
-    # file path list
-    fp_list = filesystem_search(
-        project, paths, extension
-    )
-    # file block list
-    fb_list = []
-    for fp in fp_list:
-        if parse_file_type == ParseFileType.Seed:
-            fb_list.append(load_seed_source_file(fp, project.project_name))
-        # singular tests live in /tests but only generic tests live
-        # in /tests/generic so we want to skip those
-        else:
-            if parse_file_type == ParseFileType.SingularTest:
-                path = pathlib.Path(fp.relative_path)
-                if path.parts[0] == 'generic':
-                    continue
-            file = load_source_file(fp, parse_file_type, project.project_name, saved_files)
-            # only append the list if it has contents. added to fix #3568
-            if file:
-                fb_list.append(file)
-    return fb_list
+# The number of threads used to read and hash project files. Reading
+# and hashing release the GIL, so this is mostly bounded by disk.
+READ_FILES_MAX_WORKERS = 8
 
 
-def read_files_for_parser(project, files, dirs, extension, parse_ft, saved_files):
-    parser_files = []
-    source_files = get_source_files(
-        project, dirs, extension, parse_ft, saved_files
-    )
-    for sf in source_files:
-        files[sf.file_id] = sf
-        parser_files.append(sf.file_id)
-    return parser_files
+# The files read for each parser: (parser name, Project attribute with the
+# relative directories to search, file extensions, ParseFileType). The
+# order of this list determines the order of the files in parser_files.
+project_file_types: List[Tuple[str, str, Tuple[str, ...], ParseFileType]] = [
+    ('MacroParser', 'macro_paths', ('.sql',), ParseFileType.Macro),
+    ('ModelParser', 'model_paths', ('.sql',), ParseFileType.Model),
+    ('SnapshotParser', 'snapshot_paths', ('.sql',), ParseFileType.Snapshot),
+    ('AnalysisParser', 'analysis_paths', ('.sql',), ParseFileType.Analysis),
+    ('SingularTestParser', 'test_paths', ('.sql',), ParseFileType.SingularTest),
+    # all generic tests within /tests must be nested under a /generic subfolder
+    ('GenericTestParser', 'generic_test_paths', ('.sql',), ParseFileType.GenericTest),
+    ('SeedParser', 'seed_paths', ('.csv',), ParseFileType.Seed),
+    ('DocumentationParser', 'docs_paths', ('.md',), ParseFileType.Documentation),
+    ('SchemaParser', 'all_source_paths', ('.yml', '.yaml'), ParseFileType.Schema),
+]
 
 
-# This needs to read files for multiple projects, so the 'files'
-# dictionary needs to be passed in. What determines the order of
-# the various projects? Is the root project always last? Do the
-# non-root projects need to be done separately in order?
-def read_files(project, files, parser_files, saved_files):
+# A file found by 'discover_files', with its stat if it could be retrieved
+DiscoveredFile = Tuple[FilePath, ParseFileType, Optional[FileStat]]
 
-    project_files = {}
 
-    project_files['MacroParser'] = read_files_for_parser(
-        project, files, project.macro_paths, '.sql', ParseFileType.Macro, saved_files
+# This is equivalent to matching the file name against the pattern
+# '[!.#~]*<extension>' case-insensitively, like 'filesystem_search' does
+def file_name_matches(file_name: str, extension: str) -> bool:
+    return (
+        len(file_name) > len(extension) and
+        file_name[0] not in '.#~' and
+        file_name.lower().endswith(extension)
     )
 
-    project_files['ModelParser'] = read_files_for_parser(
-        project, files, project.model_paths, '.sql', ParseFileType.Model, saved_files
-    )
 
-    project_files['SnapshotParser'] = read_files_for_parser(
-        project, files, project.snapshot_paths, '.sql', ParseFileType.Snapshot, saved_files
-    )
+# Walk a directory and return the paths of all of the files in it, relative
+# to the directory, in os.walk order.
+def walk_directory(absolute_path: str) -> List[str]:
+    relative_paths = []
+    for current_path, _, local_files in os.walk(absolute_path):
+        relative_dir = os.path.relpath(current_path, absolute_path)
+        for local_file in local_files:
+            if relative_dir == '.':
+                relative_paths.append(local_file)
+            else:
+                relative_paths.append(os.path.join(relative_dir, local_file))
+    return relative_paths
 
-    project_files['AnalysisParser'] = read_files_for_parser(
-        project, files, project.analysis_paths, '.sql', ParseFileType.Analysis, saved_files
-    )
 
-    project_files['SingularTestParser'] = read_files_for_parser(
-        project, files, project.test_paths, '.sql', ParseFileType.SingularTest, saved_files
-    )
+# Find all of the files in a project that will be parsed, classified by
+# parser. Every searched directory is walked only once, no matter how many
+# parsers look in it, and only the files that match are stat'ed.
+def discover_files(project) -> Dict[str, List[DiscoveredFile]]:
+    root = project.project_root
+    walked_dirs: Dict[str, List[str]] = {}
+    file_stats: Dict[str, Optional[FileStat]] = {}
 
-    # all generic tests within /tests must be nested under a /generic subfolder
-    project_files['GenericTestParser'] = read_files_for_parser(
-        project, files, project.generic_test_paths, '.sql', ParseFileType.GenericTest, saved_files
-    )
+    discovered: Dict[str, List[DiscoveredFile]] = {}
+    for parser_name, paths_attr, extensions, parse_file_type in project_file_types:
+        relative_dirs = getattr(project, paths_attr)
+        discovered_files = []
+        for extension in extensions:
+            for relative_dir in relative_dirs:
+                absolute_dir = os.path.normpath(os.path.join(root, relative_dir))
+                if absolute_dir not in walked_dirs:
+                    walked_dirs[absolute_dir] = walk_directory(absolute_dir)
+                for relative_path in walked_dirs[absolute_dir]:
+                    if not file_name_matches(os.path.basename(relative_path), extension):
+                        continue
+                    # singular tests live in /tests but only generic tests live
+                    # in /tests/generic so we want to skip those
+                    if parse_file_type == ParseFileType.SingularTest:
+                        if pathlib.Path(relative_path).parts[0] == 'generic':
+                            continue
+                    absolute_path = os.path.join(absolute_dir, relative_path)
+                    if absolute_path not in file_stats:
+                        try:
+                            file_stats[absolute_path] = FileStat.from_path(absolute_path)
+                        except OSError:
+                            fire_event(SystemErrorRetrievingModTime(path=absolute_path))
+                            file_stats[absolute_path] = None
+                    stat = file_stats[absolute_path]
+                    fp = FilePath(
+                        searched_path=relative_dir,
+                        relative_path=relative_path,
+                        modification_time=stat.mtime_ns / 1e9 if stat else 0.0,
+                        project_root=root,
+                    )
+                    discovered_files.append((fp, parse_file_type, stat))
+        discovered[parser_name] = discovered_files
+    return discovered
 
-    project_files['SeedParser'] = read_files_for_parser(
-        project, files, project.seed_paths, '.csv', ParseFileType.Seed, saved_files
-    )
 
-    project_files['DocumentationParser'] = read_files_for_parser(
-        project, files, project.docs_paths, '.md', ParseFileType.Documentation, saved_files
-    )
+def load_discovered_file(
+    discovered_file: DiscoveredFile, project_name: str, saved_files
+) -> Optional[AnySourceFile]:
+    fp, parse_file_type, stat = discovered_file
+    if parse_file_type == ParseFileType.Seed:
+        return load_seed_source_file(fp, project_name, saved_files, stat)
+    return load_source_file(fp, parse_file_type, project_name, saved_files, stat)
 
-    project_files['SchemaParser'] = read_files_for_parser(
-        project, files, project.all_source_paths, '.yml', ParseFileType.Schema, saved_files
-    )
 
-    # Also read .yaml files for schema files. Might be better to change
-    # 'read_files_for_parser' accept an array in the future.
-    yaml_files = read_files_for_parser(
-        project, files, project.all_source_paths, '.yaml', ParseFileType.Schema, saved_files
-    )
-    project_files['SchemaParser'].extend(yaml_files)
+# This needs to read files for multiple projects, so the 'files'
+# dictionary needs to be passed in. What determines the order of
+# the various projects? Is the root project always last? Do the
+# non-root projects need to be done separately in order?
+def read_files(project, files, parser_files, saved_files, perf_info=None):
+
+    start_discover = time.perf_counter()
+    discovered = discover_files(project)
+    discover_elapsed = time.perf_counter() - start_discover
+
+    # Read and hash the files on a thread pool. 'map' returns the
+    # results in order, so 'files' and 'parser_files' are deterministic.
+    start_load = time.perf_counter()
+    to_load = [
+        (parser_name, discovered_file)
+        for parser_name, discovered_files in discovered.items()
+        for discovered_file in discovered_files
+    ]
+    with ThreadPoolExecutor(max_workers=READ_FILES_MAX_WORKERS) as executor:
+        loaded = executor.map(
+            lambda item: load_discovered_file(item[1], project.project_name, saved_files),
+            to_load,
+        )
+        project_files: Dict[str, List[str]] = {
+            parser_name: [] for parser_name in discovered
+        }
+        for (parser_name, _), source_file in zip(to_load, loaded):
+            # only append the list if it has contents. added to fix #3568
+            if source_file:
+                files[source_file.file_id] = source_file
+                project_files[parser_name].append(source_file.file_id)
+    load_elapsed = time.perf_counter() - start_load
+
+    if perf_info is not None:
+        perf_info.discover_files_elapsed = (
+            (perf_info.discover_files_elapsed or 0.0) + discover_elapsed
+        )
+        perf_info.load_files_elapsed = (
+            (perf_info.load_files_elapsed or 0.0) + load_elapsed
+        )
 
     # Store the parser files for this particular project
     parser_files[project.project_name] = project_files
@@ -24,6 +24,7 @@ from dbt.events.types import (
     NodeConnectionReleaseError, PrintDebugStackTrace, SkippingDetails, PrintSkipBecauseError,
     NodeCompiling, NodeExecuting
 )
+from .compile_pool import CompilePool
 from .printer import print_run_result_error
 
 from dbt.adapters.factory import register_adapter
@@ -191,6 +192,8 @@ class BaseRunner(metaclass=ABCMeta):
 
         self.skip = False
         self.skip_cause: Optional[RunResult] = None
+        # set by the task when it compiles nodes in worker processes
+        self.compile_pool: Optional[CompilePool] = None
 
     @abstractmethod
     def compile(self, manifest: Manifest) -> Any:
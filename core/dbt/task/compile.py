@@ -31,6 +31,10 @@ class CompileRunner(BaseRunner):
         )
 
     def compile(self, manifest):
+        if self.compile_pool is not None:
+            compiled_node = self.compile_pool.get_compiled_node(self.node.unique_id, manifest)
+            if compiled_node is not None:
+                return compiled_node
         compiler = self.adapter.get_compiler()
         return compiler.compile_node(self.node, manifest, {})
 
@@ -0,0 +1,199 @@
+import re
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set
+
+from dbt.adapters.factory import get_adapter
+from dbt.config import RuntimeConfig
+from dbt.contracts.graph.compiled import NonSourceCompiledNode
+from dbt.contracts.graph.manifest import Manifest
+from dbt.exceptions import InternalException
+from dbt.node_types import NodeType
+from dbt.parser.parallel import get_parallel_context
+
+
+# The resource types that CompileRunner.compile compiles
+POOL_RESOURCE_TYPES = (NodeType.Model, NodeType.Test, NodeType.Snapshot, NodeType.Analysis)
+
+# The calls that query the database, and the adapter methods other than
+# these, which can read the relations cache. The results depend on the
+# nodes that already ran, so nodes whose sql or macros make them are
+# compiled by the thread that runs them, after their parents ran.
+INTROSPECTIVE_CALLS = re.compile(
+    r'\b(?:run_query|statement|load_relation|load_result)\s*\('
+    r'|\badapter\s*\.\s*(?!(?:dispatch|quote|quote_as_configured|quote_seed_column|'
+    r'type|Relation|Column)\b)\w+'
+)
+
+_WORD = re.compile(r'\w+')
+
+
+def _macros_by_name(manifest: Manifest) -> Dict[str, List[str]]:
+    # The macros of every package, also by the name that adapter.dispatch
+    # finds them by, so a name can only match too many macros
+    macros: Dict[str, List[str]] = {}
+    for unique_id, macro in manifest.macros.items():
+        macros.setdefault(macro.name, []).append(unique_id)
+        if '__' in macro.name:
+            macros.setdefault(macro.name.split('__', 1)[1], []).append(unique_id)
+    return macros
+
+
+def find_introspective_nodes(manifest: Manifest, unique_ids: Iterable[str]) -> Set[str]:
+    """Return the nodes whose sql, or a macro that they can call, has one
+    of the INTROSPECTIVE_CALLS. The macros of a node are the ones in its
+    depends_on and the ones named in its sql, which include the macros that
+    weren't called when it was parsed, and the macros that those depend on.
+    """
+    macros_by_name = _macros_by_name(manifest)
+    introspective_macros: Dict[str, bool] = {}
+
+    def is_introspective_macro(unique_id: str) -> bool:
+        if unique_id not in introspective_macros:
+            introspective_macros[unique_id] = bool(
+                INTROSPECTIVE_CALLS.search(manifest.macros[unique_id].macro_sql)
+            )
+        return introspective_macros[unique_id]
+
+    introspective = set()
+    for unique_id in unique_ids:
+        node = manifest.nodes[unique_id]
+        if INTROSPECTIVE_CALLS.search(node.raw_sql):
+            introspective.add(unique_id)
+            continue
+        stack = list(node.depends_on.macros)
+        for word in set(_WORD.findall(node.raw_sql)):
+            stack.extend(macros_by_name.get(word, ()))
+        seen = set()
+        while stack:
+            macro_id = stack.pop()
+            if macro_id in seen or macro_id not in manifest.macros:
+                continue
+            seen.add(macro_id)
+            if is_introspective_macro(macro_id):
+                introspective.add(unique_id)
+                break
+            stack.extend(manifest.macros[macro_id].depends_on.macros)
+    return introspective
+
+
+@dataclass
+class CompiledNodeResult:
+    node: NonSourceCompiledNode
+    # The ephemeral nodes that were compiled for the node's ctes
+    ephemeral_nodes: List[NonSourceCompiledNode]
+
+
+@dataclass
+class CompilePoolState:
+    config: RuntimeConfig
+    manifest: Manifest
+
+
+# The state used by the worker processes. It's set in the parent before the
+# worker processes are forked, like the state of the parse workers.
+_compile_pool_state: Optional[CompilePoolState] = None
+
+
+def _block_database() -> None:
+    # This runs in each worker process when it starts. The connections and
+    # the relations cache are copies of the parent's, so a node that uses
+    # them anyway fails, and it's compiled in the parent instead.
+    state = _compile_pool_state
+    assert state is not None
+    adapter = get_adapter(state.config)
+
+    def blocked(*args, **kwargs):
+        raise InternalException(
+            'The database is not available while compiling in a worker process'
+        )
+
+    adapter.connections.get_thread_connection = blocked  # type: ignore
+    adapter.connections.set_connection_name = blocked  # type: ignore
+    adapter.list_relations = blocked  # type: ignore
+    adapter.list_relations_without_caching = blocked  # type: ignore
+
+
+# This runs in a worker process. Returns None if compiling failed, so the
+# node is compiled in the thread that runs it, which reports the error the
+# same way.
+def compile_in_worker(unique_id: str) -> Optional[CompiledNodeResult]:
+    state = _compile_pool_state
+    assert state is not None
+    manifest = state.manifest
+    try:
+        compiler = get_adapter(state.config).get_compiler()
+        node = compiler.compile_node(manifest.nodes[unique_id], manifest, {})
+        ephemeral_nodes = [manifest.nodes[cte.id] for cte in node.extra_ctes]
+    except Exception:
+        return None
+    return CompiledNodeResult(
+        node=node,
+        ephemeral_nodes=ephemeral_nodes,  # type: ignore
+    )
+
+
+class CompilePool:
+    """Compiles nodes in worker processes, ahead of the threads that run
+    them, so rendering their sql doesn't hold the GIL while other threads
+    wait on the database. A node's sql only depends on the manifest, unless
+    it queries the database, so the nodes are submitted when the pool
+    starts, in the order that they'll run. The nodes that query the
+    database aren't submitted.
+    """
+    def __init__(self, config: RuntimeConfig, manifest: Manifest, workers: int) -> None:
+        self.config = config
+        self.manifest = manifest
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._futures: Dict[str, 'Future[Optional[CompiledNodeResult]]'] = {}
+
+    def start(self, unique_ids: Iterable[str], introspective: Set[str]) -> None:
+        global _compile_pool_state
+        context = get_parallel_context()
+        assert context is not None
+        _compile_pool_state = CompilePoolState(config=self.config, manifest=self.manifest)
+        # before_run has opened connections to create the schemas, populate
+        # the cache and run the hooks. Close them so the workers don't get
+        # copies of their sockets. The threads open their own.
+        get_adapter(self.config).cleanup_connections()
+        # The workers are forked when the first node is submitted
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_block_database,
+        )
+        for unique_id in unique_ids:
+            if unique_id not in introspective:
+                self._futures[unique_id] = self._executor.submit(compile_in_worker, unique_id)
+
+    def get_compiled_node(
+        self, unique_id: str, manifest: Manifest
+    ) -> Optional[NonSourceCompiledNode]:
+        """Wait for the node to be compiled and return it, after adding it to
+        the manifest like Compiler.compile_node does. Returns None if the
+        node wasn't compiled in a worker, and the caller compiles it.
+        """
+        future = self._futures.get(unique_id)
+        if future is None:
+            return None
+        try:
+            result = future.result()
+        except Exception:
+            # like a BrokenProcessPool, when a worker process was killed
+            return None
+        if result is None:
+            return None
+        for ephemeral_node in result.ephemeral_nodes:
+            manifest.sync_update_node(ephemeral_node)
+        manifest.update_node(result.node)
+        return result.node
+
+    def shutdown(self) -> None:
+        global _compile_pool_state
+        for future in self._futures.values():
+            future.cancel()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        _compile_pool_state = None
@@ -211,7 +211,7 @@ class FreshnessTask(GraphRunnableTask):
 
     def write_result(self, result):
         artifact = FreshnessExecutionResultArtifact.from_result(result)
-        artifact.write(self.result_path())
+        artifact.write(self.result_path(), artifact_format=self.get_artifact_format())
 
     def get_result(self, results, elapsed_time, generated_at):
         return FreshnessResult.from_node_results(
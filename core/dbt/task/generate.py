@@ -7,6 +7,7 @@ from dbt.dataclass_schema import ValidationError
 
 from .compile import CompileTask
 
+from dbt import flags
 from dbt.adapters.factory import get_adapter
 from dbt.contracts.graph.compiled import CompileResultNode
 from dbt.contracts.graph.manifest import Manifest
@@ -201,6 +202,15 @@ class GenerateTask(CompileTask):
             )
         return self.manifest
 
+    def get_artifact_compression(self) -> Optional[str]:
+        # the documentation site reads the uncompressed json artifacts
+        return None
+
+    def get_artifact_format(self) -> Optional[str]:
+        if flags.ARTIFACT_FORMAT == 'json':
+            return 'json'
+        return 'both'
+
     def run(self) -> CatalogArtifact:
         compile_results = None
         if self.args.compile:
@@ -263,7 +273,7 @@ class GenerateTask(CompileTask):
         )
 
         path = os.path.join(self.config.target_path, CATALOG_FILENAME)
-        results.write(path)
+        results.write(path, artifact_format=self.get_artifact_format())
         if self.args.compile:
             self.write_manifest()
 
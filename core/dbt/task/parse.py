@@ -7,7 +7,9 @@
 # Use a visualizer such as snakeviz to look at the output:
 # snakeviz dbt.cprof
 from dbt.task.base import ConfiguredTask
-from dbt.adapters.factory import get_adapter
+from dbt.adapters.factory import get_adapter, register_adapter, reset_adapters
+from dbt.clients.watcher import get_file_watcher
+from dbt.config import RuntimeConfig
 from dbt.parser.manifest import (
     Manifest, ManifestLoader, _check_manifest
 )
@@ -16,19 +18,26 @@ from dbt.clients.system import write_file
 from dbt.events.types import (
     ManifestDependenciesLoaded, ManifestLoaderCreated, ManifestLoaded, ManifestChecked,
     ManifestFlatGraphBuilt, ParsingStart, ParsingCompiling, ParsingWritingManifest, ParsingDone,
-    ReportPerformancePath
+    ReportPerformancePath, WatchingForChanges, WatchDetectedChanges, WatchReloadingConfig,
+    WatchParseError
 )
 from dbt.events.functions import fire_event
 from dbt.graph import Graph
 import time
-from typing import Optional
+from typing import Iterable, List, Optional, Set
 import os
 import json
+import dbt.flags as flags
 import dbt.utils
 
 MANIFEST_FILE_NAME = 'manifest.json'
 PERF_INFO_FILE_NAME = 'perf_info.json'
 PARSING_STATE = DbtProcessState('parsing')
+# A change to one of these files in a project root or the profiles dir
+# means the config has to be loaded again
+CONFIG_FILE_NAMES = (
+    'dbt_project.yml', 'packages.yml', 'selectors.yml', 'profiles.yml'
+)
 
 
 class ParseTask(ConfiguredTask):
@@ -40,7 +49,7 @@ class ParseTask(ConfiguredTask):
 
     def write_manifest(self):
         path = os.path.join(self.config.target_path, MANIFEST_FILE_NAME)
-        self.manifest.write(path)
+        self.manifest.write(path, flags.ARTIFACT_COMPRESSION, flags.ARTIFACT_FORMAT)
 
     def write_perf_info(self):
         path = os.path.join(self.config.target_path, PERF_INFO_FILE_NAME)
@@ -65,12 +74,24 @@ class ParseTask(ConfiguredTask):
             start_load_all = time.perf_counter()
             projects = root_config.load_dependencies()
             fire_event(ManifestDependenciesLoaded())
-            loader = ManifestLoader(root_config, projects, macro_hook)
+            # In watch mode the manifest from the previous parse is
+            # partially parsed again, instead of reading it from disk
+            saved_manifest = None
+            partial_parse_snapshot = None
+            if self.manifest is not None and self.loader is not None:
+                saved_manifest = self.manifest
+                partial_parse_snapshot = self.loader.partial_parse_snapshot
+            loader = ManifestLoader(
+                root_config, projects, macro_hook,
+                saved_manifest=saved_manifest,
+                partial_parse_snapshot=partial_parse_snapshot,
+            )
             fire_event(ManifestLoaderCreated())
             manifest = loader.load()
             fire_event(ManifestLoaded())
             _check_manifest(manifest, root_config)
             fire_event(ManifestChecked())
+            manifest.compact()
             manifest.build_flat_graph()
             fire_event(ManifestFlatGraphBuilt())
             loader._perf_info.load_all_elapsed = (
@@ -86,7 +107,7 @@ class ParseTask(ConfiguredTask):
         compiler = adapter.get_compiler()
         self.graph = compiler.compile(self.manifest)
 
-    def run(self):
+    def parse(self):
         fire_event(ParsingStart())
         self.get_full_manifest()
         if self.args.compile:
@@ -98,3 +119,67 @@ class ParseTask(ConfiguredTask):
 
         self.write_perf_info()
         fire_event(ParsingDone())
+
+    def run(self):
+        self.parse()
+        if getattr(self.args, 'watch', False):
+            self.watch()
+
+    def get_watched_paths(self) -> List[str]:
+        return [project.project_root for project in self.config.load_dependencies().values()]
+
+    def get_excluded_paths(self) -> List[str]:
+        excluded = []
+        for project in self.config.load_dependencies().values():
+            for path in (
+                project.target_path, project.log_path, project.packages_install_path
+            ):
+                excluded.append(os.path.join(project.project_root, path))
+        return excluded
+
+    def is_config_change(self, changed: Iterable[str]) -> bool:
+        config_dirs = {os.path.abspath(path) for path in self.get_watched_paths()}
+        config_dirs.add(os.path.abspath(flags.PROFILES_DIR))
+        return any(
+            os.path.basename(path) in CONFIG_FILE_NAMES and
+            os.path.dirname(path) in config_dirs
+            for path in changed
+        )
+
+    def reload_config(self):
+        fire_event(WatchReloadingConfig())
+        self.config = RuntimeConfig.from_args(self.args)
+        reset_adapters()
+        register_adapter(self.config)
+
+    def watch(self):
+        """Parse the project again every time a file changes, keeping the
+        manifest in memory between parses. Every parse also updates the
+        partial parse file, so other dbt commands start from the current
+        manifest. This runs until it's interrupted.
+        """
+        watcher = get_file_watcher(
+            self.get_watched_paths(),
+            exclude=self.get_excluded_paths(),
+            shallow_paths=[flags.PROFILES_DIR],
+        )
+        with watcher:
+            fire_event(WatchingForChanges(
+                watcher=watcher.name, path_count=watcher.directory_count
+            ))
+            try:
+                while True:
+                    changed: Set[str] = watcher.wait_for_changes()
+                    fire_event(WatchDetectedChanges(path_count=len(changed)))
+                    try:
+                        if self.is_config_change(changed):
+                            self.reload_config()
+                        self.parse()
+                    except Exception as exc:
+                        fire_event(WatchParseError(exc=str(exc)))
+                        # The manifest might have been partly updated, so
+                        # the next parse starts from the partial parse file
+                        self.manifest = None
+                        self.loader = None
+            except KeyboardInterrupt:
+                pass
@@ -1,4 +1,5 @@
 import os
+import sqlite3
 import time
 import json
 from abc import abstractmethod
@@ -25,10 +26,11 @@ from dbt.logger import (
     ModelMetadata,
     NodeCount,
 )
-from dbt.events.functions import fire_event
+from dbt.events.functions import fire_event, get_invocation_id
 from dbt.events.types import (
     EmptyLine, PrintCancelLine, DefaultSelector, NodeStart, NodeFinished,
-    QueryCancelationUnsupported, ConcurrencyLine
+    QueryCancelationUnsupported, ConcurrencyLine, ExecutionTimesNotRead,
+    ExecutionHistoryNotWritten, CompilePoolStarted
 )
 from dbt.contracts.graph.compiled import CompileResultNode
 from dbt.contracts.graph.manifest import Manifest
@@ -50,7 +52,10 @@ from dbt.graph import (
     parse_difference,
     Graph
 )
+from dbt.history import ExecutionHistory, HISTORY_FILE_NAME
 from dbt.parser.manifest import ManifestLoader
+from dbt.parser.parallel import get_parallel_context
+from dbt.task.compile_pool import CompilePool, POOL_RESOURCE_TYPES, find_introspective_nodes
 
 import dbt.exceptions
 from dbt import flags
@@ -59,6 +64,12 @@ from dbt.ui import warning_tag
 
 RESULT_FILE_NAME = 'run_results.json'
 MANIFEST_FILE_NAME = 'manifest.json'
+# compile and docs generate only render the nodes, so their execution times
+# don't tell how long running them takes
+UNTIMED_COMMANDS = ('compile', 'generate')
+# the number of latest results of a node that its execution time is the
+# median of
+SCHEDULING_RECENT_RESULTS = 10
 RUNNING_STATE = DbtProcessState('running')
 
 
@@ -68,10 +79,18 @@ class ManifestTask(ConfiguredTask):
         self.manifest: Optional[Manifest] = None
         self.graph: Optional[Graph] = None
 
+    def get_artifact_compression(self) -> Optional[str]:
+        return flags.ARTIFACT_COMPRESSION
+
+    def get_artifact_format(self) -> Optional[str]:
+        return flags.ARTIFACT_FORMAT
+
     def write_manifest(self):
         if flags.WRITE_JSON:
             path = os.path.join(self.config.target_path, MANIFEST_FILE_NAME)
-            self.manifest.write(path)
+            self.manifest.write(
+                path, self.get_artifact_compression(), self.get_artifact_format()
+            )
         if os.getenv('DBT_WRITE_FILES'):
             path = os.path.join(self.config.target_path, 'files.json')
             write_file(path, json.dumps(self.manifest.files, cls=dbt.utils.JSONEncoder, indent=4))
@@ -101,6 +120,7 @@ class GraphRunnableTask(ManifestTask):
     def __init__(self, args, config):
         super().__init__(args, config)
         self.job_queue: Optional[GraphQueue] = None
+        self.compile_pool: Optional[CompilePool] = None
         self._flattened_nodes: Optional[List[CompileResultNode]] = None
 
         self.run_count: int = 0
@@ -146,10 +166,41 @@ class GraphRunnableTask(ManifestTask):
             f'get_node_selector not implemented for task {type(self)}'
         )
 
+    def get_execution_times(
+        self, selected_nodes: AbstractSet[str]
+    ) -> Optional[Dict[str, float]]:
+        """Return the median execution time of each selected node in its
+        latest results in the execution history, for the critical path
+        scheduling.
+        """
+        if flags.SCHEDULING != 'critical-path':
+            return None
+        path = os.path.join(self.config.target_path, HISTORY_FILE_NAME)
+        if not os.path.exists(path):
+            return None
+        try:
+            with ExecutionHistory(path) as history:
+                percentiles = history.get_percentiles(
+                    unique_ids=selected_nodes,
+                    recent=SCHEDULING_RECENT_RESULTS,
+                    exclude_commands=UNTIMED_COMMANDS,
+                )
+        except sqlite3.Error as exc:
+            # the nodes are scheduled by depth instead
+            fire_event(ExecutionTimesNotRead(path=path, exc=str(exc)))
+            return None
+        return {unique_id: median for unique_id, (median,) in percentiles.items()}
+
     def get_graph_queue(self) -> GraphQueue:
         selector = self.get_node_selector()
         spec = self.get_selection_spec()
-        return selector.get_graph_queue(spec)
+        selected_nodes = selector.get_selected(spec)
+        return selector.get_graph_queue(
+            spec,
+            self.get_execution_times(selected_nodes),
+            self.config.concurrency_pools,
+            selected_nodes,
+        )
 
     def _runtime_initialize(self):
         super()._runtime_initialize()
@@ -173,6 +224,16 @@ class GraphRunnableTask(ManifestTask):
                     f'source'
                 )
 
+        undefined_pools = {
+            getattr(node.config, 'concurrency_pool', None) for node in self._flattened_nodes
+        } - set(self.config.concurrency_pools) - {None}
+        for pool in sorted(undefined_pools):
+            warn_or_error(
+                f"The concurrency pool '{pool}' isn't defined in concurrency-pools "
+                f"in dbt_project.yml, so its nodes can run at the same time",
+                log_fmt=warning_tag('{}')
+            )
+
         self.num_nodes = len([
             n for n in self._flattened_nodes
             if not n.is_ephemeral_model
@@ -201,7 +262,9 @@ class GraphRunnableTask(ManifestTask):
             num_nodes = self.num_nodes
 
         cls = self.get_runner_type(node)
-        return cls(self.config, adapter, node, run_count, num_nodes)
+        runner = cls(self.config, adapter, node, run_count, num_nodes)
+        runner.compile_pool = self.compile_pool
+        return runner
 
     def call_runner(self, runner):
         uid_context = UniqueID(runner.node.unique_id)
@@ -381,6 +444,8 @@ class GraphRunnableTask(ManifestTask):
         with TextOnly():
             fire_event(EmptyLine())
 
+        # before the threads start, because the workers are forked
+        self.compile_pool = self.start_compile_pool()
         pool = ThreadPool(num_threads)
         try:
             self.run_queue(pool)
@@ -395,11 +460,43 @@ class GraphRunnableTask(ManifestTask):
             print_run_end_messages(self.node_results, keyboard_interrupt=True)
             raise
 
+        finally:
+            if self.compile_pool is not None:
+                self.compile_pool.shutdown()
+                self.compile_pool = None
+
         pool.close()
         pool.join()
 
         return self.node_results
 
+    def start_compile_pool(self) -> Optional[CompilePool]:
+        """Start compiling the selected nodes in worker processes, if
+        --compile-workers is more than 1 and dbt runs on Linux, where the
+        workers are forked.
+        """
+        workers = flags.COMPILE_WORKERS or 1
+        if workers <= 1 or get_parallel_context() is None:
+            return None
+        if self.manifest is None or self.job_queue is None:
+            raise InternalException('start_compile_pool called before _runtime_initialize')
+        unique_ids = [
+            unique_id for unique_id in self.job_queue.get_nodes_in_order()
+            if unique_id in self.manifest.nodes and
+            self.manifest.nodes[unique_id].resource_type in POOL_RESOURCE_TYPES
+        ]
+        if not unique_ids:
+            return None
+        introspective = find_introspective_nodes(self.manifest, unique_ids)
+        fire_event(CompilePoolStarted(
+            workers=workers,
+            nodes=len(unique_ids) - len(introspective),
+            introspective=len(introspective),
+        ))
+        compile_pool = CompilePool(self.config, self.manifest, workers)
+        compile_pool.start(unique_ids, introspective)
+        return compile_pool
+
     def _mark_dependent_errors(self, node_id, result, cause):
         if self.graph is None:
             raise InternalException('graph is None in _mark_dependent_errors')
@@ -444,7 +541,19 @@ class GraphRunnableTask(ManifestTask):
         return result
 
     def write_result(self, result):
-        result.write(self.result_path())
+        result.write(
+            self.result_path(), self.get_artifact_compression(), self.get_artifact_format()
+        )
+        if flags.WRITE_HISTORY:
+            self.write_history(result)
+
+    def write_history(self, result):
+        path = os.path.join(self.config.target_path, HISTORY_FILE_NAME)
+        try:
+            with ExecutionHistory(path) as history:
+                history.record(result, get_invocation_id())
+        except sqlite3.Error as exc:
+            fire_event(ExecutionHistoryNotWritten(path=path, exc=str(exc)))
 
     def run(self):
         """
@@ -591,6 +700,7 @@ class GraphRunnableTask(ManifestTask):
             elapsed_time=elapsed_time,
             generated_at=generated_at,
             args=dbt.utils.args_to_dict(self.args),
+            concurrency_pools=self.job_queue.pool_stats if self.job_queue else {},
         )
 
     def task_end_messages(self, results):
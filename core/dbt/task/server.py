@@ -0,0 +1,344 @@
+import argparse
+import array
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import traceback
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple, TextIO
+
+import dbt.flags as flags
+import dbt.tracking
+from dbt.adapters.factory import (
+    cleanup_connections, get_adapter, register_adapter, reset_adapters
+)
+from dbt.clients.system import make_directory
+from dbt.clients.watcher import FileWatcher, get_file_watcher
+from dbt.config import RuntimeConfig
+from dbt.config.profile import read_user_config
+from dbt.events.functions import fire_event, set_invocation_id
+from dbt.events.types import (
+    MainEncounteredError, MainKeyboardInterrupt, MainStackTrace, ServerHandlingRequest,
+    ServerListening, ServerRequestFailed
+)
+from dbt.exceptions import RuntimeException
+from dbt.logger import log_manager
+from dbt.task.parse import MANIFEST_FILE_NAME, ParseTask
+from dbt.utils import ExitCodes
+
+
+DEFAULT_SOCKET_NAME = 'dbt.sock'
+
+# The commands that the server runs, by their 'which' name
+SERVER_COMMANDS = (
+    'build', 'compile', 'list', 'run', 'run-operation', 'seed', 'snapshot', 'test'
+)
+
+# The args that are used to create the RuntimeConfig. If a request has
+# different values the server loads the config again.
+CONFIG_ARGS = ('profiles_dir', 'profile', 'target', 'vars', 'threads')
+
+# The client sends its stdout and stderr with the request
+MAX_FDS = 2
+
+
+# Messages are json encoded and end with a newline. The request from the
+# client looks like {"args": ["run", "--select", "my_model"], "env": {}}
+# and carries the client's stdout and stderr file descriptors, which the
+# request's output is written to. The response looks like {"exit_code": 0},
+# with an "error" when the server couldn't run the request.
+def send_message(sock: socket.socket, message: Dict[str, Any], fds: Iterable[int] = ()) -> None:
+    data = json.dumps(message).encode('utf-8') + b'\n'
+    ancillary = []
+    fds = list(fds)
+    if fds:
+        ancillary.append((socket.SOL_SOCKET, socket.SCM_RIGHTS, array.array('i', fds).tobytes()))
+    sent = sock.sendmsg([data], ancillary)
+    if sent < len(data):
+        sock.sendall(data[sent:])
+
+
+def receive_message(sock: socket.socket) -> Tuple[Dict[str, Any], List[int]]:
+    data = b''
+    fds = array.array('i')
+    while not data.endswith(b'\n'):
+        chunk, ancillary, _, _ = sock.recvmsg(
+            64 * 1024, socket.CMSG_SPACE(MAX_FDS * fds.itemsize)
+        )
+        if not chunk:
+            raise RuntimeException('The connection was closed before a message was received')
+        data += chunk
+        for level, kind, fd_data in ancillary:
+            if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+                fds.frombytes(fd_data[:len(fd_data) - (len(fd_data) % fds.itemsize)])
+    return json.loads(data), list(fds)
+
+
+def invoke(
+    socket_path: str,
+    args: List[str],
+    env: Optional[Dict[str, str]] = None,
+    stdout: Optional[TextIO] = None,
+    stderr: Optional[TextIO] = None,
+) -> int:
+    """Run the dbt command in 'args' with the dbt server that listens on
+    'socket_path'. The output is written to 'stdout' and 'stderr', which
+    must be backed by file descriptors. Return the exit code.
+    """
+    stdout = sys.stdout if stdout is None else stdout
+    stderr = sys.stderr if stderr is None else stderr
+    stdout.flush()
+    stderr.flush()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        send_message(
+            sock, {'args': list(args), 'env': env}, [stdout.fileno(), stderr.fileno()]
+        )
+        response, _ = receive_message(sock)
+    if response.get('error'):
+        stderr.write(response['error'] + '\n')
+        stderr.flush()
+    return response['exit_code']
+
+
+@dataclass
+class PendingRequest:
+    args: argparse.Namespace
+    fds: List[int]
+
+
+class ServerRequestHandler(socketserver.BaseRequestHandler):
+    server: 'DbtServer'
+
+    # This runs in the forked process
+    def handle(self):
+        self.server.socket.close()
+        pending = self.server.pending_request
+        assert pending is not None
+        exit_code = self.server.task.run_request(pending.args, pending.fds)
+        send_message(self.request, {'exit_code': exit_code})
+
+
+class DbtServer(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    """Accept requests one at a time and bring the server's config and
+    manifest up to date for each of them, then run them concurrently in
+    forked processes. Every forked process has its own copy of the flags,
+    the event logger and the adapter's connections, and starts with the
+    config, adapter and manifest already loaded.
+    """
+    def __init__(self, socket_path: str, task: 'ServerTask') -> None:
+        self.task = task
+        self.pending_request: Optional[PendingRequest] = None
+        super().__init__(socket_path, ServerRequestHandler)
+
+    def process_request(self, request, client_address):
+        fds: List[int] = []
+        try:
+            message, fds = receive_message(request)
+            args = self.task.prepare_request(message)
+        except Exception as exc:
+            fire_event(ServerRequestFailed(exc=str(exc)))
+            with contextlib.suppress(OSError):
+                send_message(request, {
+                    'exit_code': ExitCodes.UnhandledError.value, 'error': str(exc)
+                })
+            for fd in fds:
+                os.close(fd)
+            self.shutdown_request(request)
+            return
+
+        self.pending_request = PendingRequest(args=args, fds=fds)
+        try:
+            super().process_request(request, client_address)
+        finally:
+            self.pending_request = None
+            for fd in fds:
+                os.close(fd)
+
+
+def get_config_key(args: argparse.Namespace) -> Tuple[Any, ...]:
+    return tuple(getattr(args, name, None) for name in CONFIG_ARGS)
+
+
+class ServerTask(ParseTask):
+    def __init__(self, args, config):
+        super().__init__(args, config)
+        self.config_key = get_config_key(args)
+        # The server's own environment. Requests can add to it.
+        self.base_environ = dict(os.environ)
+        # The environment that the manifest was parsed with
+        self.parsed_environ: Optional[Dict[str, str]] = None
+        self.watcher: Optional[FileWatcher] = None
+
+    def get_socket_path(self) -> str:
+        if self.args.socket:
+            return self.args.socket
+        return os.path.join(self.config.target_path, DEFAULT_SOCKET_NAME)
+
+    def get_full_manifest(self):
+        super().get_full_manifest()
+        # The requests use the adapter to run macros
+        self.loader.save_macros_to_adapter(get_adapter(self.config))
+        # The forked processes open their own connections
+        cleanup_connections()
+        self.parsed_environ = dict(os.environ)
+        if flags.WRITE_JSON:
+            path = os.path.join(self.config.target_path, MANIFEST_FILE_NAME)
+            self.manifest.write(path, flags.ARTIFACT_COMPRESSION, flags.ARTIFACT_FORMAT)
+
+    def parse_request_args(self, request_args: Any) -> argparse.Namespace:
+        # avoid a circular import
+        from dbt.main import parse_args
+
+        if not isinstance(request_args, list) or not all(
+            isinstance(arg, str) for arg in request_args
+        ):
+            raise RuntimeException('"args" must be a list of strings')
+        # argparse reports errors on stderr and exits
+        stderr = io.StringIO()
+        try:
+            with contextlib.redirect_stderr(stderr):
+                args = parse_args(request_args)
+        except SystemExit:
+            raise RuntimeException(stderr.getvalue().strip() or 'Invalid arguments')
+        if args.which not in SERVER_COMMANDS:
+            raise RuntimeException(
+                f'The server can\'t run "{args.which}". It runs: {", ".join(SERVER_COMMANDS)}'
+            )
+        if args.project_dir and os.path.abspath(args.project_dir) != self.config.project_root:
+            raise RuntimeException(
+                f'The server runs the project in {self.config.project_root}, '
+                f'not {args.project_dir}'
+            )
+        return args
+
+    def prepare_request(self, message: Dict[str, Any]) -> argparse.Namespace:
+        """Bring the config and manifest up to date for the request. This
+        runs in the server process, one request at a time.
+        """
+        env = message.get('env') or {}
+        if not isinstance(env, dict) or not all(
+            isinstance(key, str) and isinstance(value, str) for key, value in env.items()
+        ):
+            raise RuntimeException('"env" must be a mapping of strings to strings')
+        os.environ.clear()
+        os.environ.update(self.base_environ)
+        os.environ.update(env)
+
+        args = self.parse_request_args(message.get('args'))
+        fire_event(ServerHandlingRequest(args=' '.join(message['args'])))
+
+        changed = self.watcher.wait_for_changes(timeout=0) if self.watcher else set()
+        reload_config = (
+            get_config_key(args) != self.config_key or
+            dict(os.environ) != self.parsed_environ or
+            self.is_config_change(changed)
+        )
+        try:
+            if reload_config:
+                # The config can use env vars too
+                self.config = RuntimeConfig.from_args(args)
+                reset_adapters()
+                register_adapter(self.config)
+                self.config_key = get_config_key(args)
+            if reload_config or changed or self.manifest is None:
+                self.get_full_manifest()
+        except Exception:
+            # Start from the partial parse file for the next request
+            self.manifest = None
+            self.loader = None
+            self.parsed_environ = None
+            raise
+        return args
+
+    # This runs in the forked process
+    def run_request(self, args: argparse.Namespace, fds: List[int]) -> int:
+        # avoid a circular import
+        from dbt.main import run_from_args
+
+        sys.stdout.flush()
+        sys.stderr.flush()
+        for fd, target in zip(fds, (sys.stdout.fileno(), sys.stderr.fileno())):
+            os.dup2(fd, target)
+
+        try:
+            # The server's logger was set up for the server's invocation
+            log_manager.reset_handlers()
+            flags.set_from_args(args, read_user_config(flags.PROFILES_DIR))
+            dbt.tracking.initialize_from_flags()
+            args.cls.set_log_format()
+            if flags.DEBUG:
+                log_manager.set_debug()
+            set_invocation_id()
+
+            task = args.cls(args, self.config)
+            # Like dbt.lib.create_task, use the server's manifest instead
+            # of loading it
+            task.manifest = self.manifest
+            task.load_manifest = lambda: None  # type: ignore
+            try:
+                task, results = run_from_args(args, task=task)
+            finally:
+                cleanup_connections()
+            if task.interpret_results(results):
+                exit_code = ExitCodes.Success.value
+            else:
+                exit_code = ExitCodes.ModelError.value
+
+        except KeyboardInterrupt:
+            fire_event(MainKeyboardInterrupt())
+            exit_code = ExitCodes.UnhandledError.value
+
+        except SystemExit as exc:
+            exit_code = exc.code
+
+        except BaseException as exc:
+            fire_event(MainEncounteredError(e=exc))
+            fire_event(MainStackTrace(stack_trace=traceback.format_exc()))
+            exit_code = ExitCodes.UnhandledError.value
+
+        sys.stdout.flush()
+        sys.stderr.flush()
+        return exit_code
+
+    def remove_stale_socket(self, socket_path: str) -> None:
+        if not os.path.exists(socket_path):
+            return
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            try:
+                sock.connect(socket_path)
+            except (ConnectionRefusedError, FileNotFoundError):
+                # left behind by a server that didn't exit cleanly
+                os.remove(socket_path)
+                return
+        raise RuntimeException(f'A dbt server is already listening on {socket_path}')
+
+    def run(self):
+        # Like the parse and compile workers, the requests' processes are
+        # forked, which is only safe on Linux
+        if not sys.platform.startswith('linux'):
+            raise RuntimeException('dbt server is only supported on Linux')
+        self.get_full_manifest()
+        socket_path = self.get_socket_path()
+        make_directory(os.path.dirname(os.path.abspath(socket_path)))
+        self.remove_stale_socket(socket_path)
+
+        self.watcher = get_file_watcher(
+            self.get_watched_paths(),
+            exclude=self.get_excluded_paths(),
+            shallow_paths=[flags.PROFILES_DIR],
+        )
+        try:
+            with self.watcher, DbtServer(socket_path, self) as server:
+                fire_event(ServerListening(socket_path=socket_path))
+                try:
+                    server.serve_forever()
+                except KeyboardInterrupt:
+                    pass
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(socket_path)
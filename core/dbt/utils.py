@@ -335,6 +335,15 @@ class JSONEncoder(json.JSONEncoder):
         return super().default(obj)
 
 
+def mapping_json_default(obj: Any) -> Any:
+    """The `default` for json.dumps in Jinja, for the mappings in the
+    context that aren't dicts, like the sections of `graph`.
+    """
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
 class ForgivingJSONEncoder(JSONEncoder):
     def default(self, obj):
         # let dbt's default JSON encoder handle it if possible, fallback to
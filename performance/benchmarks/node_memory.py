@@ -0,0 +1,98 @@
+"""Report how many bytes the parsed nodes of a manifest take, together with
+their source files, before and after Manifest.compact().
+
+The nodes are built from dicts the way they are read from
+partial_parse.msgpack, so every node starts with its own copy of each
+string.
+
+    python performance/benchmarks/node_memory.py --nodes 10000
+"""
+import argparse
+import gc
+import tracemalloc
+
+from dbt.contracts.files import FileHash, SourceFile
+from dbt.contracts.graph.manifest import Manifest
+from dbt.contracts.graph.parsed import ParsedModelNode
+
+PACKAGE = 'my_project'
+MATERIALIZATIONS = ('view', 'table', 'incremental', 'ephemeral')
+
+
+def _copy(value: str) -> str:
+    # a new string object with the same value, like the deserializer makes
+    return ''.join(list(value))
+
+
+def node_dict(idx: int) -> dict:
+    folder = f'folder_{idx % 20}'
+    name = f'model_{idx}'
+    path = f'{folder}/{name}.sql'
+    parents = [f'model_{parent}' for parent in range(max(0, idx - 3), idx)]
+    return {
+        'name': name,
+        'resource_type': 'model',
+        'package_name': _copy(PACKAGE),
+        'path': path,
+        'original_file_path': _copy('models/') + path,
+        'root_path': _copy('/usr/src/app/my_project'),
+        'unique_id': f'model.{PACKAGE}.{name}',
+        'fqn': [_copy(PACKAGE), _copy(folder), name],
+        'database': _copy('analytics'),
+        'schema': _copy('dbt_schema'),
+        'alias': name,
+        'checksum': {'name': _copy('sha256'), 'checksum': f'{idx:064x}'},
+        'config': {
+            'materialized': _copy(MATERIALIZATIONS[idx % 20 % len(MATERIALIZATIONS)]),
+            'tags': [_copy(folder)],
+        },
+        'tags': [_copy(folder)],
+        'refs': [[parent] for parent in parents],
+        'depends_on': {
+            'macros': [_copy('macro.dbt.is_incremental')],
+            'nodes': [f'model.{PACKAGE}.{parent}' for parent in parents],
+        },
+        'raw_sql': f'select * from {{{{ ref("{name}") }}}}',
+    }
+
+
+def build_manifest(count: int) -> Manifest:
+    manifest = Manifest()
+    for idx in range(count):
+        node = ParsedModelNode.from_dict(node_dict(idx))
+        manifest.nodes[node.unique_id] = node
+        source_file = SourceFile(
+            path=None,  # type: ignore
+            checksum=FileHash.from_dict(node_dict(idx)['checksum']),
+            project_name=PACKAGE,
+        )
+        manifest.files[node.file_id] = source_file
+    return manifest
+
+
+def traced_bytes() -> int:
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--nodes', type=int, default=10000)
+    args = parser.parse_args()
+
+    tracemalloc.start()
+    start = traced_bytes()
+    manifest = build_manifest(args.nodes)
+    before = traced_bytes() - start
+    manifest.compact()
+    after = traced_bytes() - start
+    tracemalloc.stop()
+
+    print(f'nodes:                {args.nodes}')
+    print(f'bytes per node:       {before / args.nodes:.0f}')
+    print(f'compacted:            {after / args.nodes:.0f}')
+    print(f'saved:                {1 - after / before:.1%}')
+
+
+if __name__ == '__main__':
+    main()
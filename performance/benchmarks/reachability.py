@@ -0,0 +1,82 @@
+"""Time the reachability queries of Graph on synthetic DAGs shaped like dbt
+projects, with its reachability index and with the breadth first searches
+that it uses for graphs with cycles and for --select with a depth.
+
+The DAGs have sources, staging models with one source each, and
+intermediate models and marts with a few parents. The queries are `+model`
+and `model+` for a selection of nodes, the descendants of failed nodes, and
+the ancestors of every node, which building the test edges of `dbt build`
+needs.
+
+    python performance/benchmarks/reachability.py --nodes 20000 50000
+"""
+import argparse
+import random
+import time
+
+import networkx as nx  # type: ignore
+
+from dbt.graph.graph import Graph
+
+
+def dbt_dag(count: int, rng: random.Random) -> nx.DiGraph:
+    graph = nx.DiGraph()
+    sources = count // 10
+    staging = sources + count * 3 // 10
+    intermediate = staging + count * 4 // 10
+    for idx in range(count):
+        graph.add_node(f'node_{idx}')
+        if idx < sources:
+            continue
+        if idx < staging:
+            graph.add_edge(f'node_{rng.randrange(sources)}', f'node_{idx}')
+            continue
+        low = sources if idx < intermediate else staging
+        for parent in rng.sample(range(low, idx), min(rng.randint(1, 4), idx - low)):
+            graph.add_edge(f'node_{parent}', f'node_{idx}')
+    return graph
+
+
+class SearchGraph(Graph):
+    # the reachability queries without the index
+    @property
+    def reachability(self):
+        return None
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--nodes', type=int, nargs='+', default=[20000, 50000])
+    parser.add_argument('--selected', type=int, default=500)
+    parser.add_argument('--failed', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    for count in args.nodes:
+        dag = dbt_dag(count, rng)
+        nodes = sorted(dag.nodes())
+        selected = set(rng.sample(nodes, args.selected))
+        failed = rng.sample(nodes, args.failed)
+        print(f'{count} nodes, {dag.number_of_edges()} edges')
+        for name, graph in (('index', Graph(dag)), ('search', SearchGraph(dag))):
+            queries = (
+                ('+model', graph.select_parents, selected),
+                ('model+', graph.select_children, selected),
+                ('failures', lambda nodes: [graph.get_dependent_nodes(n) for n in nodes], failed),
+                ('all ancestors', lambda nodes: [graph.ancestors(n) for n in nodes], nodes),
+            )
+            times = ', '.join(
+                f'{label}: {timed(query, arg):.2f}s' for label, query, arg in queries
+            )
+            print(f'  {name:6} {times}')
+
+
+if __name__ == '__main__':
+    main()
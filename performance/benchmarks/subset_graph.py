@@ -0,0 +1,77 @@
+"""Time Graph.get_subset_graph on synthetic DAGs, together with the node
+removal that it uses for graphs with cycles, which it used for every
+graph before.
+
+The wide DAG has hub nodes, like sources that thousands of models select
+from, and the deep DAG has long chains of models. A few nodes are
+selected from each, like `dbt run --select` does.
+
+    python performance/benchmarks/subset_graph.py --nodes 5000 --selected 50
+"""
+import argparse
+import random
+import time
+
+import networkx as nx  # type: ignore
+
+from dbt.graph.graph import Graph
+
+
+def wide_dag(count: int, rng: random.Random) -> nx.DiGraph:
+    graph = nx.DiGraph()
+    hubs = [f'source.hub_{idx}' for idx in range(10)]
+    graph.add_nodes_from(hubs)
+    for idx in range(count):
+        node = f'model.wide_{idx}'
+        graph.add_node(node)
+        for hub in rng.sample(hubs, 3):
+            graph.add_edge(hub, node)
+        # a reporting layer on top of the staging layer
+        if idx >= count // 2:
+            for parent in rng.sample(range(count // 2), 3):
+                graph.add_edge(f'model.wide_{parent}', node)
+    return graph
+
+
+def deep_dag(count: int, rng: random.Random) -> nx.DiGraph:
+    graph = nx.DiGraph()
+    for idx in range(count):
+        node = f'model.deep_{idx}'
+        graph.add_node(node)
+        for parent in range(max(0, idx - 3), idx):
+            graph.add_edge(f'model.deep_{parent}', node)
+        if idx > 10:
+            graph.add_edge(f'model.deep_{rng.randrange(idx - 10)}', node)
+    return graph
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--nodes', type=int, default=5000)
+    parser.add_argument('--selected', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    for name, build in (('wide', wide_dag), ('deep', deep_dag)):
+        graph = Graph(build(args.nodes, rng))
+        selected = set(rng.sample(sorted(graph.nodes()), args.selected))
+        subset, elapsed = timed(graph.get_subset_graph, selected)
+        removal, removal_elapsed = timed(graph._get_subset_graph_with_cycles, selected)
+        assert set(subset.edges()) == set(removal.edges())
+        print(
+            f'{name}: {len(graph.graph)} nodes, {graph.graph.number_of_edges()} edges, '
+            f'{len(selected)} selected, {len(subset.edges())} subset edges'
+        )
+        print(f'  get_subset_graph: {elapsed:.3f}s')
+        print(f'  node removal:     {removal_elapsed:.3f}s')
+
+
+if __name__ == '__main__':
+    main()
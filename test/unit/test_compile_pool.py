@@ -0,0 +1,129 @@
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from dbt.parser.parallel import get_parallel_context
+from dbt.task.compile_pool import CompilePool, find_introspective_nodes
+
+
+def _macro(unique_id, macro_sql, macros=()):
+    return SimpleNamespace(
+        name=unique_id.split('.')[-1],
+        macro_sql=macro_sql,
+        depends_on=SimpleNamespace(macros=list(macros)),
+    )
+
+
+def _node(raw_sql, macros=()):
+    return SimpleNamespace(raw_sql=raw_sql, depends_on=SimpleNamespace(macros=list(macros)))
+
+
+class FakeConnections:
+    def get_thread_connection(self):
+        return 'connection'
+
+    def set_connection_name(self, name=None):
+        return 'connection'
+
+
+class FakeCompiler:
+    def __init__(self, adapter):
+        self.adapter = adapter
+
+    def compile_node(self, node, manifest, extra_context):
+        if 'query' in node.raw_sql:
+            self.adapter.connections.get_thread_connection()
+        return SimpleNamespace(
+            unique_id=node.unique_id,
+            compiled_sql=node.raw_sql.upper(),
+            extra_ctes=[],
+        )
+
+
+class FakeAdapter:
+    def __init__(self):
+        self.connections = FakeConnections()
+        self.cleaned_up = False
+
+    def cleanup_connections(self):
+        self.cleaned_up = True
+
+    def get_compiler(self):
+        return FakeCompiler(self)
+
+    def list_relations(self, database, schema):
+        return []
+
+    def list_relations_without_caching(self, schema_relation):
+        return []
+
+
+class TestFindIntrospectiveNodes(unittest.TestCase):
+    def test_find_introspective_nodes(self):
+        macros = {
+            'macro.root.plain': _macro('macro.root.plain', 'select 1'),
+            'macro.root.columns': _macro(
+                'macro.root.columns', '{{ adapter.get_columns_in_relation(this) }}'
+            ),
+            'macro.root.uses_columns': _macro(
+                'macro.root.uses_columns', '{{ columns() }}', ['macro.root.columns']
+            ),
+            'macro.root.quoted': _macro(
+                'macro.root.quoted', "{{ adapter.quote('id') }}, {{ adapter.dispatch('x')() }}"
+            ),
+            'macro.root.default__lookup': _macro(
+                'macro.root.default__lookup', "{% call statement('lookup') %}{% endcall %}"
+            ),
+        }
+        nodes = {
+            'model.root.plain': _node('select 1', ['macro.root.plain']),
+            'model.root.direct': _node("{{ run_query('select 1') }}"),
+            'model.root.depends': _node('select 1', ['macro.root.uses_columns']),
+            'model.root.quoted': _node('{{ quoted() }}', ['macro.root.quoted']),
+            # only called in a branch that parsing didn't take
+            'model.root.named': _node('{% if execute %}{{ lookup() }}{% endif %}'),
+            'model.root.missing': _node('select 1', ['macro.other.missing']),
+        }
+        manifest = SimpleNamespace(macros=macros, nodes=nodes)
+        self.assertEqual(
+            find_introspective_nodes(manifest, nodes),
+            {'model.root.direct', 'model.root.depends', 'model.root.named'},
+        )
+        self.assertEqual(
+            find_introspective_nodes(manifest, ['model.root.plain', 'model.root.quoted']),
+            set(),
+        )
+
+
+class TestCompilePool(unittest.TestCase):
+    @unittest.skipIf(get_parallel_context() is None, 'requires Linux')
+    def test_compile_pool(self):
+        nodes = {
+            'model.root.a': SimpleNamespace(unique_id='model.root.a', raw_sql='select a'),
+            'model.root.b': SimpleNamespace(unique_id='model.root.b', raw_sql='select b'),
+            'model.root.query': SimpleNamespace(
+                unique_id='model.root.query', raw_sql='select query'
+            ),
+        }
+        adapter = FakeAdapter()
+        manifest = mock.MagicMock(nodes=nodes)
+        pool = CompilePool(mock.MagicMock(), manifest, 2)
+        with mock.patch('dbt.task.compile_pool.get_adapter', return_value=adapter):
+            try:
+                pool.start(nodes, {'model.root.b'})
+                node = pool.get_compiled_node('model.root.a', manifest)
+                # introspective nodes and nodes that use the database in
+                # the worker are compiled by the caller
+                self.assertIsNone(pool.get_compiled_node('model.root.b', manifest))
+                self.assertIsNone(pool.get_compiled_node('model.root.query', manifest))
+                self.assertIsNone(pool.get_compiled_node('model.root.c', manifest))
+            finally:
+                pool.shutdown()
+
+        self.assertEqual(node.unique_id, 'model.root.a')
+        self.assertEqual(node.compiled_sql, 'SELECT A')
+        manifest.update_node.assert_called_once_with(node)
+        # the connections were closed before the workers were forked
+        self.assertTrue(adapter.cleaned_up)
+        # the parent's adapter isn't blocked
+        self.assertEqual(adapter.connections.get_thread_connection(), 'connection')
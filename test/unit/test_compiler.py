@@ -1,3 +1,5 @@
+import shutil
+import tempfile
 import unittest
 from unittest.mock import MagicMock, patch
 
@@ -23,6 +25,7 @@ class CompilerTest(unittest.TestCase):
 
     def setUp(self):
         self.maxDiff = None
+        self.target_path = tempfile.mkdtemp()
 
         self.model_config = NodeConfig.from_dict({
             'enabled': True,
@@ -41,6 +44,7 @@ class CompilerTest(unittest.TestCase):
             'version': '0.1',
             'profile': 'test',
             'project-root': '/tmp/dbt/does-not-exist',
+            'target-path': self.target_path,
             'config-version': 2,
         }
         profile_cfg = {
@@ -79,6 +83,7 @@ class CompilerTest(unittest.TestCase):
     def tearDown(self):
         self._generate_runtime_model_context_patch.stop()
         clear_plugin(Plugin)
+        shutil.rmtree(self.target_path)
 
     def test__prepend_ctes__already_has_cte(self):
         ephemeral_config = self.model_config.replace(materialized='ephemeral')
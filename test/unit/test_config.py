@@ -793,6 +793,17 @@ class TestProject(BaseConfigTest):
 
         self.assertIn('invalid-project-name', str(exc.exception))
 
+    def test_concurrency_pools(self):
+        self.default_project_data['concurrency-pools'] = {'heavy': 2}
+        project = project_from_config_norender(self.default_project_data)
+        self.assertEqual(project.concurrency_pools, {'heavy': 2})
+
+        self.default_project_data['concurrency-pools'] = {'heavy': 0}
+        with self.assertRaises(dbt.exceptions.DbtProjectError) as exc:
+            project_from_config_norender(self.default_project_data)
+
+        self.assertIn('heavy', str(exc.exception))
+
     def test_no_project(self):
         renderer = empty_project_renderer()
         with self.assertRaises(dbt.exceptions.DbtProjectError) as exc:
@@ -9,13 +9,14 @@ import pytest
 from dbt.adapters import postgres
 from dbt.adapters import factory
 from dbt.adapters.base import AdapterConfig
-from dbt.clients.jinja import MacroStack
+from dbt.clients.jinja import MacroStack, get_rendered
 from dbt.contracts.graph.parsed import (
     ParsedModelNode, NodeConfig, DependsOn, ParsedMacro
 )
 from dbt.config.project import VarProvider
 from dbt.context import base, target, configured, providers, docs, manifest, macros
-from dbt.contracts.files import FileHash
+from dbt.contracts.files import FileHash, FilePath, SourceFile
+from dbt.contracts.graph.manifest import Manifest, MacroManifest
 from dbt.node_types import NodeType
 import dbt.exceptions
 from .utils import profile_from_dict, config_from_parts_or_dicts, inject_adapter, clear_plugin
@@ -101,6 +102,22 @@ class TestVar(unittest.TestCase):
         self.assertEqual(var('foo', 'bar'), 'bar')
         self.assertEqual(var('foo'), None)
 
+    def test_parser_var_saved_in_file(self):
+        source_file = SourceFile(
+            path=FilePath(
+                project_root='/usr/src/app', searched_path='.',
+                relative_path='model_one.sql', modification_time=0.0
+            ),
+            checksum=FileHash.from_contents(''),
+            project_name='root',
+        )
+        parse_manifest = Manifest(files={self.model.file_id: source_file})
+        var = providers.ParseVar(self.context, self.config, self.model, manifest=parse_manifest)
+        var('foo', 'bar')
+        var('foo')
+        var('other')
+        self.assertEqual(source_file.vars, ['foo', 'other'])
+
 
 class TestParseWrapper(unittest.TestCase):
     def setUp(self):
@@ -191,7 +208,7 @@ REQUIRED_BASE_KEYS = frozenset({
 REQUIRED_TARGET_KEYS = REQUIRED_BASE_KEYS | {'target'}
 REQUIRED_DOCS_KEYS = REQUIRED_TARGET_KEYS | {'project_name'} | {'doc'}
 MACROS = frozenset({'macro_a', 'macro_b', 'root', 'dbt'})
-REQUIRED_QUERY_HEADER_KEYS = REQUIRED_TARGET_KEYS | {'project_name'} | MACROS
+REQUIRED_QUERY_HEADER_KEYS = REQUIRED_TARGET_KEYS | {'project_name', '_macro_namespace'} | MACROS
 REQUIRED_MACRO_KEYS = REQUIRED_QUERY_HEADER_KEYS | {
     '_sql_results',
     'load_result',
@@ -306,7 +323,7 @@ def mock_manifest(config):
     for name in ['macro_a', 'macro_b']:
         macro = mock_macro(name, config.project_name)
         manifest_macros[macro.unique_id] = macro
-    return mock.MagicMock(macros=manifest_macros)
+    return MacroManifest(manifest_macros)
 
 
 def mock_model():
@@ -413,6 +430,38 @@ def test_model_runtime_context(config_postgres, manifest_fx, get_adapter, get_in
     assert_has_keys(REQUIRED_MODEL_KEYS, MAYBE_KEYS, ctx)
 
 
+def test_model_runtime_context_binds_macros(config_postgres, get_adapter, get_include_paths):
+    macro_a = mock_macro('macro_a', 'root')
+    macro_a.macro_sql = '{% macro macro_a() %}a{{ macro_b() }}{% endmacro %}'
+    macro_b = mock_macro('macro_b', 'root')
+    macro_b.macro_sql = '{% macro macro_b() %}b{% endmacro %}'
+    macro_manifest = MacroManifest({m.unique_id: m for m in (macro_a, macro_b)})
+
+    model = mock_model()
+    ctx = providers.generate_runtime_model_context(
+        model=model, config=config_postgres, manifest=macro_manifest,
+    )
+    namespace = ctx['_macro_namespace']
+    # nothing is bound until a macro is called
+    assert namespace._generators == {}
+    assert get_rendered('{{ macro_a() }}', ctx, model) == 'ab'
+    assert set(namespace._generators) == {macro_a.unique_id, macro_b.unique_id}
+    # only the macros called by the model are dependencies
+    assert model.depends_on.macros == [macro_a.unique_id]
+    for template in ('{{ root.macro_b() }}', "{{ context['macro_b']() }}",
+                     '{% set f = macro_b %}{{ f() }}'):
+        assert get_rendered(template, ctx, model) == 'b'
+    assert namespace.get_from_package('root', 'macro_b') is namespace._generators[macro_b.unique_id]
+
+    # the layout is shared with the contexts of other nodes in the package
+    other_ctx = providers.generate_runtime_model_context(
+        model=mock_model(), config=config_postgres, manifest=macro_manifest,
+    )
+    assert other_ctx['macro_a'] is ctx['macro_a']
+    assert other_ctx['_macro_namespace'] is not namespace
+    assert other_ctx['_macro_namespace']._generators == {}
+
+
 def test_docs_runtime_context(config_postgres):
     ctx = docs.generate_runtime_docs_context(config_postgres, mock_model(), [], 'root')
     assert_has_keys(REQUIRED_DOCS_KEYS, MAYBE_KEYS, ctx)
@@ -422,14 +471,14 @@ def test_macro_namespace_duplicates(config_postgres, manifest_fx):
     mn = macros.MacroNamespaceBuilder(
         'root', 'search', MacroStack(), ['dbt_postgres', 'dbt']
     )
-    mn.add_macros(manifest_fx.macros.values(), {})
+    mn.add_macros(manifest_fx.macros.values())
 
     # same pkg, same name: error
     with pytest.raises(dbt.exceptions.CompilationException):
-        mn.add_macro(mock_macro('macro_a', 'root'), {})
+        mn.add_macro(mock_macro('macro_a', 'root'))
 
     # different pkg, same name: no error
-    mn.add_macros(mock_macro('macro_a', 'dbt'), {})
+    mn.add_macro(mock_macro('macro_a', 'dbt'))
 
 
 def test_macro_namespace(config_postgres, manifest_fx):
@@ -168,6 +168,10 @@ sample_values = [
     ParsingCompiling(),
     ParsingWritingManifest(),
     ParsingDone(),
+    WatchingForChanges(watcher='', path_count=0),
+    WatchDetectedChanges(path_count=0),
+    WatchReloadingConfig(),
+    WatchParseError(exc=''),
     ManifestDependenciesLoaded(),
     ManifestLoaderCreated(),
     ManifestLoaded(),
@@ -323,6 +327,9 @@ sample_values = [
     ServingDocsPort(address='', port=0),
     ServingDocsAccessInfo(port=''),
     ServingDocsExitInfo(),
+    ServerListening(socket_path=''),
+    ServerHandlingRequest(args=''),
+    ServerRequestFailed(exc=''),
     SeedHeader(header=''),
     SeedHeaderSeparator(len_header=0),
     RunResultWarning(resource_type='', node_name='', path=''),
@@ -362,6 +369,9 @@ sample_values = [
     PrintHookEndPassLine(source_name='', table_name='', index=0, total=0, execution_time=0, node_info={}),
     PrintCancelLine(conn_name=''),
     DefaultSelector(name=''),
+    ExecutionTimesNotRead(path='', exc=''),
+    ExecutionHistoryNotWritten(path='', exc=''),
+    CompilePoolStarted(workers=0, nodes=0, introspective=0),
     NodeStart(unique_id='', node_info={}),
     NodeCompiling(unique_id='', node_info={}),
     NodeExecuting(unique_id='', node_info={}),
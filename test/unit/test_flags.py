@@ -79,6 +79,21 @@ class TestFlags(TestCase):
         os.environ.pop('DBT_WRITE_JSON')
         delattr(self.args, 'write_json')
 
+        # write_history
+        self.user_config.write_history = False
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.WRITE_HISTORY, False)
+        os.environ['DBT_WRITE_HISTORY'] = 'true'
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.WRITE_HISTORY, True)
+        setattr(self.args, 'write_history', False)
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.WRITE_HISTORY, False)
+        # cleanup
+        os.environ.pop('DBT_WRITE_HISTORY')
+        delattr(self.args, 'write_history')
+        self.user_config.write_history = None
+
         # partial_parse
         self.user_config.partial_parse = True
         flags.set_from_args(self.args, self.user_config)
@@ -168,6 +183,102 @@ class TestFlags(TestCase):
         delattr(self.args, 'fail_fast')
         self.user_config.fail_fast = False
 
+        # strict_partial_parse
+        self.user_config.strict_partial_parse = True
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.STRICT_PARTIAL_PARSE, True)
+        os.environ['DBT_STRICT_PARTIAL_PARSE'] = 'false'
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.STRICT_PARTIAL_PARSE, False)
+        setattr(self.args, 'strict_partial_parse', True)
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.STRICT_PARTIAL_PARSE, True)
+        # cleanup
+        os.environ.pop('DBT_STRICT_PARTIAL_PARSE')
+        delattr(self.args, 'strict_partial_parse')
+        self.user_config.strict_partial_parse = None
+        flags.STRICT_PARTIAL_PARSE = False
+
+        # parse_workers
+        self.user_config.parse_workers = 4
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.PARSE_WORKERS, 4)
+        os.environ['DBT_PARSE_WORKERS'] = '2'
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.PARSE_WORKERS, 2)
+        setattr(self.args, 'parse_workers', 8)
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.PARSE_WORKERS, 8)
+        # cleanup
+        os.environ.pop('DBT_PARSE_WORKERS')
+        delattr(self.args, 'parse_workers')
+        self.user_config.parse_workers = None
+        flags.PARSE_WORKERS = 1
+
+        # compile_workers
+        self.user_config.compile_workers = 4
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.COMPILE_WORKERS, 4)
+        os.environ['DBT_COMPILE_WORKERS'] = '2'
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.COMPILE_WORKERS, 2)
+        setattr(self.args, 'compile_workers', 8)
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.COMPILE_WORKERS, 8)
+        # cleanup
+        os.environ.pop('DBT_COMPILE_WORKERS')
+        delattr(self.args, 'compile_workers')
+        self.user_config.compile_workers = None
+        flags.COMPILE_WORKERS = 1
+
+        # artifact_compression
+        self.user_config.artifact_compression = 'gzip'
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.ARTIFACT_COMPRESSION, 'gzip')
+        os.environ['DBT_ARTIFACT_COMPRESSION'] = 'ZSTD'
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.ARTIFACT_COMPRESSION, 'zstd')
+        setattr(self.args, 'artifact_compression', 'none')
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.ARTIFACT_COMPRESSION, 'none')
+        # cleanup
+        os.environ.pop('DBT_ARTIFACT_COMPRESSION')
+        delattr(self.args, 'artifact_compression')
+        self.user_config.artifact_compression = None
+        flags.ARTIFACT_COMPRESSION = 'none'
+
+        # artifact_format
+        self.user_config.artifact_format = 'both'
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.ARTIFACT_FORMAT, 'both')
+        os.environ['DBT_ARTIFACT_FORMAT'] = 'msgpack'
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.ARTIFACT_FORMAT, 'msgpack')
+        setattr(self.args, 'artifact_format', 'json')
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.ARTIFACT_FORMAT, 'json')
+        # cleanup
+        os.environ.pop('DBT_ARTIFACT_FORMAT')
+        delattr(self.args, 'artifact_format')
+        self.user_config.artifact_format = None
+        flags.ARTIFACT_FORMAT = 'json'
+
+        # scheduling
+        self.user_config.scheduling = 'critical-path'
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.SCHEDULING, 'critical-path')
+        os.environ['DBT_SCHEDULING'] = 'depth'
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.SCHEDULING, 'depth')
+        setattr(self.args, 'scheduling', 'critical-path')
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.SCHEDULING, 'critical-path')
+        # cleanup
+        os.environ.pop('DBT_SCHEDULING')
+        delattr(self.args, 'scheduling')
+        self.user_config.scheduling = None
+        flags.SCHEDULING = 'depth'
+
         # send_anonymous_usage_stats
         self.user_config.send_anonymous_usage_stats = True
         flags.set_from_args(self.args, self.user_config)
@@ -1,7 +1,11 @@
 import os
+import shutil
+import tempfile
 import unittest
 from unittest.mock import MagicMock, patch
 
+import networkx as nx
+
 from dbt.adapters.postgres import Plugin as PostgresPlugin
 from dbt.adapters.factory import reset_adapters, register_adapter
 import dbt.clients.system
@@ -13,9 +17,9 @@ import dbt.config
 import dbt.utils
 import dbt.parser.manifest
 from dbt import tracking
-from dbt.contracts.files import SourceFile, FileHash, FilePath
+from dbt.contracts.files import SourceFile, FileHash, FilePath, ParseFileType
 from dbt.contracts.graph.manifest import MacroManifest, ManifestStateCheck
-from dbt.graph import NodeSelector, parse_difference
+from dbt.graph import Graph, NodeSelector, parse_difference
 
 try:
     from queue import Empty
@@ -28,15 +32,17 @@ from .utils import config_from_parts_or_dicts, generate_name_macros, inject_plug
 class GraphTest(unittest.TestCase):
 
     def tearDown(self):
-        self.mock_filesystem_search.stop()
+        self.discover_files.stop()
         self.mock_hook_constructor.stop()
         self.load_state_check.stop()
         self.load_source_file_patcher.stop()
         reset_adapters()
+        shutil.rmtree(self.target_path)
 
     def setUp(self):
         # create various attributes
         self.graph_result = None
+        self.target_path = tempfile.mkdtemp()
         tracking.do_not_track()
         self.profile = {
             'outputs': {
@@ -55,18 +61,20 @@ class GraphTest(unittest.TestCase):
         }
         self.macro_manifest = MacroManifest(
             {n.unique_id: n for n in generate_name_macros('test_models_compile')})
-        self.mock_models = []  # used by filesystem_searcher
-
-        # Create file filesystem searcher
-        self.filesystem_search = patch('dbt.parser.read_files.filesystem_search')
-        def mock_filesystem_search(project, relative_dirs, extension):
-            if 'sql' not in extension:
-                return []
-            if 'models' not in relative_dirs:
-                return []
-            return [model.path for model in self.mock_models]
-        self.mock_filesystem_search = self.filesystem_search.start()
-        self.mock_filesystem_search.side_effect = mock_filesystem_search
+        self.mock_models = []  # used by discover_files
+
+        # Create file discovery patcher
+        self.discover_files = patch('dbt.parser.read_files.discover_files')
+        def mock_discover_files(project):
+            if 'models' not in project.model_paths:
+                return {}
+            return {
+                'ModelParser': [
+                    (model.path, ParseFileType.Model, None) for model in self.mock_models
+                ]
+            }
+        self.mock_discover_files = self.discover_files.start()
+        self.mock_discover_files.side_effect = mock_discover_files
 
         # Create HookParser patcher
         self.hook_patcher = patch.object(
@@ -98,7 +106,7 @@ class GraphTest(unittest.TestCase):
         # Create the source file patcher
         self.load_source_file_patcher = patch('dbt.parser.read_files.load_source_file')
         self.mock_source_file = self.load_source_file_patcher.start()
-        def mock_load_source_file(path, parse_file_type, project_name, saved_files):
+        def mock_load_source_file(path, parse_file_type, project_name, saved_files, stat=None):
             for sf in self.mock_models:
                 if sf.path == path:
                     source_file = sf
@@ -127,6 +135,7 @@ class GraphTest(unittest.TestCase):
             'version': '0.1',
             'profile': 'test',
             'project-root': os.path.abspath('.'),
+            'target-path': self.target_path,
             'config-version': 2,
         }
         cfg.update(extra_cfg)
@@ -328,3 +337,69 @@ class GraphTest(unittest.TestCase):
         manifest.metadata.dbt_version = '99999.99.99'
         is_partial_parsable, _ = loader.is_partial_parsable(manifest)
         self.assertFalse(is_partial_parsable)
+
+
+class SubsetGraphTest(unittest.TestCase):
+    def assert_subset_edges(self, edges, selected, expected):
+        graph = Graph(nx.DiGraph(edges))
+        subset = graph.get_subset_graph(selected)
+        self.assertEqual(set(subset.nodes()), set(selected))
+        self.assertEqual(set(subset.graph.edges()), expected)
+        # the node removal that's used when there are cycles agrees
+        removal = graph._get_subset_graph_with_cycles(set(selected))
+        self.assertEqual(set(removal.graph.edges()), expected)
+
+    def test__transitive_edges(self):
+        edges = [('a', 'b'), ('b', 'c'), ('c', 'd'), ('a', 'e'), ('e', 'd')]
+        self.assert_subset_edges(edges, ['a', 'd'], {('a', 'd')})
+        self.assert_subset_edges(edges, ['a', 'c', 'd'], {('a', 'c'), ('c', 'd'), ('a', 'd')})
+        self.assert_subset_edges(edges, ['b', 'e'], set())
+
+    def test__hub(self):
+        edges = [('source', f'stg_{idx}') for idx in range(20)]
+        edges += [(f'stg_{idx}', 'mart') for idx in range(20)]
+        self.assert_subset_edges(edges, ['source', 'mart'], {('source', 'mart')})
+        self.assert_subset_edges(
+            edges, ['source', 'stg_3', 'mart'],
+            {('source', 'stg_3'), ('stg_3', 'mart'), ('source', 'mart')}
+        )
+
+    def test__cycle(self):
+        graph = Graph(nx.DiGraph([('a', 'b'), ('b', 'c'), ('c', 'b'), ('c', 'd')]))
+        subset = graph.get_subset_graph(['a', 'd'])
+        self.assertEqual(set(subset.graph.edges()), {('a', 'd')})
+
+    def test__missing_node(self):
+        graph = Graph(nx.DiGraph([('a', 'b')]))
+        with self.assertRaises(ValueError):
+            graph.get_subset_graph(['a', 'missing'])
+
+
+class ReachabilityTest(unittest.TestCase):
+    def setUp(self):
+        # a -> b -> d, a -> c -> d -> e, f
+        self.graph = Graph(nx.DiGraph([
+            ('a', 'b'), ('a', 'c'), ('b', 'd'), ('c', 'd'), ('d', 'e')
+        ]))
+        self.graph.graph.add_node('f')
+
+    def test__ancestors_and_descendants(self):
+        self.assertEqual(self.graph.ancestors('d'), {'a', 'b', 'c'})
+        self.assertEqual(self.graph.descendants('b'), {'d', 'e'})
+        self.assertEqual(self.graph.ancestors('f'), set())
+        self.assertEqual(self.graph.get_dependent_nodes('c'), {'d', 'e'})
+        self.assertEqual(self.graph.select_parents({'b', 'e'}), {'a', 'b', 'c', 'd'})
+        self.assertEqual(self.graph.select_children({'b', 'c'}), {'d', 'e'})
+        # a depth is answered with a search
+        self.assertEqual(self.graph.ancestors('e', max_depth=2), {'b', 'c', 'd'})
+        self.assertEqual(self.graph.select_children({'a'}, max_depth=1), {'b', 'c'})
+
+    def test__missing_node(self):
+        with self.assertRaises(dbt.exceptions.InternalException):
+            self.graph.select_parents({'a', 'missing'})
+
+    def test__cycle(self):
+        graph = Graph(nx.DiGraph([('a', 'b'), ('b', 'c'), ('c', 'b'), ('c', 'd')]))
+        self.assertEqual(graph.descendants('a'), {'b', 'c', 'd'})
+        self.assertEqual(graph.ancestors('d'), {'a', 'b', 'c'})
+        self.assertIsNone(graph.reachability)
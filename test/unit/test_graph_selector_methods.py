@@ -755,6 +755,23 @@ def test_select_test_type(manifest):
         'view_test_nothing'}
 
 
+def test_select_index_after_manifest_changes(manifest, view_model, table_model):
+    methods = MethodManager(manifest, None)
+    method = methods.get_method('tag', [])
+    # the methods share the index
+    assert methods.get_method('fqn', []).index is method.index
+
+    assert search_manifest_using_method(manifest, method, 'uses_ephemeral') == {
+        'view_model', 'table_model'}
+    manifest.update_node(view_model.replace(tags=['changed']))
+    assert search_manifest_using_method(manifest, method, 'uses_ephemeral') == {
+        'table_model'}
+    assert search_manifest_using_method(manifest, method, 'changed') == {
+        'view_model'}
+    manifest.remove_node(table_model.unique_id)
+    assert not search_manifest_using_method(manifest, method, 'uses_ephemeral')
+
+
 def test_select_exposure(manifest):
     exposure = make_exposure('test', 'my_exposure')
     manifest.exposures[exposure.unique_id] = exposure
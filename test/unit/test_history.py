@@ -0,0 +1,110 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from dbt.contracts.results import RunExecutionResult, RunResult, RunStatus, TimingInfo
+from dbt.history import ExecutionHistory, percentile
+
+
+def _result(unique_id, execution_time, status=RunStatus.Success):
+    return RunResult(
+        node=mock.MagicMock(unique_id=unique_id),
+        status=status,
+        timing=[
+            TimingInfo(
+                name='execute',
+                started_at=datetime(2022, 1, 1, 0, 0, 0),
+                completed_at=datetime(2022, 1, 1, 0, 0, 2),
+            ),
+        ],
+        thread_id='Thread-1',
+        execution_time=execution_time,
+        adapter_response={'_message': 'SELECT 3', 'rows_affected': 3},
+        message='SELECT 3',
+        failures=None,
+    )
+
+
+def _execution_result(results, which='run'):
+    return RunExecutionResult(
+        results=results,
+        elapsed_time=sum(result.execution_time for result in results),
+        args={'which': which},
+    )
+
+
+class TestExecutionHistory(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tempdir, 'run_history.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_record(self):
+        with ExecutionHistory(self.path) as history:
+            history.record(_execution_result([_result('model.a', 2.0)]), 'first')
+        with ExecutionHistory(self.path) as history:
+            history.record(_execution_result([_result('model.a', 4.0)]), 'second')
+
+        connection = sqlite3.connect(self.path)
+        try:
+            invocations = connection.execute(
+                'SELECT invocation_id, command FROM invocations ORDER BY id'
+            ).fetchall()
+            rows = connection.execute(
+                'SELECT unique_id, status, execution_time, execute_started_at, '
+                'execute_completed_at, rows_affected FROM node_results'
+            ).fetchall()
+        finally:
+            connection.close()
+        self.assertEqual(invocations, [('first', 'run'), ('second', 'run')])
+        self.assertEqual(rows, [
+            ('model.a', 'success', 2.0, 1640995200.0, 1640995202.0, 3),
+            ('model.a', 'success', 4.0, 1640995200.0, 1640995202.0, 3),
+        ])
+
+    def test_get_percentiles(self):
+        with ExecutionHistory(self.path) as history:
+            for execution_time in (1.0, 2.0, 3.0, 4.0, 5.0):
+                history.record(_execution_result([
+                    _result('model.a', execution_time),
+                    _result('model.b', 0.0, status=RunStatus.Skipped),
+                ]), 'id')
+            history.record(_execution_result([_result('model.a', 100.0)], 'compile'), 'id')
+
+            self.assertEqual(
+                history.get_percentiles([0, 50, 100]),
+                {'model.a': [1.0, 3.5, 100.0]},
+            )
+            self.assertEqual(
+                history.get_percentiles([50], exclude_commands=['compile']),
+                {'model.a': [3.0]},
+            )
+            # the latest results
+            self.assertEqual(
+                history.get_percentiles([50], recent=2, exclude_commands=['compile']),
+                {'model.a': [4.5]},
+            )
+            self.assertEqual(history.get_percentiles(unique_ids=['model.b']), {})
+            self.assertEqual(
+                history.get_percentiles(
+                    [50], unique_ids=['model.a', 'model.c'], recent=3,
+                    exclude_commands=['compile']
+                ),
+                {'model.a': [4.0]},
+            )
+            # the ids of the previous query are replaced
+            self.assertEqual(
+                history.get_percentiles([100], unique_ids=iter(['model.a']), recent=1),
+                {'model.a': [100.0]},
+            )
+
+    def test_percentile(self):
+        self.assertEqual(percentile([1.0], 90), 1.0)
+        self.assertEqual(percentile([1.0, 2.0, 3.0, 4.0], 50), 2.5)
+        self.assertAlmostEqual(percentile([1.0, 2.0, 3.0, 4.0], 90), 3.7)
@@ -4,6 +4,7 @@ import unittest
 from unittest import mock
 
 from dbt import compilation
+from dbt.node_types import NodeType
 try:
     from queue import Empty
 except ImportError:
@@ -63,11 +64,13 @@ class LinkerTest(unittest.TestCase):
         """test join() without timeout risk"""
         self.assertEqual(queue.inner.unfinished_tasks, 0)
 
-    def _get_graph_queue(self, manifest, include=None, exclude=None):
+    def _get_graph_queue(
+        self, manifest, include=None, exclude=None, execution_times=None, pool_limits=None
+    ):
         graph = compilation.Graph(self.linker.graph)
         selector = NodeSelector(graph, manifest)
         spec = parse_difference(include, exclude)
-        return selector.get_graph_queue(spec)
+        return selector.get_graph_queue(spec, execution_times, pool_limits)
 
     def test_linker_add_dependency(self):
         actual_deps = [('A', 'B'), ('A', 'C'), ('B', 'C')]
@@ -165,6 +168,94 @@ class LinkerTest(unittest.TestCase):
         queue_2.mark_done('A')
         self.assert_would_join(queue_2)
 
+    def test_linker_critical_path_scheduling(self):
+        # B -> A and D -> C -> E
+        actual_deps = [('A', 'B'), ('C', 'D'), ('E', 'C')]
+
+        for (l, r) in actual_deps:
+            self.linker.dependency(l, r)
+
+        # without execution times, the roots are given out by depth
+        queue = self._get_graph_queue(_mock_manifest('ABCDE'))
+        self.assertEqual(queue.get(block=False).unique_id, 'B')
+
+        # D's chain takes 3 seconds and B's 2
+        execution_times = {'A': 0.5, 'B': 1.5, 'C': 1.0, 'D': 1.0, 'E': 1.0}
+        queue = self._get_graph_queue(_mock_manifest('ABCDE'), execution_times=execution_times)
+        self.assertEqual(queue.get(block=False).unique_id, 'D')
+        self.assertEqual(queue.get(block=False).unique_id, 'B')
+        queue.mark_done('B')
+        queue.mark_done('D')
+        self.assertEqual(queue.get(block=False).unique_id, 'C')
+        self.assertEqual(queue.get(block=False).unique_id, 'A')
+
+        # nodes without execution times fall back to depth
+        queue = self._get_graph_queue(_mock_manifest('ABCDE'), execution_times={'A': 0.5})
+        self.assertEqual(queue.get(block=False).unique_id, 'B')
+        self.assertEqual(queue.get(block=False).unique_id, 'D')
+        queue.mark_done('D')
+        self.assertEqual(queue.get(block=False).unique_id, 'C')
+
+    def test_linker_concurrency_pools(self):
+        for node in 'ABC':
+            self.linker.add_node(node)
+
+        # A and B are in the heavy pool, which runs one node at a time
+        pools = {'A': 'heavy', 'B': 'heavy'}
+        manifest = _mock_manifest('ABC')
+        manifest.expect.side_effect = lambda n: mock.MagicMock(
+            unique_id=n, config=mock.MagicMock(concurrency_pool=pools.get(n))
+        )
+        queue = self._get_graph_queue(manifest, pool_limits={'heavy': 1})
+
+        with mock.patch('dbt.graph.queue.time.monotonic', side_effect=[10.0, 12.5]):
+            self.assertEqual(queue.get(block=False).unique_id, 'A')
+            # B waits for A
+            self.assertEqual(queue.get(block=False).unique_id, 'C')
+            with self.assertRaises(Empty):
+                queue.get(block=False)
+            self.assertFalse(queue.empty())
+            queue.mark_done('C')
+            with self.assertRaises(Empty):
+                queue.get(block=False)
+            queue.mark_done('A')
+            self.assertEqual(queue.get(block=False).unique_id, 'B')
+            self.assertTrue(queue.empty())
+            queue.mark_done('B')
+            self.assert_would_join(queue)
+
+        self.assertEqual(queue.pool_stats['heavy'].nodes, 2)
+        self.assertEqual(queue.pool_stats['heavy'].slot_wait_time, 2.5)
+
+    def test_linker_add_test_edges(self):
+        nodes = {
+            'model.a': (NodeType.Model, []),
+            'model.b': (NodeType.Model, ['model.a']),
+            'model.c': (NodeType.Model, ['model.a', 'model.b']),
+            'model.d': (NodeType.Model, ['model.c']),
+            'test.a': (NodeType.Test, ['model.a']),
+            'test.b': (NodeType.Test, ['model.b']),
+            'test.c_a': (NodeType.Test, ['model.c', 'model.a']),
+        }
+        manifest = mock.MagicMock(nodes={
+            unique_id: mock.MagicMock(resource_type=resource_type, depends_on_nodes=parents)
+            for unique_id, (resource_type, parents) in nodes.items()
+        })
+        for unique_id, (_, parents) in nodes.items():
+            self.linker.add_node(unique_id)
+            for parent in parents:
+                self.linker.dependency(unique_id, parent)
+        # not executable
+        self.linker.dependency('exposure.e', 'model.b')
+
+        compilation.Compiler.add_test_edges(None, self.linker, manifest)
+
+        # model.c and model.d are downstream of model.b, so they run after
+        # test.a without edges of their own
+        self.assertEqual(list(self.linker.graph.successors('test.a')), ['model.b'])
+        self.assertEqual(list(self.linker.graph.successors('test.b')), ['model.c'])
+        self.assertEqual(list(self.linker.graph.successors('test.c_a')), ['model.d'])
+
     def test__find_cycles__cycles(self):
         actual_deps = [('A', 'B'), ('B', 'C'), ('C', 'A')]
 
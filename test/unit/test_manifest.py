@@ -3,17 +3,27 @@ import unittest
 from unittest import mock
 
 import copy
+import json
+import shutil
+import tempfile
 from collections import namedtuple
 from itertools import product
 from datetime import datetime
 
 import pytest
 
+import dbt.clients.system
+import dbt.contracts.util
 import dbt.flags
+import dbt.utils
 import dbt.version
 from dbt import tracking
-from dbt.contracts.files import FileHash
-from dbt.contracts.graph.manifest import Manifest, ManifestMetadata
+from dbt.clients.jinja import get_rendered
+from dbt.context.base import BaseContext
+from dbt.contracts.files import FileHash, FilePath, SchemaSourceFile, SourceFile
+from dbt.contracts.graph.manifest import (
+    Manifest, ManifestMetadata, ParentChildLookup, WritableManifest
+)
 from dbt.contracts.graph.parsed import (
     ParsedModelNode,
     DependsOn,
@@ -411,6 +421,304 @@ class ManifestTest(unittest.TestCase):
         for node in flat_nodes.values():
             self.assertEqual(frozenset(node), REQUIRED_PARSED_NODE_KEYS)
 
+    def test__flat_graph_is_lazy(self):
+        nodes = copy.copy(self.nested_nodes)
+        manifest = Manifest(nodes=nodes, sources={}, macros={}, docs={},
+                            disabled={}, files={}, exposures={}, selectors={})
+        with mock.patch.object(ParsedModelNode, 'to_dict', autospec=True) as to_dict:
+            to_dict.side_effect = lambda node, omit_none: {'name': node.name}
+            manifest.build_flat_graph()
+            flat_nodes = manifest.flat_graph['nodes']
+            self.assertEqual(set(flat_nodes), set(nodes))
+            self.assertEqual(to_dict.call_count, 0)
+
+            self.assertEqual(flat_nodes['model.root.multi'], {'name': 'multi'})
+            self.assertIs(flat_nodes['model.root.multi'], flat_nodes['model.root.multi'])
+            self.assertEqual(to_dict.call_count, 1)
+
+            # the entry is serialized again after the node is updated
+            manifest.update_node(nodes['model.root.multi'].replace(name='updated'))
+            self.assertEqual(flat_nodes['model.root.multi'], {'name': 'updated'})
+            self.assertEqual(to_dict.call_count, 2)
+
+    def test__flat_graph_jinja(self):
+        manifest = Manifest(nodes=copy.copy(self.nested_nodes), sources={}, macros={}, docs={},
+                            disabled={}, files={}, exposures={}, selectors={})
+        manifest.build_flat_graph()
+        graph = manifest.flat_graph
+        expected = {
+            'exposures': {},
+            'metrics': {},
+            'nodes': {
+                unique_id: node.to_dict(omit_none=False)
+                for unique_id, node in self.nested_nodes.items()
+            },
+            'sources': {},
+        }
+
+        def render(template):
+            return get_rendered(template, {'graph': graph, 'tojson': BaseContext.tojson})
+
+        self.assertEqual(json.loads(render('{{ graph | tojson }}')), expected)
+        self.assertEqual(json.loads(render('{{ tojson(graph) }}')), expected)
+        self.assertEqual(json.loads(render('{{ tojson(graph.nodes.copy()) }}')), expected['nodes'])
+        self.assertEqual(
+            render("{{ graph.nodes.values() | selectattr('name', 'equalto', 'multi') "
+                   "| map(attribute='unique_id') | list }}"),
+            "['model.root.multi']"
+        )
+        self.assertEqual(
+            render("{% for uid, node in graph['nodes'].items() if node.name == 'dep' %}"
+                   "{{ uid }}{% endfor %}"),
+            'model.root.dep'
+        )
+        self.assertEqual(
+            render("{{ graph.nodes.get('model.root.dep').name }} {{ graph.sources | length }}"),
+            'dep 0'
+        )
+        self.assertEqual(copy.deepcopy(graph), expected)
+
+    def test_deepcopy_copies_on_write(self):
+        source_file = SourceFile(
+            path=FilePath(project_root='/root', searched_path='models',
+                          relative_path='multi.sql', modification_time=0.0),
+            checksum=FileHash.empty(),
+            project_name='root',
+        )
+        source_file.nodes.append('model.root.multi')
+        nodes = copy.copy(self.nested_nodes)
+        manifest = Manifest(nodes=nodes, sources={}, macros={}, docs={}, disabled={},
+                            files={source_file.file_id: source_file}, exposures={},
+                            selectors={})
+        manifest_copy = manifest.deepcopy()
+        self.assertIsNot(manifest_copy.nodes, manifest.nodes)
+        self.assertIs(manifest_copy.nodes['model.root.multi'], nodes['model.root.multi'])
+        self.assertIs(manifest_copy.files[source_file.file_id], source_file)
+
+        updated = nodes['model.root.multi'].replace(description='updated')
+        manifest_copy.update_node(updated)
+        self.assertIs(manifest_copy.nodes['model.root.multi'], updated)
+        self.assertEqual(manifest.nodes['model.root.multi'].description, '')
+
+        # the copy copies the shared file before adding the node to it
+        new_node = nodes['model.root.multi'].replace(unique_id='model.root.new', name='new')
+        manifest_copy.add_node(source_file, new_node)
+        copied_file = manifest_copy.files[source_file.file_id]
+        self.assertIsNot(copied_file, source_file)
+        self.assertEqual(copied_file.nodes, ['model.root.multi', 'model.root.new'])
+        self.assertEqual(source_file.nodes, ['model.root.multi'])
+        self.assertNotIn('model.root.new', manifest.nodes)
+
+        # and so does the original manifest
+        other_node = new_node.replace(unique_id='model.root.other', name='other')
+        manifest.add_node(source_file, other_node)
+        self.assertIsNot(manifest.files[source_file.file_id], source_file)
+        self.assertEqual(source_file.nodes, ['model.root.multi'])
+        self.assertEqual(copied_file.nodes, ['model.root.multi', 'model.root.new'])
+
+    def test_parent_and_child_maps_are_updated(self):
+        source_file = SourceFile(
+            path=FilePath(project_root='/root', searched_path='models',
+                          relative_path='multi.sql', modification_time=0.0),
+            checksum=FileHash.empty(),
+            project_name='root',
+        )
+        manifest = Manifest(nodes=copy.copy(self.nested_nodes), sources={}, macros={},
+                            docs={}, disabled={}, files={source_file.file_id: source_file},
+                            exposures={}, selectors={})
+        manifest.build_parent_and_child_maps()
+        self.assertEqual(manifest.child_map['model.root.events'],
+                         ['model.root.dep', 'model.root.sibling'])
+
+        with mock.patch.object(ParentChildLookup, 'populate') as populate:
+            manifest.remove_node('model.root.sibling')
+            new_node = self.nested_nodes['model.root.dep'].replace(
+                unique_id='model.root.new', name='new',
+                depends_on=DependsOn(nodes=['model.root.events', 'model.root.dep']),
+            )
+            manifest.add_node(source_file, new_node)
+            manifest.update_node(self.nested_nodes['model.root.nested'].replace(
+                depends_on=DependsOn(nodes=['model.root.new']),
+            ))
+            manifest.build_parent_and_child_maps()
+            self.assertEqual(manifest.child_map['model.root.events'],
+                             ['model.root.dep', 'model.root.new'])
+            self.assertEqual(manifest.child_map['model.root.dep'], ['model.root.new'])
+            self.assertEqual(manifest.child_map['model.root.new'], ['model.root.nested'])
+            self.assertEqual(manifest.parent_map['model.root.new'],
+                             ['model.root.dep', 'model.root.events'])
+            # partial parsing looks up the children of removed nodes
+            self.assertEqual(manifest.child_map['model.root.sibling'], ['model.root.multi'])
+            populate.assert_not_called()
+
+        writable = manifest.writable_manifest()
+        self.assertNotIn('model.root.sibling', writable.parent_map)
+        self.assertEqual(writable.parent_map['model.root.multi'],
+                         ['model.root.nested', 'model.root.sibling'])
+        self.assertEqual(writable.child_map['model.root.nested'], ['model.root.multi'])
+
+    def test_deserialized_manifest_can_add_nodes(self):
+        source_file = SourceFile(
+            path=FilePath(project_root='/root', searched_path='models',
+                          relative_path='multi.sql', modification_time=0.0),
+            checksum=FileHash.empty(),
+            project_name='root',
+        )
+        manifest = Manifest(nodes={}, sources={}, macros={}, docs={}, disabled={},
+                            files={source_file.file_id: source_file}, exposures={},
+                            selectors={})
+        manifest = Manifest.from_msgpack(manifest.to_msgpack())
+        manifest.add_node(manifest.files[source_file.file_id], self.nested_nodes['model.root.multi'])
+        self.assertIn('model.root.multi', manifest.nodes)
+
+    def test_compact(self):
+        # like nodes read from partial_parse.msgpack, which share nothing
+        nodes = {
+            unique_id: type(node).from_dict(json.loads(json.dumps(node.to_dict())))
+            for unique_id, node in self.nested_nodes.items()
+        }
+        manifest = Manifest(nodes=nodes, sources={}, macros={}, docs={}, disabled={},
+                            files={}, exposures={}, selectors={})
+        expected = manifest.writable_manifest().to_dict()
+        first = nodes['model.root.dep']
+        second = nodes['model.root.sibling']
+        self.assertIsNot(first.config, second.config)
+        self.assertIsNot(first.depends_on.nodes[0], second.depends_on.nodes[0])
+
+        manifest.compact()
+        self.assertIs(first.config, second.config)
+        self.assertIs(first.depends_on.nodes[0], second.depends_on.nodes[0])
+        self.assertIs(first.database, second.database)
+        self.assertEqual(manifest.writable_manifest().to_dict(), expected)
+
+    def test_iter_json(self):
+        manifest = Manifest(nodes=copy.copy(self.nested_nodes), sources={}, macros={}, docs={},
+                            disabled={}, files={}, exposures={}, selectors={})
+        manifest.build_parent_and_child_maps()
+        writable = manifest.writable_manifest()
+        expected = json.dumps(writable.to_dict(omit_none=False), cls=dbt.utils.JSONEncoder)
+        self.assertEqual(''.join(writable.iter_json()), expected)
+
+    def test_read_lazily(self):
+        manifest = Manifest(nodes=copy.copy(self.nested_nodes), sources={}, macros={}, docs={},
+                            disabled={}, files={}, exposures={}, selectors={})
+        manifest.build_parent_and_child_maps()
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp_dir, 'manifest.json')
+            manifest.write(path)
+            self.assertTrue(os.path.exists(path + '.index'))
+            expected = WritableManifest.read_and_check_versions(path).to_dict()
+
+            lazy = WritableManifest.read_lazily(path)
+            self.assertIn('model.root.multi', lazy.nodes)
+            self.assertNotIn('model.root.missing', lazy.nodes)
+            self.assertEqual(lazy.nodes['model.root.multi'].name, 'multi')
+            self.assertEqual(lazy.to_dict(), expected)
+
+            # artifacts that were written without an index are scanned
+            os.remove(path + '.index')
+            dbt.contracts.util._artifact_indexes.clear()
+            self.assertEqual(WritableManifest.read_lazily(path).to_dict(), expected)
+
+            # and so are artifacts that changed since their index was written
+            manifest.write(path)
+            index = dbt.clients.system.load_file_contents(path + '.index')
+            manifest.metadata.project_id = 'a' * 32
+            manifest.write(path, 'gzip')
+            dbt.clients.system.write_file(path + '.index', index)
+            dbt.contracts.util._artifact_indexes.clear()
+            lazy = WritableManifest.read_lazily(path + '.gz')
+            self.assertEqual(lazy.metadata.project_id, 'a' * 32)
+            self.assertEqual(lazy.nodes['model.root.multi'].name, 'multi')
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_write_msgpack(self):
+        manifest = Manifest(nodes=copy.copy(self.nested_nodes), sources={}, macros={}, docs={},
+                            disabled={}, files={}, exposures={}, selectors={})
+        manifest.build_parent_and_child_maps()
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp_dir, 'manifest.json')
+            msgpack_path = os.path.join(tmp_dir, 'manifest.msgpack')
+            manifest.write(path, artifact_format='both')
+            expected = WritableManifest.read_and_check_versions(path).to_dict()
+            self.assertEqual(
+                WritableManifest.read_and_check_versions(msgpack_path).to_dict(), expected
+            )
+            lazy = WritableManifest.read_lazily(msgpack_path)
+            self.assertEqual(lazy.nodes['model.root.multi'].name, 'multi')
+            self.assertEqual(lazy.to_dict(), expected)
+            self.assertEqual(dbt.clients.system.find_artifact(path), msgpack_path)
+
+            # the json artifact would be stale
+            manifest.write(path, artifact_format='msgpack')
+            self.assertEqual(sorted(os.listdir(tmp_dir)), ['manifest.msgpack'])
+            manifest.write(path)
+            self.assertEqual(sorted(os.listdir(tmp_dir)), ['manifest.json', 'manifest.json.index'])
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_write_unchanged(self):
+        manifest = Manifest(nodes=copy.copy(self.nested_nodes), sources={}, macros={}, docs={},
+                            disabled={}, files={}, exposures={}, selectors={})
+        manifest.build_parent_and_child_maps()
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp_dir, 'manifest.json')
+            manifest.write(path)
+            with mock.patch.object(Manifest, 'writable_manifest') as writable_manifest:
+                manifest.write(path)
+                writable_manifest.assert_not_called()
+                # the index is part of the artifact
+                os.remove(path + '.index')
+                manifest.write(path)
+                self.assertEqual(writable_manifest.call_count, 1)
+
+            manifest.write(path)
+            mtime = os.stat(path).st_mtime_ns
+            os.utime(path, ns=(mtime - 10**9, mtime - 10**9))
+            manifest.write(path)
+            self.assertGreaterEqual(os.stat(path).st_mtime_ns, mtime)
+
+            written = dbt.clients.system.load_file_contents(path)
+            manifest.update_node(manifest.nodes['model.root.multi'].replace(name='other'))
+            manifest.write(path)
+            self.assertNotEqual(dbt.clients.system.load_file_contents(path), written)
+
+            written = dbt.clients.system.load_file_contents(path)
+            manifest.metadata.project_id = 'a' * 32
+            manifest.mark_changed()
+            manifest.write(path)
+            self.assertNotEqual(dbt.clients.system.load_file_contents(path), written)
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_reset_for_partial_parse(self):
+        schema_file = SchemaSourceFile(
+            path=FilePath(project_root='/root', searched_path='models',
+                          relative_path='schema.yml', modification_time=0.0),
+            checksum=FileHash.empty(),
+            project_name='root',
+        )
+        schema_file.pp_dict = {'version': 2, 'models': [{'name': 'multi'}]}
+        schema_file.pp_test_index = {'models': {}}
+        manifest = Manifest(nodes=copy.copy(self.nested_nodes), sources={}, macros={},
+                            docs={}, disabled={}, files={schema_file.file_id: schema_file},
+                            exposures={}, selectors={})
+        manifest.build_flat_graph()
+        self.assertIsNotNone(manifest.ref_lookup.find('multi', 'root', manifest))
+        manifest._parsing_info.static_analysis_path_count = 3
+
+        manifest.reset_for_partial_parse()
+        self.assertEqual(manifest.flat_graph, {})
+        self.assertIsNone(manifest._ref_lookup)
+        self.assertEqual(manifest._parsing_info.static_analysis_path_count, 0)
+        self.assertIsNone(schema_file.pp_dict)
+        self.assertIsNone(schema_file.pp_test_index)
+        self.assertEqual(set(manifest.nodes), set(self.nested_nodes))
+
     @mock.patch.object(tracking, 'active_user')
     def test_metadata(self, mock_user):
         mock_user.id = 'cfc9500f-dc7f-4c83-9ea7-2c581c1b38cf'
@@ -1109,6 +1417,41 @@ def test_find_materialization_by_name(macros, adapter_type, expected):
         assert result.package_name == expected_package
 
 
+def test_find_macro_by_name_after_macros_change():
+    manifest = make_manifest(macros=[MockMacro('dep')])
+    assert manifest.find_macro_by_name('my_macro', 'root', None).package_name == 'dep'
+
+    # add_macro keeps the lookup up to date
+    root_macro = MockMacro('root')
+    manifest.add_macro(mock.MagicMock(macros=[]), root_macro)
+    assert manifest.find_macro_by_name('my_macro', 'root', None) is root_macro
+
+    # partial parsing removes macros from the dict directly
+    manifest.macros.pop(root_macro.unique_id)
+    assert manifest.find_macro_by_name('my_macro', 'root', None).package_name == 'dep'
+
+
+def test_find_materialization_by_name_is_cached():
+    manifest = make_manifest(macros=[MockMaterialization('dbt', adapter_type=None)])
+    kwargs = dict(
+        project_name='root', materialization_name='my_materialization', adapter_type='foo'
+    )
+    result = manifest.find_materialization_macro_by_name(**kwargs)
+    assert result.package_name == 'dbt'
+    with mock.patch.object(manifest, '_find_macros_by_name') as find_macros:
+        assert manifest.find_materialization_macro_by_name(**kwargs) is result
+        assert not find_macros.called
+
+    # a new override replaces the cached result
+    override = MockMaterialization('root', adapter_type='foo')
+    manifest.add_macro(mock.MagicMock(macros=[]), override)
+    assert manifest.find_materialization_macro_by_name(**kwargs) is override
+
+    # so does removing the cached macro
+    manifest.macros.pop(override.unique_id)
+    assert manifest.find_materialization_macro_by_name(**kwargs) is result
+
+
 FindNodeSpec = namedtuple('FindNodeSpec', 'nodes,sources,package,expected')
 
 
@@ -3,6 +3,8 @@ import unittest
 from unittest import mock
 
 import os
+import shutil
+import tempfile
 import yaml
 
 from copy import deepcopy
@@ -18,12 +20,17 @@ from dbt.parser import (
 from dbt.parser.schemas import (
     TestablePatchParser, SourceParser, AnalysisPatchParser, MacroPatchParser
 )
-from dbt.parser.search import FileBlock
+from dbt.parser.search import FileBlock, filesystem_search
+from dbt.parser.parallel import get_parallel_context, parse_files_in_parallel, shard_file_ids
+from dbt.parser.partial import PartialParsing
+from dbt.parser.read_files import (
+    read_files, discover_files, project_file_types, load_deferred_contents
+)
 from dbt.parser.generic_test_builders import YamlBlock
 from dbt.parser.sources import SourcePatcher
 
 from dbt.node_types import NodeType
-from dbt.contracts.files import SourceFile, FileHash, FilePath, SchemaSourceFile
+from dbt.contracts.files import SourceFile, FileHash, FilePath, SchemaSourceFile, ParseFileType
 from dbt.contracts.graph.manifest import Manifest
 from dbt.contracts.graph.model_config import (
     NodeConfig, TestConfig, SnapshotConfig
@@ -525,6 +532,100 @@ class ModelParserTest(BaseParserTest):
         with self.assertRaises(CompilationException):
             self.parser.parse_file(block)
 
+    def test_generate_name_vars_saved_in_file(self):
+        schema_macro = self.manifest.macros['macro.root.generate_schema_name']
+        schema_macro.macro_sql = (
+            '{% macro generate_schema_name(value, node) %}'
+            '{{ var("test_schema_name") }}'
+            '{% endmacro %}'
+        )
+        parser = ModelParser(self.snowplow_project_config, self.manifest, self.root_project_config)
+        block = self.file_block_for('select 1 as id', 'nested/model_1.sql')
+        block.file.parse_file_type = ParseFileType.Model
+        self.manifest.files[block.file.file_id] = block.file
+        parser.parse_file(block)
+
+        self.assertEqual(self.manifest.nodes['model.snowplow.model_1'].schema, 'foo')
+        self.assertEqual(block.file.vars, ['test_schema_name'])
+        # the model is renamed if the var changes
+        new_files = {block.file.file_id: SourceFile.from_dict(block.file.to_dict())}
+        partial_parsing = PartialParsing(self.manifest, new_files, {'test_schema_name'})
+        self.assertEqual(partial_parsing.file_diff['changed'], [block.file.file_id])
+
+
+class ParallelModelParserTest(BaseParserTest):
+    def file_block_for(self, data, filename):
+        return super().file_block_for(data, filename, 'models')
+
+    def build_manifest(self):
+        manifest = Manifest(
+            macros={m.unique_id: m for m in generate_name_macros('root')},
+        )
+        file_ids = []
+        for index in range(7):
+            if index == 3:
+                raw_sql = '{{ config(enabled=false) }}select 3 as id'
+            elif index == 5:
+                raw_sql = "select '{{ env_var(\'DBT_TEST_PARALLEL_PARSE\') }}' as id"
+            else:
+                raw_sql = f'{{{{ config(materialized="table") }}}}select {index} as id'
+            block = self.file_block_for(raw_sql, f'nested/model_{index}.sql')
+            block.file.parse_file_type = ParseFileType.Model
+            manifest.files[block.file.file_id] = block.file
+            file_ids.append(block.file.file_id)
+        return manifest, file_ids
+
+    @unittest.skipIf(get_parallel_context() is None, 'requires Linux')
+    @mock.patch.dict(os.environ, {'DBT_TEST_PARALLEL_PARSE': 'value'})
+    def test_parallel_matches_serial(self):
+        serial_manifest, file_ids = self.build_manifest()
+        parser = ModelParser(self.snowplow_project_config, serial_manifest, self.root_project_config)
+        for file_id in file_ids:
+            parser.parse_file(FileBlock(serial_manifest.files[file_id]))
+
+        parallel_manifest, file_ids = self.build_manifest()
+        parse_files_in_parallel(
+            self.snowplow_project_config, self.root_project_config, parallel_manifest,
+            ModelParser, file_ids, 3
+        )
+
+        self.assertEqual(list(parallel_manifest.nodes), list(serial_manifest.nodes))
+        for unique_id, node in serial_manifest.nodes.items():
+            assertEqualNodes(parallel_manifest.nodes[unique_id], node)
+        self.assertEqual(list(parallel_manifest.disabled), ['model.snowplow.model_3'])
+        for file_id in file_ids:
+            self.assertEqual(
+                parallel_manifest.files[file_id].nodes, serial_manifest.files[file_id].nodes
+            )
+            self.assertEqual(
+                parallel_manifest.files[file_id].env_vars, serial_manifest.files[file_id].env_vars
+            )
+        self.assertEqual(parallel_manifest.env_vars, {'DBT_TEST_PARALLEL_PARSE': 'value'})
+        self.assertEqual(
+            parallel_manifest._parsing_info.static_analysis_path_count,
+            serial_manifest._parsing_info.static_analysis_path_count
+        )
+
+    @unittest.skipIf(get_parallel_context() is None, 'requires Linux')
+    def test_parallel_parse_error(self):
+        manifest, file_ids = self.build_manifest()
+        manifest.files[file_ids[4]].contents = '{{ SYNTAX ERROR }}'
+        with self.assertRaises(CompilationException):
+            parse_files_in_parallel(
+                self.snowplow_project_config, self.root_project_config, manifest,
+                ModelParser, file_ids, 3
+            )
+
+    @mock.patch('sys.platform', 'darwin')
+    def test_no_parallel_context_off_linux(self):
+        self.assertIsNone(get_parallel_context())
+
+    def test_shard_file_ids(self):
+        self.assertEqual(
+            shard_file_ids(['a', 'b', 'c', 'd', 'e'], 3), [['a', 'b'], ['c', 'd'], ['e']]
+        )
+        self.assertEqual(shard_file_ids(['a'], 3), [['a']])
+
 
 class StaticModelParserTest(BaseParserTest):
     def setUp(self):
@@ -1092,3 +1193,127 @@ class AnalysisParserTest(BaseParserTest):
         self.assertEqual(self.parser.manifest.files[file_id].nodes, ['analysis.snowplow.analysis_1'])
 
 
+
+
+class ReadFilesTest(unittest.TestCase):
+    def setUp(self):
+        self.project_root = tempfile.mkdtemp()
+        for relative_path, contents in [
+            ('models/model_1.sql', 'select 1 as id'),
+            ('models/nested/model_2.sql', 'select 2 as id'),
+            ('models/schema.yml', 'version: 2\nmodels:\n  - name: model_1\n'),
+            ('models/other.yaml', 'version: 2\nmodels:\n  - name: model_2\n'),
+            ('models/.hidden.sql', 'select 3 as id'),
+            ('models/notes.txt', 'not a dbt file'),
+            ('macros/macros.sql', '{% macro my_macro() %}1{% endmacro %}'),
+            ('tests/singular.sql', 'select 1 where false'),
+            ('tests/generic/generic.sql', '{% test my_test(model) %}1{% endtest %}'),
+            ('seeds/seed.csv', 'a,b\n1,2\n'),
+        ]:
+            path = os.path.join(self.project_root, relative_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as fp:
+                fp.write(contents)
+        self.project = mock.MagicMock(
+            project_name='test',
+            project_root=self.project_root,
+            macro_paths=['macros'],
+            model_paths=['models'],
+            snapshot_paths=['snapshots'],
+            analysis_paths=['analyses'],
+            test_paths=['tests'],
+            generic_test_paths=[os.path.join('tests', 'generic')],
+            seed_paths=['seeds'],
+            docs_paths=['models', 'macros', 'seeds', 'snapshots', 'analyses'],
+            all_source_paths=['models', 'seeds', 'snapshots', 'analyses', 'macros'],
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.project_root, ignore_errors=True)
+
+    def test_read_files(self):
+        files = {}
+        parser_files = {}
+        perf_info = mock.MagicMock(discover_files_elapsed=None, load_files_elapsed=None)
+        read_files(self.project, files, parser_files, {}, perf_info)
+
+        project_files = parser_files['test']
+        self.assertEqual(project_files['MacroParser'], ['test://' + normalize('macros/macros.sql')])
+        self.assertEqual(
+            sorted(project_files['ModelParser']),
+            ['test://' + normalize('models/model_1.sql'), 'test://' + normalize('models/nested/model_2.sql')]
+        )
+        self.assertEqual(project_files['SingularTestParser'], ['test://' + normalize('tests/singular.sql')])
+        self.assertEqual(project_files['GenericTestParser'], ['test://' + normalize('tests/generic/generic.sql')])
+        self.assertEqual(project_files['SeedParser'], ['test://' + normalize('seeds/seed.csv')])
+        self.assertEqual(project_files['DocumentationParser'], [])
+        # .yml files are read before .yaml files
+        self.assertEqual(
+            project_files['SchemaParser'],
+            ['test://' + normalize('models/schema.yml'), 'test://' + normalize('models/other.yaml')]
+        )
+        self.assertEqual(len(files), 8)
+        model_1 = files['test://' + normalize('models/model_1.sql')]
+        self.assertEqual(model_1.contents, 'select 1 as id')
+        self.assertEqual(model_1.checksum, FileHash.from_contents('select 1 as id'))
+        self.assertGreater(model_1.path.modification_time, 0.0)
+        self.assertIsNotNone(perf_info.discover_files_elapsed)
+        self.assertIsNotNone(perf_info.load_files_elapsed)
+
+    def test_discover_files_matches_filesystem_search(self):
+        discovered = discover_files(self.project)
+        for parser_name, paths_attr, extensions, _ in project_file_types:
+            expected = []
+            for extension in extensions:
+                expected.extend(
+                    fp.original_file_path for fp in filesystem_search(
+                        self.project, getattr(self.project, paths_attr), extension
+                    )
+                )
+            if parser_name == 'SingularTestParser':
+                expected = [p for p in expected if 'generic' not in p]
+            self.assertEqual(
+                [fp.original_file_path for fp, _, _ in discovered[parser_name]], expected
+            )
+
+    def test_read_files_unchanged_stat(self):
+        saved_files = {}
+        read_files(self.project, saved_files, {}, {})
+
+        files = {}
+        parser_files = {}
+        with mock.patch('dbt.parser.read_files.load_file_contents') as load_file_contents:
+            read_files(self.project, files, parser_files, saved_files)
+            load_file_contents.assert_not_called()
+
+        model_id = 'test://' + normalize('models/model_1.sql')
+        self.assertIsNone(files[model_id].contents)
+        self.assertEqual(files[model_id].checksum, saved_files[model_id].checksum)
+        self.assertEqual(files[model_id].stat, saved_files[model_id].stat)
+        schema_id = 'test://' + normalize('models/schema.yml')
+        self.assertEqual(files[schema_id].dfy, saved_files[schema_id].dfy)
+
+        load_deferred_contents(files, {'test': {'ModelParser': [model_id]}})
+        self.assertEqual(files[model_id].contents, 'select 1 as id')
+
+    def test_read_files_changed_stat(self):
+        saved_files = {}
+        read_files(self.project, saved_files, {}, {})
+        model_id = 'test://' + normalize('models/model_1.sql')
+        with open(os.path.join(self.project_root, 'models', 'model_1.sql'), 'w') as fp:
+            fp.write('select 10 as id')
+
+        files = {}
+        read_files(self.project, files, {}, saved_files)
+        self.assertEqual(files[model_id].contents, 'select 10 as id')
+        self.assertEqual(files[model_id].checksum, FileHash.from_contents('select 10 as id'))
+
+    def test_read_files_strict_partial_parse(self):
+        saved_files = {}
+        read_files(self.project, saved_files, {}, {})
+
+        files = {}
+        with mock.patch.object(dbt.flags, 'STRICT_PARTIAL_PARSE', True):
+            read_files(self.project, files, {}, saved_files)
+        model_id = 'test://' + normalize('models/model_1.sql')
+        self.assertEqual(files[model_id].contents, 'select 1 as id')
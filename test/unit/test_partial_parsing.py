@@ -1,10 +1,18 @@
+import os
+import shutil
+import tempfile
 import unittest
 from unittest import mock
 import time
 
 import dbt.exceptions
 from dbt.parser.partial import PartialParsing
-from dbt.contracts.graph.manifest import Manifest
+from dbt.contracts.graph.manifest import Manifest, ManifestStateCheck
+from dbt.parser.partial_store import (
+    PartialParseChanges, PartialParseReader, read_partial_parse_manifest,
+    write_partial_parse_manifest,
+)
+import dbt.parser.partial_store
 from dbt.contracts.graph.parsed import ParsedModelNode
 from dbt.contracts.files import ParseFileType, SourceFile, SchemaSourceFile, FilePath, FileHash
 from dbt.node_types import NodeType
@@ -82,3 +90,184 @@ class TestPartialParsing(unittest.TestCase):
         expected_pp_dict = {'version': 2, 'models': [{'name': 'my_model', 'description': 'Test model'}]}
         schema_file = self.saved_files[schema_file_id]
         self.assertEqual(schema_file.pp_dict, expected_pp_dict)
+
+    def test_changed_cli_vars(self):
+        model_file_id = 'my_test://' + normalize('models/my_model.sql')
+        schema_file_id = 'my_test://' + normalize('models/schema.yml')
+        self.saved_files[model_file_id].vars = ['my_var']
+        self.saved_files[schema_file_id].vars = {'models': {'my_model': ['other_var']}}
+
+        # A var that's not used in any file
+        partial_parsing = PartialParsing(self.saved_manifest, self.new_files, {'unused_var'})
+        self.assertTrue(partial_parsing.skip_parsing())
+
+        # A var that's used in the model file
+        partial_parsing = PartialParsing(self.saved_manifest, self.new_files, {'my_var'})
+        self.assertEqual(partial_parsing.file_diff['changed'], [model_file_id])
+        self.assertEqual(partial_parsing.file_diff['changed_schema_files'], [])
+
+        # A var that's used in a schema file entry
+        partial_parsing = PartialParsing(self.saved_manifest, self.new_files, {'other_var'})
+        self.assertEqual(partial_parsing.file_diff['changed'], [])
+        self.assertEqual(partial_parsing.file_diff['changed_schema_files'], [schema_file_id])
+        self.assertEqual(
+            partial_parsing.env_vars_changed_schema_files,
+            {schema_file_id: {'models': ['my_model']}}
+        )
+
+    def test_state_check_changed_cli_vars(self):
+        old = ManifestStateCheck(cli_vars_hashes={'a': '1', 'b': '2', 'c': '3'})
+        new = ManifestStateCheck(cli_vars_hashes={'a': '1', 'b': '4', 'd': '5'})
+        self.assertEqual(new.changed_cli_vars(old), {'b', 'c', 'd'})
+        self.assertEqual(new.changed_cli_vars(new), set())
+
+
+class TestPartialParseStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tempdir, 'partial_parse.msgpack')
+        model_file = SourceFile(
+            path=FilePath(project_root='/users/root', searched_path='models', relative_path='my_model.sql', modification_time=time.time()),
+            checksum=FileHash.from_contents('abcdef'),
+            project_name='my_test',
+            parse_file_type=ParseFileType.Model,
+            nodes=['model.my_test.my_model'],
+        )
+        node = TestPartialParsing.get_model(None, 'my_model')
+        self.manifest = Manifest(
+            files={model_file.file_id: model_file},
+            nodes={node.unique_id: node},
+            state_check=ManifestStateCheck(vars_hash=FileHash.from_contents('vars')),
+        )
+        self.changes = PartialParseChanges()
+        # this manifest is so small that any delta would be large compared to it
+        self.ratio_patcher = mock.patch.object(
+            dbt.parser.partial_store, 'PARTIAL_PARSE_MAX_DELTA_RATIO', 100
+        )
+        self.ratio_patcher.start()
+
+    def tearDown(self):
+        self.ratio_patcher.stop()
+        shutil.rmtree(self.tempdir, ignore_errors=True)
+
+    def test_round_trip(self):
+        write_partial_parse_manifest(self.path, self.manifest)
+        manifest = read_partial_parse_manifest(self.path)
+        self.assertEqual(manifest.to_dict(), self.manifest.to_dict())
+
+    def test_header_and_sections(self):
+        write_partial_parse_manifest(self.path, self.manifest)
+        with PartialParseReader(self.path) as reader:
+            self.assertEqual(reader.dbt_version, self.manifest.metadata.dbt_version)
+            self.assertEqual(reader.state_check.to_dict(), self.manifest.state_check.to_dict())
+            self.assertIn('nodes', reader.section_names)
+            self.assertIn('files', reader.section_names)
+            # nothing but the header has been decoded yet
+            self.assertEqual(reader._decoded, {})
+            self.assertEqual(list(reader.read_section('nodes')), ['model.my_test.my_model'])
+            self.assertEqual(list(reader._decoded), ['nodes'])
+
+    def test_old_format(self):
+        with open(self.path, 'wb') as fp:
+            fp.write(self.manifest.to_msgpack())
+        with self.assertRaises(dbt.exceptions.InternalException):
+            PartialParseReader(self.path)
+
+    def _add_model(self, name):
+        node = TestPartialParsing.get_model(None, name)
+        self.manifest.nodes[node.unique_id] = node
+        self.changes.add_changed('nodes', {node.unique_id})
+
+    def _write(self, snapshot):
+        changes, self.changes = self.changes, PartialParseChanges()
+        return write_partial_parse_manifest(self.path, self.manifest, snapshot, changes)
+
+    def test_delta_is_appended(self):
+        snapshot = write_partial_parse_manifest(self.path, self.manifest)
+        base_size = os.path.getsize(self.path)
+        self._add_model('other_model')
+        del self.manifest.nodes['model.my_test.my_model']
+        self.changes.add_deleted('nodes', {'model.my_test.my_model'})
+        snapshot = self._write(snapshot)
+        self.assertEqual(snapshot.delta_count, 1)
+        with PartialParseReader(self.path) as reader:
+            self.assertEqual(len(reader._deltas), 1)
+            self.assertEqual(reader.end, os.path.getsize(self.path))
+            self.assertEqual(list(reader.read_section('nodes')), ['model.my_test.other_model'])
+            # the unchanged sections aren't in the delta
+            self.assertNotIn('macros', reader._deltas[0].header['sections'])
+            self.assertEqual(reader.read_manifest().to_dict(), self.manifest.to_dict())
+        self.assertGreater(os.path.getsize(self.path), base_size)
+
+    def test_delta_has_only_the_changed_entries(self):
+        snapshot = write_partial_parse_manifest(self.path, self.manifest)
+        self._add_model('other_model')
+        # a node that's deleted and added again is written as changed
+        self.changes.add_deleted('nodes', {'model.my_test.my_model'})
+        self.changes.add_changed('files', {'my_test://models/my_model.sql'})
+        self.manifest.files['my_test://models/my_model.sql'].nodes.append(
+            'model.my_test.other_model'
+        )
+        snapshot = self._write(snapshot)
+        with PartialParseReader(self.path) as reader:
+            delta = reader._deltas[0]
+            nodes = reader._unpack_at(delta.body_start, *delta.header['sections']['nodes'])
+            self.assertEqual(
+                sorted(nodes['changed']), ['model.my_test.my_model', 'model.my_test.other_model']
+            )
+            self.assertEqual(nodes['deleted'], [])
+            self.assertEqual(reader.read_manifest().to_dict(), self.manifest.to_dict())
+
+    def test_write_without_changes_is_not_appended(self):
+        snapshot = write_partial_parse_manifest(self.path, self.manifest)
+        self._add_model('other_model')
+        snapshot = write_partial_parse_manifest(self.path, self.manifest, snapshot)
+        self.assertEqual(snapshot.delta_count, 0)
+        self.assertEqual(read_partial_parse_manifest(self.path).to_dict(), self.manifest.to_dict())
+
+    def test_incomplete_delta_is_ignored(self):
+        snapshot = write_partial_parse_manifest(self.path, self.manifest)
+        expected = self.manifest.to_dict()
+        self._add_model('other_model')
+        self._write(snapshot)
+        with open(self.path, 'r+b') as fp:
+            fp.truncate(os.path.getsize(self.path) - 1)
+        with PartialParseReader(self.path) as reader:
+            self.assertEqual(reader._deltas, [])
+            self.assertEqual(reader.read_manifest().to_dict(), expected)
+            snapshot = reader.snapshot()
+        # the next delta replaces the incomplete one
+        self.changes.add_changed('nodes', {'model.my_test.other_model'})
+        self._write(snapshot)
+        self.assertEqual(read_partial_parse_manifest(self.path).to_dict(), self.manifest.to_dict())
+
+    def test_compaction(self):
+        snapshot = write_partial_parse_manifest(self.path, self.manifest)
+        with mock.patch.object(dbt.parser.partial_store, 'PARTIAL_PARSE_MAX_DELTAS', 1):
+            self._add_model('model_one')
+            snapshot = self._write(snapshot)
+            self.assertEqual(snapshot.delta_count, 1)
+            self._add_model('model_two')
+            snapshot = self._write(snapshot)
+        self.assertEqual(snapshot.delta_count, 0)
+        with PartialParseReader(self.path) as reader:
+            self.assertEqual(reader._deltas, [])
+            self.assertEqual(reader.read_manifest().to_dict(), self.manifest.to_dict())
+
+    def test_compaction_of_large_deltas(self):
+        snapshot = write_partial_parse_manifest(self.path, self.manifest)
+        with mock.patch.object(dbt.parser.partial_store, 'PARTIAL_PARSE_MAX_DELTA_RATIO', 0.1):
+            self._add_model('other_model')
+            snapshot = self._write(snapshot)
+        self.assertEqual(snapshot.delta_count, 0)
+        self.assertEqual(read_partial_parse_manifest(self.path).to_dict(), self.manifest.to_dict())
+
+    def test_file_replaced_since_read(self):
+        snapshot = write_partial_parse_manifest(self.path, self.manifest)
+        other = Manifest(state_check=self.manifest.state_check)
+        write_partial_parse_manifest(self.path, other)
+        self._add_model('other_model')
+        snapshot = self._write(snapshot)
+        self.assertEqual(snapshot.delta_count, 0)
+        self.assertEqual(read_partial_parse_manifest(self.path).to_dict(), self.manifest.to_dict())
@@ -0,0 +1,54 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+
+from dbt.contracts.results import ConcurrencyPoolStats, RunResultsArtifact
+from dbt.exceptions import IncompatibleSchemaException
+
+
+class TestRunResultsArtifact(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tempdir, 'run_results.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir, ignore_errors=True)
+
+    def get_artifact(self):
+        return RunResultsArtifact.from_execution_results(
+            results=[],
+            elapsed_time=1.0,
+            generated_at=datetime.utcnow(),
+            args={},
+            concurrency_pools={'heavy': ConcurrencyPoolStats(limit=2, nodes=1)},
+        )
+
+    def test_concurrency_pools_in_schema(self):
+        artifact = self.get_artifact()
+        self.assertEqual(
+            artifact.metadata.dbt_schema_version,
+            'https://schemas.getdbt.com/dbt/run-results/v5.json'
+        )
+        RunResultsArtifact.validate(artifact.to_dict(omit_none=False))
+
+    def write_version(self, version):
+        data = self.get_artifact().to_dict(omit_none=False)
+        data['metadata']['dbt_schema_version'] = (
+            f'https://schemas.getdbt.com/dbt/run-results/v{version}.json'
+        )
+        del data['concurrency_pools']
+        with open(self.path, 'w') as fp:
+            json.dump(data, fp)
+
+    def test_read_v4(self):
+        self.write_version(4)
+        artifact = RunResultsArtifact.read_and_check_versions(self.path)
+        self.assertEqual(artifact.concurrency_pools, {})
+
+    def test_read_v3(self):
+        self.write_version(3)
+        with self.assertRaises(IncompatibleSchemaException):
+            RunResultsArtifact.read_and_check_versions(self.path)
@@ -0,0 +1,70 @@
+import os
+import socket
+import unittest
+from unittest import mock
+
+from dbt.exceptions import RuntimeException
+from dbt.task.server import ServerTask, get_config_key, receive_message, send_message
+
+
+class TestServerMessages(unittest.TestCase):
+    def test_send_and_receive_with_fds(self):
+        read_fd, write_fd = os.pipe()
+        client, server = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+        with client, server:
+            send_message(client, {'args': ['ls'], 'env': None}, [write_fd])
+            os.close(write_fd)
+            message, fds = receive_message(server)
+        self.assertEqual(message, {'args': ['ls'], 'env': None})
+        self.assertEqual(len(fds), 1)
+        # the received fd is a copy of the pipe's write end
+        os.write(fds[0], b'output')
+        os.close(fds[0])
+        self.assertEqual(os.read(read_fd, 100), b'output')
+        os.close(read_fd)
+
+    def test_receive_closed_connection(self):
+        client, server = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+        with server:
+            client.sendall(b'{"args": ')
+            client.close()
+            with self.assertRaises(RuntimeException):
+                receive_message(server)
+
+
+class TestServerRequestArgs(unittest.TestCase):
+    def setUp(self):
+        self.task = mock.MagicMock()
+        self.task.config.project_root = os.getcwd()
+
+    def parse(self, args):
+        return ServerTask.parse_request_args(self.task, args)
+
+    def test_supported_command(self):
+        args = self.parse(['run', '--select', 'my_model', '--vars', '{a: 1}'])
+        self.assertEqual(args.which, 'run')
+        self.assertEqual(args.select, ['my_model'])
+        self.assertEqual(get_config_key(args)[3], '{a: 1}')
+
+    def test_unsupported_command(self):
+        with self.assertRaisesRegex(RuntimeException, "can't run \"deps\""):
+            self.parse(['deps'])
+
+    def test_invalid_args(self):
+        with self.assertRaisesRegex(RuntimeException, 'unrecognized arguments'):
+            self.parse(['run', '--not-an-arg'])
+        with self.assertRaisesRegex(RuntimeException, 'list of strings'):
+            self.parse('run')
+
+    def test_other_project(self):
+        with self.assertRaisesRegex(RuntimeException, 'runs the project in'):
+            self.parse(['run', '--project-dir', '/some/other/project'])
+
+
+class TestServerPlatform(unittest.TestCase):
+    @mock.patch('sys.platform', 'darwin')
+    def test_only_linux(self):
+        task = mock.MagicMock()
+        with self.assertRaisesRegex(RuntimeException, 'only supported on Linux'):
+            ServerTask.run(task)
+        task.get_full_manifest.assert_not_called()
@@ -248,3 +248,56 @@ class TestUntarPackage(unittest.TestCase):
             with self.assertRaises(tarfile.ReadError) as exc:
                 dbt.clients.system.untar_package(named_file.name, self.tempdest)
             self.assertEqual("empty file", str(exc.exception))
+
+
+class TestWriteArtifact(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'target', 'manifest.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_write_artifact_uncompressed(self):
+        dbt.clients.system.write_artifact(self.path, ['{"a": ', '1', '}'])
+        self.assertEqual(dbt.clients.system.load_file_contents(self.path), '{"a": 1}')
+        # no temporary files are left behind
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ['manifest.json'])
+
+    def test_write_artifact_gzip(self):
+        dbt.clients.system.write_artifact(self.path, ['{"a": 1}'])
+        dbt.clients.system.write_artifact(self.path, ['{"a": 2}'], 'gzip')
+        # the uncompressed artifact is stale
+        self.assertFalse(os.path.exists(self.path))
+        gzip_path = self.path + '.gz'
+        self.assertEqual(dbt.clients.system.find_artifact(self.path), gzip_path)
+        self.assertEqual(dbt.clients.system.read_json(gzip_path), {'a': 2})
+
+    def test_is_written_artifact(self):
+        self.assertFalse(dbt.clients.system.is_written_artifact(self.path))
+        dbt.clients.system.write_artifact(self.path, ['{"a": 1}'])
+        self.assertTrue(dbt.clients.system.is_written_artifact(self.path))
+        self.assertFalse(dbt.clients.system.is_written_artifact(self.path, 'gzip'))
+        # changed since the write
+        mtime = os.stat(self.path).st_mtime_ns
+        os.utime(self.path, ns=(mtime - 10**9, mtime - 10**9))
+        self.assertFalse(dbt.clients.system.is_written_artifact(self.path))
+        dbt.clients.system.write_artifact(self.path, ['{"a": 1}'], 'gzip')
+        self.assertTrue(dbt.clients.system.is_written_artifact(self.path, 'gzip'))
+        self.assertFalse(dbt.clients.system.is_written_artifact(self.path))
+
+    def test_write_artifact_keeps_the_old_file_on_error(self):
+        dbt.clients.system.write_artifact(self.path, ['{"a": 1}'])
+
+        def chunks():
+            yield '{"a": '
+            raise ValueError('serialization failed')
+
+        with self.assertRaises(ValueError):
+            dbt.clients.system.write_artifact(self.path, chunks())
+        self.assertEqual(dbt.clients.system.read_json(self.path), {'a': 1})
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ['manifest.json'])
+
+    def test_write_artifact_invalid_compression(self):
+        with self.assertRaises(dbt.exceptions.RuntimeException):
+            dbt.clients.system.write_artifact(self.path, ['{}'], 'lz4')
@@ -0,0 +1,104 @@
+import os
+import shutil
+import sys
+import unittest
+from tempfile import mkdtemp
+
+from dbt.clients.watcher import (
+    InotifyFileWatcher, PollingFileWatcher, iter_watched_directories
+)
+
+
+class FileWatcherTestMixin:
+    def setUp(self):
+        super().setUp()
+        self.tmp_dir = mkdtemp()
+        self.models_dir = os.path.join(self.tmp_dir, 'models')
+        self.target_dir = os.path.join(self.tmp_dir, 'target')
+        self.profiles_dir = os.path.join(self.tmp_dir, 'profiles')
+        for path in (self.models_dir, self.target_dir, self.profiles_dir,
+                     os.path.join(self.tmp_dir, '.git')):
+            os.makedirs(path)
+        self.model_path = self.write_file(self.models_dir, 'model.sql', 'select 1')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+        super().tearDown()
+
+    def write_file(self, *parts):
+        *directory, name, contents = parts
+        path = os.path.join(*directory, name)
+        with open(path, 'w') as fp:
+            fp.write(contents)
+        return path
+
+    def get_watcher(self):
+        raise NotImplementedError
+
+    def test_reports_changed_files(self):
+        with self.get_watcher() as watcher:
+            self.write_file(self.models_dir, 'model.sql', 'select 22')
+            self.assertEqual(watcher.wait_for_changes(timeout=5), {self.model_path})
+
+    def test_reports_created_and_removed_files(self):
+        with self.get_watcher() as watcher:
+            os.remove(self.model_path)
+            new_dir = os.path.join(self.models_dir, 'staging')
+            os.makedirs(new_dir)
+            new_path = self.write_file(new_dir, 'new.sql', 'select 2')
+            changed = watcher.wait_for_changes(timeout=5)
+            self.assertIn(self.model_path, changed)
+            self.assertTrue({new_dir, new_path} & changed)
+            # files in the new directory are watched too
+            self.write_file(new_dir, 'new.sql', 'select 33')
+            self.assertIn(new_path, watcher.wait_for_changes(timeout=5))
+
+    def test_ignores_excluded_and_hidden_files(self):
+        with self.get_watcher() as watcher:
+            self.write_file(self.target_dir, 'manifest.json', '{}')
+            self.write_file(self.tmp_dir, '.git', 'HEAD', 'ref')
+            self.write_file(self.models_dir, '.model.sql.swp', 'swap')
+            self.assertEqual(watcher.wait_for_changes(timeout=0.5), set())
+
+    def test_watches_shallow_paths(self):
+        with self.get_watcher() as watcher:
+            profiles_path = self.write_file(self.profiles_dir, 'profiles.yml', 'a: 1')
+            self.assertEqual(watcher.wait_for_changes(timeout=5), {profiles_path})
+
+
+class TestPollingFileWatcher(FileWatcherTestMixin, unittest.TestCase):
+    def get_watcher(self):
+        return PollingFileWatcher(
+            [self.tmp_dir],
+            exclude=[self.target_dir, self.profiles_dir],
+            shallow_paths=[self.profiles_dir],
+            interval=0.05,
+        )
+
+
+@unittest.skipUnless(sys.platform.startswith('linux'), 'inotify is only available on Linux')
+class TestInotifyFileWatcher(FileWatcherTestMixin, unittest.TestCase):
+    def get_watcher(self):
+        return InotifyFileWatcher(
+            [self.tmp_dir],
+            exclude=[self.target_dir, self.profiles_dir],
+            shallow_paths=[self.profiles_dir],
+        )
+
+
+class TestIterWatchedDirectories(unittest.TestCase):
+    def test_skips_excluded_directories(self):
+        tmp_dir = mkdtemp()
+        try:
+            for path in ('models/staging', 'target/compiled', '.git/objects'):
+                os.makedirs(os.path.join(tmp_dir, path))
+            directories = set(iter_watched_directories(
+                [tmp_dir], exclude=[os.path.join(tmp_dir, 'target')]
+            ))
+            self.assertEqual(directories, {
+                tmp_dir,
+                os.path.join(tmp_dir, 'models'),
+                os.path.join(tmp_dir, 'models', 'staging'),
+            })
+        finally:
+            shutil.rmtree(tmp_dir)